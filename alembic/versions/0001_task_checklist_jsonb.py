@@ -0,0 +1,67 @@
+"""Store task checklist items as JSONB
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 10:00:00.000000
+
+The schema predates migrations, so this is the first revision and assumes
+the tables already exist. Existing Text values (JSON arrays of strings)
+are converted in id-range batches to arrays of {"text", "done"} objects,
+committing each batch so long-running locks are avoided on large tables.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+def _batched(statement: str) -> None:
+    conn = op.get_bind()
+    max_id = conn.execute(sa.text("SELECT coalesce(max(id), 0) FROM tasks")).scalar()
+    with op.get_context().autocommit_block():
+        for lower in range(0, max_id + 1, BATCH_SIZE):
+            conn.execute(sa.text(statement), {"lower": lower, "upper": lower + BATCH_SIZE})
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('checklist_items_jsonb', postgresql.JSONB(), nullable=True))
+
+    _batched("""
+        UPDATE tasks SET checklist_items_jsonb = (
+            SELECT coalesce(jsonb_agg(
+                CASE WHEN jsonb_typeof(item) = 'string'
+                     THEN jsonb_build_object('text', item #>> '{}', 'done', false)
+                     ELSE item END
+            ), '[]'::jsonb)
+            FROM jsonb_array_elements(tasks.checklist_items::jsonb) AS item
+        )
+        WHERE id >= :lower AND id < :upper
+          AND checklist_items IS NOT NULL AND checklist_items <> ''
+    """)
+
+    op.drop_column('tasks', 'checklist_items')
+    op.alter_column('tasks', 'checklist_items_jsonb', new_column_name='checklist_items')
+
+
+def downgrade() -> None:
+    op.add_column('tasks', sa.Column('checklist_items_text', sa.Text(), nullable=True))
+
+    _batched("""
+        UPDATE tasks SET checklist_items_text = (
+            SELECT coalesce(jsonb_agg(item ->> 'text'), '[]'::jsonb)::text
+            FROM jsonb_array_elements(tasks.checklist_items) AS item
+        )
+        WHERE id >= :lower AND id < :upper AND checklist_items IS NOT NULL
+    """)
+
+    op.drop_column('tasks', 'checklist_items')
+    op.alter_column('tasks', 'checklist_items_text', new_column_name='checklist_items')
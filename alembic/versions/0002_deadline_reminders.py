@@ -0,0 +1,45 @@
+"""Deadline reminders: due-date indexes and delivery tracking
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Range scans over the moving reminder window
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_due_date', 'tasks', ['due_date'], postgresql_concurrently=True)
+        op.create_index('ix_contracts_end_date', 'contracts', ['end_date'], postgresql_concurrently=True)
+
+    op.create_table(
+        'reminder_deliveries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=30), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('deadline', sa.DateTime(), nullable=False),
+        sa.Column('recipient_user_id', sa.Integer(), nullable=True),
+        sa.Column('delivered_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['recipient_user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'entity_id', 'deadline', name='uq_reminder_deliveries_kind_entity_deadline'),
+    )
+    op.create_index('ix_reminder_deliveries_id', 'reminder_deliveries', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reminder_deliveries_id', table_name='reminder_deliveries')
+    op.drop_table('reminder_deliveries')
+    op.drop_index('ix_contracts_end_date', table_name='contracts')
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
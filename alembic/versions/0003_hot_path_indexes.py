@@ -0,0 +1,48 @@
+"""Composite and partial indexes for hot query paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 12:00:00.000000
+
+Indexes are built CONCURRENTLY so large tables stay writable during the
+migration; that requires running outside a transaction block.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_event_applications_event_id_status', 'event_applications', ['event_id', 'status'], None),
+    ('ix_event_applications_fighter_id', 'event_applications', ['fighter_id'], None),
+    ('ix_tasks_assigned_to_id_id', 'tasks', ['assigned_to_id', 'id'], None),
+    ('ix_fights_event_id_fight_number', 'fights', ['event_id', 'fight_number'], None),
+    ('ix_fights_fighter1_id', 'fights', ['fighter1_id'], None),
+    ('ix_fights_fighter2_id', 'fights', ['fighter2_id'], None),
+    ('ix_contracts_fighter_id_end_date', 'contracts', ['fighter_id', 'end_date'], None),
+    ('ix_fighters_verified', 'fighters', ['id'], 'is_verified'),
+    ('ix_fighters_available', 'fighters', ['id'], 'is_available'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
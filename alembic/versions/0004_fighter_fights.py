@@ -0,0 +1,74 @@
+"""Fighter fight participation table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 13:00:00.000000
+
+One row per fighter per fight so a fighter's history is a single indexed
+range scan instead of an OR across fights.fighter1_id/fighter2_id. Existing
+fights are backfilled in id-range batches.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+BACKFILL = """
+    INSERT INTO fighter_fights (fighter_id, fight_id, opponent_id, event_id, event_date, outcome, method, created_at)
+    SELECT p.fighter_id, f.id, p.opponent_id, f.event_id, e.event_date,
+           CASE WHEN f.winner_id = p.fighter_id THEN 'WIN'::fightresultenum
+                WHEN f.winner_id IS NOT NULL THEN 'LOSS'::fightresultenum
+                WHEN f.result IN ('DRAW', 'NO_CONTEST') THEN f.result
+           END,
+           f.method, now()
+    FROM fights f
+    JOIN events e ON e.id = f.event_id
+    CROSS JOIN LATERAL (VALUES (f.fighter1_id, f.fighter2_id), (f.fighter2_id, f.fighter1_id))
+        AS p(fighter_id, opponent_id)
+    WHERE f.id >= :lower AND f.id < :upper
+    ON CONFLICT (fighter_id, fight_id) DO NOTHING
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'fighter_fights',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('fighter_id', sa.Integer(), nullable=False),
+        sa.Column('fight_id', sa.Integer(), nullable=False),
+        sa.Column('opponent_id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('event_date', sa.DateTime(), nullable=False),
+        sa.Column('outcome', postgresql.ENUM(name='fightresultenum', create_type=False), nullable=True),
+        sa.Column('method', postgresql.ENUM(name='fightmethodenum', create_type=False), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['fighter_id'], ['fighters.id']),
+        sa.ForeignKeyConstraint(['fight_id'], ['fights.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['opponent_id'], ['fighters.id']),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('fighter_id', 'fight_id', name='uq_fighter_fights_fighter_fight'),
+    )
+    op.create_index('ix_fighter_fights_id', 'fighter_fights', ['id'])
+    op.create_index('ix_fighter_fights_timeline', 'fighter_fights', ['fighter_id', 'event_date', 'fight_id'])
+
+    conn = op.get_bind()
+    max_id = conn.execute(sa.text("SELECT coalesce(max(id), 0) FROM fights")).scalar()
+    with op.get_context().autocommit_block():
+        for lower in range(0, max_id + 1, BATCH_SIZE):
+            conn.execute(sa.text(BACKFILL), {"lower": lower, "upper": lower + BATCH_SIZE})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fighter_fights_timeline', table_name='fighter_fights')
+    op.drop_index('ix_fighter_fights_id', table_name='fighter_fights')
+    op.drop_table('fighter_fights')
@@ -0,0 +1,51 @@
+"""Matchmaking fighter card read model
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 14:00:00.000000
+
+The table starts empty; fill it after upgrading with
+``python -m app.cli rebuild-fighter-cards``. From then on the API write
+paths keep it current.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'fighter_cards',
+        sa.Column('fighter_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=300), nullable=False),
+        sa.Column('weight_class', sa.String(length=50), nullable=True),
+        sa.Column('birth_date', sa.Date(), nullable=False),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('total_fights', sa.Integer(), nullable=True),
+        sa.Column('recent_results', postgresql.JSONB(), nullable=True),
+        sa.Column('club', sa.String(length=200), nullable=True),
+        sa.Column('trainer', sa.String(length=200), nullable=True),
+        sa.Column('city', sa.String(length=100), nullable=True),
+        sa.Column('country', sa.String(length=100), nullable=True),
+        sa.Column('contract_expiry', sa.Date(), nullable=True),
+        sa.Column('remaining_fights', sa.Integer(), nullable=True),
+        sa.Column('application_status', postgresql.ENUM(name='applicationstatusenum', create_type=False), nullable=True),
+        sa.Column('is_available', sa.Boolean(), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['fighter_id'], ['fighters.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('fighter_id'),
+    )
+    op.create_index('ix_fighter_cards_matchmaking', 'fighter_cards', ['weight_class', 'is_available', 'birth_date'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fighter_cards_matchmaking', table_name='fighter_cards')
+    op.drop_table('fighter_cards')
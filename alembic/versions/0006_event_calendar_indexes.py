@@ -0,0 +1,39 @@
+"""Event calendar indexes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 15:00:00.000000
+
+event_date alone for plain range queries, plus (filter, event_date) pairs so
+"city X in the next 30 days" style queries are one index range scan.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_events_event_date', ['event_date']),
+    ('ix_events_city_event_date', ['city', 'event_date']),
+    ('ix_events_country_event_date', ['country', 'event_date']),
+    ('ix_events_event_type_event_date', ['event_type', 'event_date']),
+    ('ix_events_organizer_id_event_date', ['organizer_id', 'event_date']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, 'events', columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='events', postgresql_concurrently=True, if_exists=True)
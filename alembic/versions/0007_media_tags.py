@@ -0,0 +1,81 @@
+"""Inverted tag index for media content
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 16:00:00.000000
+
+media_content.tags was a JSON array stored as text, so tag searches had to
+scan and parse every row. Tags move to media_tags, keyed (tag, media_id), and
+are backfilled in id-range batches before the text column is dropped.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# Rows whose text is not a JSON array are skipped rather than failing the migration.
+# Tags are normalized like schemas.media.normalize_tags: whitespace collapsed,
+# lower-cased, cut to 50 characters, then stripped again.
+BACKFILL = """
+    INSERT INTO media_tags (tag, media_id)
+    SELECT DISTINCT t.tag, m.id
+    FROM media_content m
+    CROSS JOIN LATERAL jsonb_array_elements_text(m.tags::jsonb) AS raw(tag)
+    CROSS JOIN LATERAL (
+        SELECT rtrim(left(lower(btrim(regexp_replace(raw.tag, '\\s+', ' ', 'g'))), 50)) AS tag
+    ) t
+    WHERE m.id >= :lower AND m.id < :upper
+      AND m.tags IS NOT NULL AND m.tags ~ '^\\s*\\['
+      AND t.tag <> ''
+    ON CONFLICT DO NOTHING
+"""
+
+RESTORE = """
+    UPDATE media_content m
+    SET tags = agg.tags
+    FROM (
+        SELECT media_id, json_agg(tag ORDER BY tag)::text AS tags
+        FROM media_tags
+        WHERE media_id >= :lower AND media_id < :upper
+        GROUP BY media_id
+    ) agg
+    WHERE m.id = agg.media_id
+"""
+
+
+def _batches(conn, sql):
+    max_id = conn.execute(sa.text("SELECT coalesce(max(id), 0) FROM media_content")).scalar()
+    with op.get_context().autocommit_block():
+        for lower in range(0, max_id + 1, BATCH_SIZE):
+            conn.execute(sa.text(sql), {"lower": lower, "upper": lower + BATCH_SIZE})
+
+
+def upgrade() -> None:
+    op.create_table(
+        'media_tags',
+        sa.Column('tag', sa.String(length=50), nullable=False),
+        sa.Column('media_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['media_id'], ['media_content.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tag', 'media_id'),
+    )
+    op.create_index('ix_media_tags_media_id', 'media_tags', ['media_id'])
+    op.create_index('ix_media_content_event_id_id', 'media_content', ['event_id', 'id'])
+
+    _batches(op.get_bind(), BACKFILL)
+    op.drop_column('media_content', 'tags')
+
+
+def downgrade() -> None:
+    op.add_column('media_content', sa.Column('tags', sa.Text(), nullable=True))
+    _batches(op.get_bind(), RESTORE)
+    op.drop_index('ix_media_content_event_id_id', table_name='media_content')
+    op.drop_index('ix_media_tags_media_id', table_name='media_tags')
+    op.drop_table('media_tags')
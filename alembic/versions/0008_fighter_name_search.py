@@ -0,0 +1,120 @@
+"""Fighter name search column and trigram index
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 17:00:00.000000
+
+fighters.name_search holds the normalized, transliterated names (see
+app.utils.names). It is backfilled in id batches with a copy of those rules
+as of this revision, so later changes to the application code cannot change
+what this migration writes (`python -m app.cli rebuild-name-search` applies
+newer rules), then indexed with a pg_trgm GIN index built CONCURRENTLY.
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 2000
+
+# Normalization rules of app.utils.names as of this revision
+
+# Cyrillic (Russian, Uzbek, Kazakh, Ukrainian letters) to Latin
+CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "ғ": "g", "ґ": "g", "д": "d", "е": "e", "ё": "yo",
+    "є": "ye", "ж": "zh", "з": "z", "и": "i", "і": "i", "ї": "yi", "й": "y", "к": "k", "қ": "q",
+    "л": "l", "м": "m", "н": "n", "ң": "ng", "о": "o", "ө": "o", "п": "p", "р": "r", "с": "s",
+    "т": "t", "у": "u", "ў": "o", "ү": "u", "ұ": "u", "ф": "f", "х": "kh", "ҳ": "h", "һ": "h",
+    "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "", "ы": "y", "ь": "", "э": "e", "ә": "a",
+    "ю": "yu", "я": "ya",
+}
+
+# Spelling variants folded to one form, applied in order after transliteration,
+# so "Юсупов", "Iusupov" and "Yusupov" or "Хабиб" and "Xabib" end up equal
+VARIANT_FOLDS = [
+    (re.compile(r"shch|sch"), "sh"),
+    (re.compile(r"dzh|dj|zh"), "j"),
+    (re.compile(r"kh|x"), "h"),
+    (re.compile(r"tz|ts"), "c"),
+    (re.compile(r"(?<![a-z])[ij](?=[aeou])"), "y"),  # Iakub, Jakub -> Yakub
+    (re.compile(r"(?<=[aeiou])j(?=[aeou])"), "y"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"(?<=[a-z])(iy|ii|yi|y)(?![a-z])"), "i"),  # Vasiliy, Vasilii, Vasily -> Vasili
+    (re.compile(r"([a-z])\1+"), r"\1"),  # Hassan -> Hasan
+]
+
+APOSTROPHES = "'`ʻʼ‘’"
+
+
+def _normalize(value):
+    if not value:
+        return ""
+    value = "".join(CYRILLIC_TO_LATIN.get(char, char) for char in value.lower())
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(char for char in value if not unicodedata.combining(char) and char not in APOSTROPHES)
+    value = re.sub(r"[^a-z]+", " ", value).strip()
+    for pattern, replacement in VARIANT_FOLDS:
+        value = pattern.sub(replacement, value)
+    return value
+
+
+def _backfill(conn):
+    fighters = sa.table(
+        'fighters', sa.column('id', sa.Integer), sa.column('first_name', sa.String),
+        sa.column('last_name', sa.String), sa.column('middle_name', sa.String),
+        sa.column('name_search', sa.String),
+    )
+    statement = fighters.update().where(fighters.c.id == sa.bindparam('row_id')).values(
+        name_search=sa.bindparam('key')
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(fighters.c.id, fighters.c.first_name, fighters.c.last_name, fighters.c.middle_name)
+            .where(fighters.c.id > last_id)
+            .order_by(fighters.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        conn.execute(statement, [
+            {"row_id": row.id, "key": " ".join(filter(None, (
+                _normalize(row.first_name), _normalize(row.last_name), _normalize(row.middle_name)
+            )))}
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('fighters', sa.Column('name_search', sa.String(length=320), nullable=True))
+
+    with op.get_context().autocommit_block():
+        _backfill(op.get_bind())
+        op.create_index(
+            'ix_fighters_name_search_trgm', 'fighters', ['name_search'],
+            postgresql_using='gin',
+            postgresql_ops={'name_search': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_fighters_name_search_trgm', table_name='fighters', postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column('fighters', 'name_search')
@@ -0,0 +1,55 @@
+"""Duplicate fighter candidates and blocking indexes
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 18:00:00.000000
+
+birth_date and passport_number indexes keep the inline duplicate check on
+registration to one index lookup; fighter_duplicate_candidates holds the
+scored pairs for review (filled inline and by the nightly scan).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_fighters_birth_date', ['birth_date']),
+    ('ix_fighters_passport_number', ['passport_number']),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'fighter_duplicate_candidates',
+        sa.Column('fighter_id', sa.Integer(), nullable=False),
+        sa.Column('duplicate_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('reasons', postgresql.JSONB(), nullable=True),
+        sa.Column('detected_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['fighter_id'], ['fighters.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['duplicate_id'], ['fighters.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('fighter_id', 'duplicate_id'),
+    )
+    op.create_index('ix_fighter_duplicate_candidates_duplicate_id', 'fighter_duplicate_candidates', ['duplicate_id'])
+    op.create_index('ix_fighter_duplicate_candidates_score', 'fighter_duplicate_candidates', ['score'])
+
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, 'fighters', columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='fighters', postgresql_concurrently=True, if_exists=True)
+    op.drop_index('ix_fighter_duplicate_candidates_score', table_name='fighter_duplicate_candidates')
+    op.drop_index('ix_fighter_duplicate_candidates_duplicate_id', table_name='fighter_duplicate_candidates')
+    op.drop_table('fighter_duplicate_candidates')
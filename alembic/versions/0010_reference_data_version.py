@@ -0,0 +1,54 @@
+"""Reference data version counter
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 19:30:00.000000
+
+reference_data_version holds one row whose counter is bumped by a statement
+trigger on every write to clubs, promotions, trainers or managers, whoever
+makes it. Application processes compare it with their memory-mapped
+snapshot (app.services.reference_data) and rebuild the snapshot when it moves.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+TABLES = ['clubs', 'promotions', 'trainers', 'managers']
+
+
+def upgrade() -> None:
+    op.create_table(
+        'reference_data_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute('INSERT INTO reference_data_version (id, version) VALUES (1, 1)')
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_reference_data_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_reference_data_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_reference_data_version()
+        """)
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_reference_data_version ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS bump_reference_data_version()')
+    op.drop_table('reference_data_version')
@@ -0,0 +1,39 @@
+"""Index undelivered reminder claims
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 21:00:00.000000
+
+Each reminder scan looks for claims that outlived their lease without a
+delivery (app.services.reminders). The partial index keeps that to the few
+undelivered rows instead of the whole delivery history. Built CONCURRENTLY,
+outside a transaction block.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reminder_deliveries_undelivered', 'reminder_deliveries', ['created_at'],
+            postgresql_concurrently=True,
+            postgresql_where=sa.text('delivered_at IS NULL'),
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_reminder_deliveries_undelivered', table_name='reminder_deliveries',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import auth, fighters, users, dashboard, contracts, events, tasks
+from .endpoints import auth, fighters, users, dashboard, contracts, events, tasks, batch, media, uploads, reference
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
@@ -8,4 +8,8 @@ api_router.include_router(fighters.router, prefix="/fighters", tags=["fighters"]
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
 api_router.include_router(contracts.router, prefix="/contracts", tags=["contracts"])
 api_router.include_router(events.router, prefix="/events", tags=["events"])
-api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
\ No newline at end of file
+api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"])
+api_router.include_router(media.router, prefix="/media", tags=["media"])
+api_router.include_router(uploads.router, prefix="/uploads", tags=["uploads"])
+api_router.include_router(reference.router, prefix="/reference", tags=["reference"])
\ No newline at end of file
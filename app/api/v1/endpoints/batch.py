@@ -0,0 +1,163 @@
+import asyncio
+import json
+from itertools import groupby
+from typing import Any, List, Optional
+from urllib.parse import urlencode, urlsplit
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from ....core.batch import BATCH_SCOPE_KEY, READ_PRIMARY_SCOPE_KEY, BatchContext
+from ....core.config import settings
+from ....core.database import get_db
+from ....core.deps import get_current_active_user
+from ....models.user import User
+from ....schemas.batch import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+
+router = APIRouter()
+
+# Headers forwarded from the batch call to every sub-request
+FORWARDED_HEADERS = {b"authorization", b"host", b"user-agent", b"accept-language"}
+
+
+async def dispatch_sub_request(
+    request: Request, prefix: str, context: Optional[BatchContext], item: BatchSubRequest,
+    follow_redirect: bool = True, read_primary: bool = False
+) -> BatchSubResponse:
+    """Run one sub-request through the app in-process and capture its response.
+
+    Without a context the sub-request authenticates and opens its sessions
+    like a normal request; read_primary keeps its reads off the replicas.
+    """
+    path, _, query_string = item.path.partition("?")
+    if item.query:
+        query_string = urlencode(item.query, doseq=True)
+    body = json.dumps(item.body).encode() if item.body is not None else b""
+
+    headers = [(k, v) for k, v in request.scope["headers"] if k in FORWARDED_HEADERS]
+    headers.append((b"content-type", b"application/json"))
+    headers.append((b"content-length", str(len(body)).encode()))
+
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": item.method,
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": prefix + path,
+        "raw_path": (prefix + path).encode(),
+        "query_string": query_string.encode(),
+        "headers": headers,
+    }
+    if context is not None:
+        scope[BATCH_SCOPE_KEY] = context
+    if read_primary:
+        scope[READ_PRIMARY_SCOPE_KEY] = True
+
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    status_code = 500
+    response_headers = {}
+    chunks: List[bytes] = []
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            for key, value in message.get("headers", []):
+                response_headers[key.decode("latin-1")] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # The app's error middleware has already sent its 500 (or nothing was sent)
+        status_code = 500
+
+    # Follow the app's own trailing-slash redirect ("/tasks" -> "/tasks/") once
+    location = response_headers.get("location")
+    if follow_redirect and status_code in (307, 308) and location:
+        redirected = urlsplit(location)
+        if redirected.path.startswith(prefix):
+            path = redirected.path[len(prefix):]
+            if redirected.query:
+                path += "?" + redirected.query
+            retry = item.model_copy(update={"path": path, "query": None})
+            return await dispatch_sub_request(
+                request, prefix, context, retry, follow_redirect=False, read_primary=read_primary
+            )
+
+    raw = b"".join(chunks)
+    response_headers.pop("content-length", None)
+    if not raw:
+        content = None
+    elif response_headers.get("content-type", "").startswith("application/json"):
+        content = json.loads(raw)
+    else:
+        content = raw.decode("utf-8", errors="replace")
+
+    return BatchSubResponse(id=item.id, status=status_code, headers=response_headers, body=content)
+
+
+@router.post("/", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Execute several API calls in one HTTP request.
+
+    Writes (anything but GET) run one after another, in order, on the batch's
+    DB session. A run of consecutive GETs between them runs concurrently, up
+    to BATCH_READ_CONCURRENCY at a time, each authenticated and given its own
+    sessions like a normal request (reading from the primary once the batch
+    has written); responses keep the request order. After a failed write the
+    session is rolled back, so later ones don't inherit a half-applied write
+    or an aborted transaction.
+
+    A batch is not atomic: each write commits as its endpoint does, so writes
+    before a failing sub-request stay committed and later ones still run.
+    """
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch may contain at most {settings.BATCH_MAX_REQUESTS} requests"
+        )
+    for item in batch.requests:
+        if not item.path.startswith("/") or item.path.split("?")[0].rstrip("/") == "/batch":
+            raise HTTPException(status_code=400, detail=f"Invalid sub-request path: {item.path}")
+
+    prefix = request.url.path.rstrip("/").rsplit("/batch", 1)[0]
+    context = BatchContext(db, current_user)
+    read_slots = asyncio.Semaphore(settings.BATCH_READ_CONCURRENCY)
+
+    wrote = False
+
+    async def read(item: BatchSubRequest) -> BatchSubResponse:
+        async with read_slots:
+            return await dispatch_sub_request(request, prefix, None, item, read_primary=wrote)
+
+    responses: List[BatchSubResponse] = []
+    for is_read, items in groupby(batch.requests, key=lambda item: item.method == "GET"):
+        if is_read:
+            responses.extend(await asyncio.gather(*(read(item) for item in items)))
+            continue
+        wrote = True
+        for item in items:
+            sub_response = await dispatch_sub_request(request, prefix, context, item)
+            if sub_response.status >= 400:
+                await run_in_threadpool(db.rollback)
+            responses.append(sub_response)
+
+    return BatchResponse(responses=responses)
@@ -1,15 +1,26 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ....core.database import get_db, get_read_db
 from ....core.deps import get_current_active_user
+from ....core.loader import RelationLoader, get_loader, parse_include, expand, build_expanded
+from ....core.repository import exists_or_404, get_by_id, get_or_404
 from ....models.user import User
 from ....models.fighter import Contract, Fighter, Promotion
-from ....schemas.contract import ContractCreate, ContractResponse, ContractExtensionRequest
+from ....schemas.contract import ContractCreate, ContractResponse, ContractExtensionRequest, ContractExpandedResponse
+from ....schemas.fighter import FighterSummary, PromotionSummary
+from ....services.fighter_cards import refresh_fighter_cards
+from ....services.reference_data import reference_data
+from ....utils.conditional import conditional_response
 import uuid
 
 router = APIRouter()
 
+CONTRACT_RELATIONS = {
+    "fighter": ("fighter_id", Fighter, FighterSummary),
+    "promotion": ("promotion_id", Promotion, PromotionSummary),
+}
+
 @router.post("/", response_model=ContractResponse)
 def create_contract(
     contract: ContractCreate,
@@ -19,46 +30,73 @@ def create_contract(
     """Create new contract"""
     
     # Verify fighter exists
-    fighter = db.query(Fighter).filter(Fighter.id == contract.fighter_id).first()
-    if not fighter:
-        raise HTTPException(status_code=404, detail="Fighter not found")
+    fighter = get_or_404(db, Fighter, contract.fighter_id)
     
-    # Verify promotion exists
-    promotion = db.query(Promotion).filter(Promotion.id == contract.promotion_id).first()
-    if not promotion:
-        raise HTTPException(status_code=404, detail="Promotion not found")
+    # Verify promotion exists: reference snapshot first, the database only
+    # for a promotion added since the snapshot was last refreshed
+    if reference_data.get().get("promotions", contract.promotion_id) is None:
+        exists_or_404(db, Promotion, contract.promotion_id)
     
     db_contract = Contract(
         **contract.dict(),
         remaining_fights=contract.total_fights
     )
     db.add(db_contract)
+    refresh_fighter_cards(db, [db_contract.fighter_id])
     db.commit()
     db.refresh(db_contract)
     return db_contract
 
-@router.get("/", response_model=List[ContractResponse])
+@router.get("/", response_model=List[ContractExpandedResponse], response_model_exclude_unset=True)
 def read_contracts(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
+    include: Optional[str] = None,
+    loader: RelationLoader = Depends(get_loader),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
-    """Retrieve contracts"""
-    contracts = db.query(Contract).offset(skip).limit(limit).all()
-    return contracts
+    """Retrieve contracts; include=fighter,promotion embeds related objects"""
+    includes = parse_include(include, CONTRACT_RELATIONS)
+    query = db.query(Contract).order_by(Contract.id).offset(skip).limit(limit)
+    
+    if not includes:
+        not_modified = conditional_response(
+            request, response, query.with_entities(Contract.id, Contract.updated_at).all(), seed="contracts", collection=True
+        )
+        if not_modified:
+            return not_modified
+    
+    contracts = query.all()
+    expansions = expand(loader, contracts, includes, CONTRACT_RELATIONS)
+    return build_expanded(ContractResponse, ContractExpandedResponse, contracts, expansions)
 
-@router.get("/{contract_id}", response_model=ContractResponse)
+@router.get("/{contract_id}", response_model=ContractExpandedResponse, response_model_exclude_unset=True)
 def read_contract(
     contract_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    include: Optional[str] = None,
+    loader: RelationLoader = Depends(get_loader),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Get contract by ID"""
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
-    if contract is None:
+    includes = parse_include(include, CONTRACT_RELATIONS)
+    meta = db.query(Contract.id, Contract.updated_at).filter(Contract.id == contract_id).first()
+    if meta is None:
         raise HTTPException(status_code=404, detail="Contract not found")
-    return contract
+    
+    if not includes:
+        not_modified = conditional_response(request, response, [meta], seed="contract")
+        if not_modified:
+            return not_modified
+    
+    contract = get_by_id(db, Contract, contract_id)
+    expansions = expand(loader, [contract], includes, CONTRACT_RELATIONS)
+    return build_expanded(ContractResponse, ContractExpandedResponse, [contract], expansions)[0]
 
 @router.post("/extend")
 def extend_contract(
@@ -68,13 +106,12 @@ def extend_contract(
 ) -> Any:
     """Extend existing contract"""
     
-    contract = db.query(Contract).filter(Contract.id == extension.contract_id).first()
-    if not contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
+    contract = get_or_404(db, Contract, extension.contract_id)
     
     contract.end_date = extension.new_end_date
     contract.total_fights += extension.additional_fights
     contract.remaining_fights += extension.additional_fights
+    refresh_fighter_cards(db, [contract.fighter_id])
     
     db.commit()
     
@@ -1,7 +1,7 @@
 from typing import Any
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ....core.database import get_read_db
 from ....core.deps import get_current_active_user
 from ....models.user import User
 from ....models.fighter import Fighter
@@ -10,7 +10,7 @@ router = APIRouter()
 
 @router.get("/stats")
 def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Get dashboard statistics"""
@@ -1,18 +1,62 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from datetime import date, datetime
+from typing import Any, List, Optional
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, WebSocket,
+    WebSocketDisconnect, status
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from ....core.database import get_db
-from ....core.deps import get_current_active_user
+from ....core.broker import get_broker
+from ....core.config import settings
+from ....core.database import get_db, get_read_db
+from ....core.deps import authenticate_token, get_current_active_user
+from ....core.loader import RelationLoader, get_loader, parse_include, expand, build_expanded
+from ....core.singleflight import SingleFlight
+from ....core.repository import exists, exists_or_404, get_or_404
 from ....models.user import User
+from ....models.enums import EventTypeEnum, FightResultEnum
 from ....models.fighter import Event, EventApplication, Fight, Fighter
 from ....schemas.event import (
     EventCreate, EventResponse, EventApplicationCreate, 
     EventApplicationResponse, FightCreate, FightResponse,
-    CreateFightPair
+    CreateFightPair, EventSummary, EventApplicationExpandedResponse,
+    FightExpandedResponse, FightResult, ApplicationTransitionRequest,
+    ApplicationTransitionResponse, FightCardCreate, CalendarBucket
+)
+from ....schemas.fighter import FighterSummary
+from ....services.applications import UPDATED, bulk_transition
+from ....services.bouts import create_bouts, validate_bouts
+from ....services.event_calendar import MAX_BUCKETS, apply_event_filters, event_calendar
+from ....services.event_counters import application_changed
+from ....services.fight_history import record_result
+from ....services.fighter_cards import refresh_fighter_cards
+from ....services.live import (
+    CARD_CHANGED, FIGHT_RESULT, event_channel, publish_counters, publish_event_update
 )
+from ....utils.conditional import conditional_response
 
 router = APIRouter()
 
+# Hot fight-night reads: identical concurrent requests share one query
+event_flight = SingleFlight("events.read_event", settings.SINGLEFLIGHT_CACHE_SECONDS)
+applications_flight = SingleFlight("events.read_event_applications", settings.SINGLEFLIGHT_CACHE_SECONDS)
+
+APPLICATION_RELATIONS = {
+    "event": ("event_id", Event, EventSummary),
+    "fighter": ("fighter_id", Fighter, FighterSummary),
+}
+
+FIGHT_RELATIONS = {
+    "event": ("event_id", Event, EventSummary),
+    "fighter1": ("fighter1_id", Fighter, FighterSummary),
+    "fighter2": ("fighter2_id", Fighter, FighterSummary),
+    "winner": ("winner_id", Fighter, FighterSummary),
+}
+
+def _fight_payload(fight: Fight) -> dict:
+    return FightResponse.model_validate(fight, from_attributes=True).model_dump(mode="json")
+
 @router.post("/", response_model=EventResponse)
 def create_event(
     event: EventCreate,
@@ -25,49 +69,106 @@ def create_event(
     db.add(db_event)
     db.commit()
     db.refresh(db_event)
+    event_calendar.invalidate(db_event.event_date)
     return db_event
 
 @router.get("/", response_model=List[EventResponse])
 def read_events(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    event_type: Optional[EventTypeEnum] = None,
+    organizer_id: Optional[int] = None,
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
-    """Retrieve events"""
-    events = db.query(Event).offset(skip).limit(limit).all()
+    """Retrieve events; date_from (inclusive) / date_to (exclusive) select a date range"""
+    query = apply_event_filters(
+        db.query(Event), date_from, date_to, city, country, event_type, organizer_id
+    )
+    # Range queries read in date order straight off the (…, event_date) indexes
+    if date_from is not None or date_to is not None:
+        query = query.order_by(Event.event_date, Event.id)
+    else:
+        query = query.order_by(Event.id)
+    query = query.offset(skip).limit(limit)
+    
+    not_modified = conditional_response(
+        request, response, query.with_entities(Event.id, Event.updated_at).all(), seed="events", collection=True
+    )
+    if not_modified:
+        return not_modified
+    
+    events = query.all()
     return events
 
+@router.get("/calendar", response_model=List[CalendarBucket])
+def read_event_calendar(
+    date_from: date,
+    date_to: date,
+    bucket: str = Query("day", pattern="^(day|week)$"),
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    event_type: Optional[EventTypeEnum] = None,
+    organizer_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Event counts per day or week between date_from and date_to (both inclusive, whole buckets)"""
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    
+    span_days = (date_to - date_from).days + 1
+    if span_days > MAX_BUCKETS * (1 if bucket == "day" else 7):
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BUCKETS} buckets per request")
+    
+    filters = {"city": city, "country": country, "event_type": event_type, "organizer_id": organizer_id}
+    counts = event_calendar.counts(db, bucket, date_from, date_to, filters)
+    return [{"start": start, "count": count} for start, count in counts]
+
 @router.get("/{event_id}", response_model=EventResponse)
 def read_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Get event by ID"""
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if event is None:
+    meta = db.query(Event.id, Event.updated_at).filter(Event.id == event_id).first()
+    if meta is None:
         raise HTTPException(status_code=404, detail="Event not found")
-    return event
+    
+    not_modified = conditional_response(request, response, [meta], seed="event")
+    if not_modified:
+        return not_modified
+    
+    # Only the full load is collapsed; keyed by updated_at so it matches the ETag just sent
+    def load():
+        return EventResponse.model_validate(get_or_404(db, Event, event_id), from_attributes=True)
+    
+    return event_flight.do((event_id, meta.updated_at, current_user.role), load)
 
 @router.post("/{event_id}/applications", response_model=EventApplicationResponse)
 def create_event_application(
     event_id: int,
     application: EventApplicationCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Create event application"""
     
     # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    event = get_or_404(db, Event, event_id)
     
     # Verify fighter exists
-    fighter = db.query(Fighter).filter(Fighter.id == application.fighter_id).first()
-    if not fighter:
-        raise HTTPException(status_code=404, detail="Fighter not found")
+    fighter = get_or_404(db, Fighter, application.fighter_id)
     
     db_application = EventApplication(
         event_id=event_id,
@@ -75,85 +176,228 @@ def create_event_application(
         **application.dict()
     )
     db.add(db_application)
+    db.flush()
+    application_changed(db, event_id, fighter.id, None, db_application.status)
+    refresh_fighter_cards(db, [fighter.id])
     db.commit()
     db.refresh(db_application)
+    publish_counters(background_tasks, db, event_id)
     return db_application
 
-@router.get("/{event_id}/applications", response_model=List[EventApplicationResponse])
+@router.get(
+    "/{event_id}/applications",
+    response_model=List[EventApplicationExpandedResponse],
+    response_model_exclude_unset=True
+)
 def read_event_applications(
     event_id: int,
+    db: Session = Depends(get_read_db),
+    include: Optional[str] = None,
+    loader: RelationLoader = Depends(get_loader),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Get applications for event; include=event,fighter embeds related objects"""
+    includes = parse_include(include, APPLICATION_RELATIONS)
+    
+    def load():
+        applications = db.query(EventApplication).filter(
+            EventApplication.event_id == event_id
+        ).all()
+        expansions = expand(loader, applications, includes, APPLICATION_RELATIONS)
+        return build_expanded(
+            EventApplicationResponse, EventApplicationExpandedResponse, applications, expansions
+        )
+    
+    return applications_flight.do((event_id, tuple(includes), current_user.role), load)
+
+@router.post("/{event_id}/applications/transitions", response_model=ApplicationTransitionResponse)
+def transition_event_applications(
+    event_id: int,
+    transition: ApplicationTransitionRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
-    """Get applications for event"""
-    applications = db.query(EventApplication).filter(
-        EventApplication.event_id == event_id
-    ).all()
-    return applications
+    """Move many applications to a new status at once; reports an outcome per id"""
+    exists_or_404(db, Event, event_id)
+    
+    results = bulk_transition(db, event_id, transition.application_ids, transition.status)
+    db.commit()
+    publish_counters(background_tasks, db, event_id)
+    
+    return {
+        "updated": sum(1 for result in results if result["outcome"] == UPDATED),
+        "results": results
+    }
+
+@router.get("/{event_id}/fights", response_model=List[FightExpandedResponse], response_model_exclude_unset=True)
+def read_event_fights(
+    event_id: int,
+    db: Session = Depends(get_read_db),
+    include: Optional[str] = None,
+    loader: RelationLoader = Depends(get_loader),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Get the fight card for event; include=event,fighter1,fighter2,winner embeds related objects"""
+    includes = parse_include(include, FIGHT_RELATIONS)
+    fights = db.query(Fight).filter(Fight.event_id == event_id).order_by(Fight.fight_number, Fight.id).all()
+    expansions = expand(loader, fights, includes, FIGHT_RELATIONS)
+    return build_expanded(FightResponse, FightExpandedResponse, fights, expansions)
 
 @router.post("/{event_id}/fights", response_model=FightResponse)
 def create_fight(
     event_id: int,
     fight: FightCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Create fight for event"""
     
     # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Verify fighters exist
-    fighter1 = db.query(Fighter).filter(Fighter.id == fight.fighter1_id).first()
-    fighter2 = db.query(Fighter).filter(Fighter.id == fight.fighter2_id).first()
+    event = get_or_404(db, Event, event_id)
     
-    if not fighter1 or not fighter2:
-        raise HTTPException(status_code=404, detail="One or both fighters not found")
+    # Fighters, repeated fighters and weight classes in one pass
+    weight_class, = validate_bouts(db, [fight])
     
-    if fighter1.id == fighter2.id:
-        raise HTTPException(status_code=400, detail="Fighter cannot fight themselves")
-    
-    db_fight = Fight(
-        event_id=event_id,
-        **fight.dict()
-    )
-    db.add(db_fight)
+    db_fight, = create_bouts(db, event, [
+        dict(fight.dict(exclude={"event_id"}), weight_class=weight_class)
+    ])
     db.commit()
     db.refresh(db_fight)
+    publish_event_update(background_tasks, event_id, CARD_CHANGED, _fight_payload(db_fight))
+    publish_counters(background_tasks, db, event_id)
     return db_fight
 
+@router.post("/{event_id}/fights/batch", response_model=List[FightResponse])
+def create_fight_card(
+    event_id: int,
+    card: FightCardCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Create a whole fight card: all bouts are validated together and inserted at once"""
+    event = get_or_404(db, Event, event_id)
+    
+    weight_classes = validate_bouts(db, card.fights)
+    fights = create_bouts(db, event, [
+        dict(bout.dict(), weight_class=weight_class)
+        for bout, weight_class in zip(card.fights, weight_classes)
+    ])
+    payloads = [_fight_payload(fight) for fight in fights]
+    db.commit()
+    
+    for payload in payloads:
+        publish_event_update(background_tasks, event_id, CARD_CHANGED, payload)
+    publish_counters(background_tasks, db, event_id)
+    return payloads
+
 @router.post("/{event_id}/create-pair")
 def create_fight_pair(
     event_id: int,
     pair: CreateFightPair,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Create a fight pair for matchmaking"""
     
     # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    event = get_or_404(db, Event, event_id)
     
-    # Create the fight
-    db_fight = Fight(
-        event_id=event_id,
-        fighter1_id=pair.fighter1_id,
-        fighter2_id=pair.fighter2_id,
-        weight_class=pair.weight_class,
-        rounds=pair.rounds,
-        round_duration=pair.round_duration,
-        fight_number=pair.fight_number
-    )
-    db.add(db_fight)
+    weight_class, = validate_bouts(db, [pair])
     
-    # Update event statistics
-    event.confirmed_pairs += 1
+    # Create the fight
+    db_fight, = create_bouts(db, event, [
+        dict(pair.dict(), weight_class=weight_class)
+    ])
     
     db.commit()
     db.refresh(db_fight)
+    publish_event_update(background_tasks, event_id, CARD_CHANGED, _fight_payload(db_fight))
+    publish_counters(background_tasks, db, event_id)
+    
+    return {"message": "Fight pair created successfully", "fight_id": db_fight.id}
+
+@router.put("/{event_id}/fights/{fight_id}/result", response_model=FightResponse)
+def update_fight_result(
+    event_id: int,
+    fight_id: int,
+    result: FightResult,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Record the result of a fight and update both fighters' histories"""
+    fight = db.query(Fight).filter(Fight.id == fight_id, Fight.event_id == event_id).first()
+    if not fight:
+        raise HTTPException(status_code=404, detail="Fight not found")
+    
+    # Validate the fight as it will be after this (possibly partial) update
+    changes = result.dict(exclude_unset=True)
+    winner_id = changes.get("winner_id", fight.winner_id)
+    outcome = changes.get("result", fight.result)
+    if winner_id is not None and winner_id not in (fight.fighter1_id, fight.fighter2_id):
+        raise HTTPException(status_code=422, detail="Winner must be one of the fighters")
+    if winner_id is None and outcome in (FightResultEnum.WIN, FightResultEnum.LOSS):
+        raise HTTPException(status_code=422, detail="winner_id is required for a decided fight")
+    if winner_id is not None and outcome in (FightResultEnum.DRAW, FightResultEnum.NO_CONTEST):
+        raise HTTPException(status_code=422, detail="A draw or no contest has no winner; send winner_id: null")
+    
+    for field, value in changes.items():
+        setattr(fight, field, value)
+    record_result(db, fight)
+    refresh_fighter_cards(db, [fight.fighter1_id, fight.fighter2_id])
+    
+    db.commit()
+    db.refresh(fight)
+    publish_event_update(background_tasks, event_id, FIGHT_RESULT, _fight_payload(fight))
+    return fight
+
+
+@router.get("/{event_id}/live")
+async def stream_event_live(
+    event_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Server-Sent Events stream of fight results, card changes and counter updates"""
+    found = await asyncio.to_thread(exists, db, Event, event_id)
+    # Release the connection: the stream may stay open for hours
+    await asyncio.to_thread(db.close)
+    if not found:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    broker = get_broker()
+    
+    async def stream():
+        async with broker.subscribe(event_channel(event_id)) as subscription:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                message = await subscription.get(settings.LIVE_HEARTBEAT_SECONDS)
+                yield f"data: {message}\n\n" if message is not None else ": keep-alive\n\n"
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/{event_id}/ws")
+async def event_live_socket(websocket: WebSocket, event_id: int, token: Optional[str] = None):
+    """WebSocket variant of /live; browsers cannot set headers here, so the token comes as ?token="""
+    user = await asyncio.to_thread(authenticate_token, token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
     
-    return {"message": "Fight pair created successfully", "fight_id": db_fight.id}
\ No newline at end of file
+    await websocket.accept()
+    try:
+        async with get_broker().subscribe(event_channel(event_id)) as subscription:
+            while True:
+                message = await subscription.get(settings.LIVE_HEARTBEAT_SECONDS)
+                await websocket.send_text(message if message is not None else '{"type": "ping"}')
+    except WebSocketDisconnect:
+        pass
@@ -1,15 +1,33 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request, Response
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ....core.database import get_db, get_read_db
 from ....core.deps import get_current_active_user
+from ....core.loader import RelationLoader, get_loader, parse_include, expand, build_expanded
+from ....core.repository import exists_or_404, get_by_id, get_or_404
 from ....models.user import User
-from ....models.fighter import Fighter, Club, Trainer, Manager, Promotion
-from ....schemas.fighter import FighterCreate, FighterResponse, FighterRegistrationByThirdParty, RegistrationResponse
+from ....models.fighter import Fighter, FighterDuplicateCandidate, Club, Trainer, Manager, Promotion
+from ....schemas.fighter import (
+    FighterCreate, FighterResponse, FighterRegistrationByThirdParty, RegistrationResponse,
+    FighterExpandedResponse, ClubSummary, TrainerSummary, ManagerSummary, PromotionSummary,
+    FighterFightPage, FighterCardForMatchmaking, FighterSearchResult, FighterDuplicateCandidateResponse
+)
+from ....services.fight_history import fight_timeline
+from ....services.fighter_duplicates import find_duplicates, record_candidates
+from ....services.fighter_search import search_fighters
+from ....services.fighter_cards import query_matchmaking_cards, refresh_fighter_cards
+from ....utils.conditional import conditional_response
 import uuid
 
 router = APIRouter()
 
+FIGHTER_RELATIONS = {
+    "club": ("club_id", Club, ClubSummary),
+    "trainer": ("trainer_id", Trainer, TrainerSummary),
+    "manager": ("manager_id", Manager, ManagerSummary),
+    "promotion": ("promotion_id", Promotion, PromotionSummary),
+}
+
 @router.post("/", response_model=FighterResponse)
 def create_fighter(
     fighter: FighterCreate,
@@ -27,32 +45,131 @@ def create_fighter(
         **fighter.dict()
     )
     db.add(db_fighter)
+    db.flush()
+    refresh_fighter_cards(db, [db_fighter.id])
     db.commit()
     db.refresh(db_fighter)
     return db_fighter
 
-@router.get("/", response_model=List[FighterResponse])
+@router.get("/", response_model=List[FighterExpandedResponse], response_model_exclude_unset=True)
 def read_fighters(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
+    include: Optional[str] = None,
+    loader: RelationLoader = Depends(get_loader),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Retrieve fighters; include=club,trainer,manager,promotion embeds related objects"""
+    includes = parse_include(include, FIGHTER_RELATIONS)
+    query = db.query(Fighter).order_by(Fighter.id).offset(skip).limit(limit)
+    
+    # Cheap metadata query first; skip loading the page if the client copy is fresh.
+    # Related tables have no updated_at, so expanded pages are not validated.
+    if not includes:
+        not_modified = conditional_response(
+            request, response, query.with_entities(Fighter.id, Fighter.updated_at).all(), seed="fighters", collection=True
+        )
+        if not_modified:
+            return not_modified
+    
+    fighters = query.all()
+    expansions = expand(loader, fighters, includes, FIGHTER_RELATIONS)
+    return build_expanded(FighterResponse, FighterExpandedResponse, fighters, expansions)
+
+@router.get("/matchmaking/cards", response_model=List[FighterCardForMatchmaking])
+def read_matchmaking_cards(
+    weight_class: Optional[str] = None,
+    min_age: Optional[int] = Query(None, ge=0),
+    max_age: Optional[int] = Query(None, ge=0),
+    available: Optional[bool] = True,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Matchmaking cards from the fighter_cards read model"""
+    return query_matchmaking_cards(db, weight_class, min_age, max_age, available, skip, limit)
+
+@router.get("/search", response_model=List[FighterSearchResult])
+def search_fighters_by_name(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
-    """Retrieve fighters"""
-    fighters = db.query(Fighter).offset(skip).limit(limit).all()
-    return fighters
+    """Fuzzy fighter search by first/last/middle name, Cyrillic or Latin, best match first"""
+    
+    return [
+        FighterSearchResult(
+            id=fighter.id,
+            fighter_id=fighter.fighter_id,
+            first_name=fighter.first_name,
+            last_name=fighter.last_name,
+            middle_name=fighter.middle_name,
+            birth_date=fighter.birth_date,
+            weight_class=fighter.weight_class,
+            score=round(score, 4)
+        )
+        for fighter, score in search_fighters(db, q, limit)
+    ]
 
-@router.get("/{fighter_id}", response_model=FighterResponse)
+@router.get("/duplicates", response_model=List[FighterDuplicateCandidateResponse])
+def read_duplicate_candidates(
+    min_score: float = Query(0.0, ge=0, le=1),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Possible duplicate fighter profiles for review, most likely first"""
+    
+    return db.query(FighterDuplicateCandidate).filter(
+        FighterDuplicateCandidate.score >= min_score
+    ).order_by(
+        FighterDuplicateCandidate.score.desc(), FighterDuplicateCandidate.fighter_id
+    ).offset(skip).limit(limit).all()
+
+@router.get("/{fighter_id}", response_model=FighterExpandedResponse, response_model_exclude_unset=True)
 def read_fighter(
     fighter_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    include: Optional[str] = None,
+    loader: RelationLoader = Depends(get_loader),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Get fighter by ID"""
-    fighter = db.query(Fighter).filter(Fighter.id == fighter_id).first()
-    if fighter is None:
+    includes = parse_include(include, FIGHTER_RELATIONS)
+    meta = db.query(Fighter.id, Fighter.updated_at).filter(Fighter.id == fighter_id).first()
+    if meta is None:
         raise HTTPException(status_code=404, detail="Fighter not found")
-    return fighter
+    
+    if not includes:
+        not_modified = conditional_response(request, response, [meta], seed="fighter")
+        if not_modified:
+            return not_modified
+    
+    fighter = get_by_id(db, Fighter, fighter_id)
+    expansions = expand(loader, [fighter], includes, FIGHTER_RELATIONS)
+    return build_expanded(FighterResponse, FighterExpandedResponse, [fighter], expansions)[0]
+
+@router.get("/{fighter_id}/fights", response_model=FighterFightPage)
+def read_fighter_fights(
+    fighter_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Fighter's fight timeline, newest first; follow next_cursor for older fights"""
+    exists_or_404(db, Fighter, fighter_id)
+    
+    items, next_cursor = fight_timeline(db, fighter_id, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.post("/{fighter_id}/upload-photo")
 async def upload_fighter_photo(
@@ -63,9 +180,7 @@ async def upload_fighter_photo(
 ):
     """Upload fighter photo"""
     
-    fighter = db.query(Fighter).filter(Fighter.id == fighter_id).first()
-    if not fighter:
-        raise HTTPException(status_code=404, detail="Fighter not found")
+    fighter = get_or_404(db, Fighter, fighter_id)
     
     # Save file (implement file storage logic)
     file_path = f"uploads/fighters/{fighter_id}_{photo.filename}"
@@ -124,6 +239,13 @@ def register_fighter_by_third_party(
         **fighter_data
     )
     db.add(db_fighter)
+    db.flush()
+    refresh_fighter_cards(db, [db_fighter.id])
+    
+    # Same person registered by someone else under another phone number
+    duplicates = find_duplicates(db, db_fighter)
+    record_candidates(db, duplicates)
+    
     db.commit()
     db.refresh(db_fighter)
     
@@ -131,5 +253,6 @@ def register_fighter_by_third_party(
         success=True,
         message="Fighter registered successfully",
         fighter_id=db_fighter.id,
-        verification_required=True
+        verification_required=True,
+        possible_duplicate_ids=[low if high == db_fighter.id else high for low, high, _, _ in duplicates]
     )
\ No newline at end of file
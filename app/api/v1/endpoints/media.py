@@ -0,0 +1,61 @@
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from ....core.database import get_db
+from ....core.deps import get_current_active_user
+from ....core.repository import exists_or_404, get_or_404
+from ....models.user import User
+from ....models.fighter import Event, MediaContent
+from ....schemas.media import MediaContentCreate, MediaContentResponse, MediaPage, normalize_tags
+from ....services.media_search import MATCH_ALL, MATCH_ANY, search_media, set_tags
+
+router = APIRouter()
+
+@router.post("/", response_model=MediaContentResponse)
+def create_media(
+    media: MediaContentCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Register an uploaded media file for an event"""
+
+    exists_or_404(db, Event, media.event_id)
+
+    db_media = MediaContent(**media.dict(exclude={"tags"}), uploaded_by_id=current_user.id)
+    set_tags(db_media, media.tags)
+    db.add(db_media)
+    db.commit()
+    db.refresh(db_media)
+
+    return db_media
+
+@router.get("/search", response_model=MediaPage)
+def search_media_content(
+    tags: Optional[str] = Query(None, description="Comma-separated tags"),
+    match: str = Query(MATCH_ALL, pattern=f"^({MATCH_ALL}|{MATCH_ANY})$"),
+    event_id: Optional[int] = None,
+    file_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Search media by tag set (match=all for AND, match=any for OR), event and file type"""
+
+    tag_list = normalize_tags(tags.split(",")) if tags else []
+    items, next_cursor = search_media(
+        db, tag_list, match, event_id=event_id, file_type=file_type, cursor=cursor, limit=limit
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/{media_id}", response_model=MediaContentResponse)
+def read_media(
+    media_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Get media item by ID"""
+
+    media = get_or_404(db, MediaContent, media_id, "Media not found")
+
+    return media
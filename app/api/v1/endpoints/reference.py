@@ -0,0 +1,29 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from ....core.deps import get_current_active_user
+from ....models.user import User
+from ....services.reference_data import KINDS, reference_data
+
+router = APIRouter()
+
+def _register(kind: str, schema: Any, label: str) -> None:
+    @router.get(f"/{kind}", response_model=List[schema], name=f"search_{kind}")
+    def search(
+        q: Optional[str] = Query(None, description="Name prefix; people match on first or last name"),
+        limit: int = Query(20, ge=1, le=100),
+        current_user: User = Depends(get_current_active_user)
+    ) -> Any:
+        return reference_data.get().sections[kind].search(q or "", limit)
+
+    @router.get(f"/{kind}/{{item_id}}", response_model=schema, name=f"read_{kind}")
+    def read(
+        item_id: int,
+        current_user: User = Depends(get_current_active_user)
+    ) -> Any:
+        item = reference_data.get().get(kind, item_id)
+        if item is None:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        return item
+
+for kind, (model, schema, _) in KINDS.items():
+    _register(kind, schema, model.__name__)
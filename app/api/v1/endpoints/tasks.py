@@ -1,12 +1,15 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import Boolean, Text, case, cast, func, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
 from ....core.database import get_db
 from ....core.deps import get_current_active_user
+from ....core.repository import exists_or_404, get_by_id, get_or_404
 from ....models.user import User
 from ....models.fighter import Task
-from ....schemas.task import TaskCreate, TaskResponse, TaskUpdate
-import json
+from ....schemas.task import TaskCreate, TaskResponse, TaskUpdate, ChecklistItemPatch
+from ....utils.conditional import conditional_response
 
 router = APIRouter()
 
@@ -18,26 +21,19 @@ def create_task(
 ) -> Any:
     """Create new task"""
     
-    task_data = task.dict()
-    if task_data.get('checklist_items'):
-        task_data['checklist_items'] = json.dumps(task_data['checklist_items'])
-    
     db_task = Task(
         created_by_id=current_user.id,
-        **task_data
+        **task.dict()
     )
     db.add(db_task)
     db.commit()
     db.refresh(db_task)
-    
-    # Parse checklist items back to list for response
-    if db_task.checklist_items:
-        db_task.checklist_items = json.loads(db_task.checklist_items)
-    
     return db_task
 
 @router.get("/", response_model=List[TaskResponse])
 def read_tasks(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
@@ -50,30 +46,35 @@ def read_tasks(
     if assigned_to_me:
         query = query.filter(Task.assigned_to_id == current_user.id)
     
-    tasks = query.offset(skip).limit(limit).all()
+    query = query.order_by(Task.id).offset(skip).limit(limit)
     
-    # Parse checklist items for each task
-    for task in tasks:
-        if task.checklist_items:
-            task.checklist_items = json.loads(task.checklist_items)
+    not_modified = conditional_response(
+        request, response, query.with_entities(Task.id, Task.updated_at).all(), seed="tasks", collection=True
+    )
+    if not_modified:
+        return not_modified
     
+    tasks = query.all()
     return tasks
 
 @router.get("/{task_id}", response_model=TaskResponse)
 def read_task(
     task_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Get task by ID"""
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if task is None:
+    meta = db.query(Task.id, Task.updated_at).filter(Task.id == task_id).first()
+    if meta is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    # Parse checklist items
-    if task.checklist_items:
-        task.checklist_items = json.loads(task.checklist_items)
+    not_modified = conditional_response(request, response, [meta], seed="task")
+    if not_modified:
+        return not_modified
     
+    task = get_by_id(db, Task, task_id)
     return task
 
 @router.put("/{task_id}", response_model=TaskResponse)
@@ -85,26 +86,62 @@ def update_task(
 ) -> Any:
     """Update task"""
     
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
+    task = get_or_404(db, Task, task_id)
     
     update_data = task_update.dict(exclude_unset=True)
     
-    # Handle checklist items
-    if 'checklist_items' in update_data and update_data['checklist_items']:
-        update_data['checklist_items'] = json.dumps(update_data['checklist_items'])
-    
     for field, value in update_data.items():
         setattr(task, field, value)
     
     db.commit()
     db.refresh(task)
+    return task
+
+@router.patch("/{task_id}/checklist", response_model=TaskResponse)
+def patch_task_checklist(
+    task_id: int,
+    patch: ChecklistItemPatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Add or toggle a single checklist item in place (jsonb_set), without rewriting the list"""
+    
+    stmt = update(Task).where(Task.id == task_id)
+    
+    if patch.op == "add":
+        if patch.text is None:
+            raise HTTPException(status_code=400, detail="text is required to add an item")
+        item = func.jsonb_build_array(func.jsonb_build_object("text", patch.text, "done", False))
+        # A task created without a checklist holds SQL NULL or JSON null
+        items = case(
+            (func.jsonb_typeof(Task.checklist_items) == "array", Task.checklist_items),
+            else_=func.jsonb_build_array(),
+        )
+        stmt = stmt.values(checklist_items=items.op("||")(item))
+    else:
+        if patch.index is None:
+            raise HTTPException(status_code=400, detail="index is required to change an item")
+        if patch.op == "set" and patch.done is None:
+            raise HTTPException(status_code=400, detail="done is required to set an item")
+        
+        path = cast(literal(f"{{{patch.index},done}}"), ARRAY(Text))
+        if patch.op == "set":
+            done = literal(patch.done, Boolean)
+        else:
+            current = cast(Task.checklist_items.op("#>>")(path), Boolean)
+            done = ~func.coalesce(current, False)
+        stmt = stmt.where(
+            func.jsonb_array_length(Task.checklist_items) > patch.index
+        ).values(checklist_items=func.jsonb_set(Task.checklist_items, path, func.to_jsonb(done)))
+    
+    result = db.execute(stmt.returning(Task.id).execution_options(synchronize_session=False))
+    if result.first() is None:
+        db.rollback()
+        exists_or_404(db, Task, task_id)
+        raise HTTPException(status_code=404, detail="Checklist item not found")
+    db.commit()
     
-    # Parse checklist items back to list for response
-    if task.checklist_items:
-        task.checklist_items = json.loads(task.checklist_items)
-    
+    task = get_by_id(db, Task, task_id)
     return task
 
 @router.delete("/{task_id}")
@@ -115,9 +152,7 @@ def delete_task(
 ) -> Any:
     """Delete task"""
     
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
+    task = get_or_404(db, Task, task_id)
     
     # Check if user can delete (creator or assigned user)
     if task.created_by_id != current_user.id and task.assigned_to_id != current_user.id:
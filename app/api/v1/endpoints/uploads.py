@@ -0,0 +1,108 @@
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+from ....core.database import get_db
+from ....core.deps import get_current_active_user
+from ....core.upload_store import get_upload_store
+from ....core.repository import exists_or_404, get_by_id
+from ....models.user import User
+from ....models.fighter import Fight
+from ....schemas.upload import VideoUploadCreate, VideoUploadResponse, VideoUploadComplete
+from ....services.video_uploads import (
+    new_upload, get_upload, append_chunk, finalize_upload, discard_upload
+)
+
+router = APIRouter()
+
+def _offset_headers(state: dict) -> dict:
+    return {
+        "Upload-Offset": str(state["offset"]),
+        "Upload-Length": str(state["length"]),
+        "Cache-Control": "no-store",
+    }
+
+@router.post("/videos", response_model=VideoUploadResponse, status_code=201)
+async def create_video_upload(
+    upload: VideoUploadCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Start a resumable fight video upload; send the bytes with PATCH to the returned Location"""
+
+    exists_or_404(db, Fight, upload.fight_id)
+
+    store = get_upload_store()
+    state = new_upload(upload.fight_id, current_user.id, upload.filename, upload.length, upload.checksum)
+    await store.save(state)
+    state = await store.get(state["id"])
+
+    response.headers["Location"] = f"/api/v1/uploads/videos/{state['id']}"
+    response.headers.update(_offset_headers(state))
+    return state
+
+@router.head("/videos/{upload_id}")
+async def video_upload_offset(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user)
+) -> Response:
+    """Current offset of an upload; clients resume from here after a reconnect"""
+
+    state = await get_upload(get_upload_store(), upload_id, current_user.id)
+    return Response(status_code=200, headers=_offset_headers(state))
+
+@router.get("/videos/{upload_id}", response_model=VideoUploadResponse)
+async def read_video_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Get upload progress"""
+
+    return await get_upload(get_upload_store(), upload_id, current_user.id)
+
+@router.patch("/videos/{upload_id}", status_code=204)
+async def upload_video_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    upload_checksum: Optional[str] = Header(None, alias="Upload-Checksum"),
+    current_user: User = Depends(get_current_active_user)
+) -> Response:
+    """Append the request body at Upload-Offset (streamed to disk, never held in memory)"""
+
+    store = get_upload_store()
+    state = await get_upload(store, upload_id, current_user.id)
+    state = await append_chunk(store, state, request, upload_offset, upload_checksum)
+    return Response(status_code=204, headers=_offset_headers(state))
+
+@router.post("/videos/{upload_id}/finalize", response_model=VideoUploadComplete)
+async def finalize_video_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Verify the completed upload and attach it to the fight as video_url"""
+
+    store = get_upload_store()
+    state = await get_upload(store, upload_id, current_user.id)
+    fight = get_by_id(db, Fight, state["fight_id"])
+    if not fight:
+        await discard_upload(store, state)
+        raise HTTPException(status_code=404, detail="Fight not found")
+
+    fight.video_url = await finalize_upload(store, state)
+    db.commit()
+
+    return {"fight_id": fight.id, "video_url": fight.video_url}
+
+@router.delete("/videos/{upload_id}", status_code=204)
+async def cancel_video_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user)
+) -> Response:
+    """Abort an upload and delete the partial file"""
+
+    store = get_upload_store()
+    state = await get_upload(store, upload_id, current_user.id)
+    await discard_upload(store, state)
+    return Response(status_code=204)
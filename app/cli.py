@@ -0,0 +1,371 @@
+import json
+import os
+import click
+from app.core.config import settings
+from app.models import user, fighter, enums  # Import to register tables
+
+
+@click.group()
+def cli():
+    """CAMMA management commands"""
+
+
+def _format_scans(summary) -> str:
+    if "error" in summary:
+        return f"error: {summary['error']}"
+    scans = ", ".join(
+        f"{s['node']} on {s['relation']}" + (f" using {s['index']}" if s["index"] else "")
+        for s in summary["scans"]
+    )
+    return f"cost={summary['total_cost']:.2f} [{scans}]"
+
+
+@cli.command("index-advisor")
+@click.option("--queries", "queries_path", default=settings.QUERY_CAPTURE_PATH, type=click.Path(exists=True),
+              help="JSON-lines file written with QUERY_CAPTURE_PATH set")
+@click.option("--limit", default=0, help="Only replay the first N distinct query shapes")
+@click.option("--json", "as_json", is_flag=True, help="Print the raw report as JSON")
+def index_advisor(queries_path, limit, as_json):
+    """Replay captured query shapes and compare EXPLAIN plans before/after the model indexes"""
+    from app.core.database import engine
+    from app.services.index_advisor import advise, load_query_shapes
+
+    if not queries_path:
+        raise click.UsageError("Pass --queries or set QUERY_CAPTURE_PATH")
+
+    report = advise(engine, load_query_shapes(queries_path, limit))
+    if as_json:
+        click.echo(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    click.echo(f"Indexes evaluated: {', '.join(report['indexes']) or 'none missing'}")
+    for entry in report["queries"]:
+        click.echo("")
+        click.echo(" ".join(entry["statement"].split())[:200])
+        click.echo(f"  before: {_format_scans(entry['before'])}")
+        if "after" in entry:
+            click.echo(f"  after:  {_format_scans(entry['after'])}")
+
+
+@cli.command("rebuild-fighter-cards")
+@click.option("--batch-size", default=500, help="Fighters refreshed per transaction")
+def rebuild_fighter_cards_command(batch_size):
+    """Recompute the matchmaking fighter_cards read model from the source tables"""
+    from app.services.fighter_cards import rebuild_fighter_cards
+
+    click.echo(f"Refreshed {rebuild_fighter_cards(batch_size=batch_size)} fighter cards")
+
+
+@cli.command("reconcile-event-counters")
+@click.option("--batch-size", default=500, help="Events recomputed per UPDATE")
+def reconcile_event_counters_command(batch_size):
+    """Recompute confirmed_pairs / pending_applications / approved_without_pair for every event"""
+    from app.services.event_counters import reconcile_all
+
+    click.echo(f"Reconciled counters for {reconcile_all(batch_size=batch_size)} events")
+
+
+@cli.command("benchmark-media-search")
+@click.option("--items", default=1_000_000, help="Synthetic media rows to insert")
+@click.option("--tags-per-item", default=3)
+@click.option("--vocabulary", default=1000, help="Distinct tags to draw from")
+@click.option("--repeat", default=20, help="Timed runs per query")
+def benchmark_media_search(items, tags_per_item, vocabulary, repeat):
+    """Time tag searches over synthetic media; everything runs in one transaction that is rolled back"""
+    import random
+    import time
+    from sqlalchemy import insert, select
+    from sqlalchemy.orm import Session
+    from app.core.database import engine
+    from app.models.fighter import Event, MediaContent, MediaTag
+    from app.models.user import User
+    from app.services.media_search import MATCH_ALL, MATCH_ANY, search_media
+
+    batch_size = 10_000
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            event_ids = conn.execute(select(Event.id).limit(20)).scalars().all()
+            user_id = conn.execute(select(User.id).limit(1)).scalar()
+            if not event_ids or user_id is None:
+                raise click.ClickException("Needs at least one event and one user to attach media to")
+
+            rng = random.Random(0)
+            # Zipf-like popularity so some tags are common and most are rare
+            vocab = [f"tag{n}" for n in range(vocabulary)]
+            weights = [1 / (n + 1) for n in range(vocabulary)]
+            started = time.perf_counter()
+            for offset in range(0, items, batch_size):
+                count = min(batch_size, items - offset)
+                ids = conn.execute(insert(MediaContent).returning(MediaContent.id), [
+                    {
+                        "event_id": rng.choice(event_ids),
+                        "title": f"bench {offset + n}",
+                        "file_url": f"/static/bench/{offset + n}.jpg",
+                        "file_type": rng.choice(("image", "video", "document")),
+                        "uploaded_by_id": user_id,
+                    }
+                    for n in range(count)
+                ]).scalars().all()
+                conn.execute(insert(MediaTag), [
+                    {"tag": tag, "media_id": media_id}
+                    for media_id in ids
+                    for tag in set(rng.choices(vocab, weights, k=tags_per_item))
+                ])
+            click.echo(f"Seeded {items} media in {time.perf_counter() - started:.1f}s")
+            if engine.dialect.name == "postgresql":
+                conn.exec_driver_sql("ANALYZE media_content")
+                conn.exec_driver_sql("ANALYZE media_tags")
+
+            session = Session(bind=conn)
+            cases = [
+                ("1 common tag", [vocab[0]], MATCH_ALL, {}),
+                ("1 rare tag", [vocab[-1]], MATCH_ALL, {}),
+                ("2 tags AND", vocab[:2], MATCH_ALL, {}),
+                ("3 tags AND", vocab[:3], MATCH_ALL, {}),
+                ("3 tags OR", vocab[-3:], MATCH_ANY, {}),
+                ("2 tags AND + event", vocab[:2], MATCH_ALL, {"event_id": event_ids[0]}),
+                ("1 tag + file type", [vocab[1]], MATCH_ALL, {"file_type": "video"}),
+            ]
+            for label, tags, match, filters in cases:
+                timings = []
+                cursor = None
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    rows, cursor = search_media(session, tags, match, cursor=cursor, **filters)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    session.expunge_all()
+                timings.sort()
+                click.echo(
+                    f"{label:<22} p50={timings[len(timings) // 2]:.2f}ms "
+                    f"p95={timings[int(len(timings) * 0.95) - 1]:.2f}ms"
+                )
+            session.close()
+        finally:
+            transaction.rollback()
+
+
+@cli.command("purge-stale-uploads")
+def purge_stale_uploads_command():
+    """Delete abandoned resumable upload files from UPLOAD_TMP_DIR"""
+    from app.services.video_uploads import purge_stale_uploads
+
+    click.echo(f"Removed {purge_stale_uploads()} stale partial uploads")
+
+
+@cli.command("rebuild-name-search")
+@click.option("--batch-size", default=2000, help="Fighters updated per transaction")
+def rebuild_name_search_command(batch_size):
+    """Recompute fighters.name_search, e.g. after changing the name normalization rules"""
+    from app.core.database import engine
+    from app.services.fighter_search import backfill_name_search
+
+    with engine.connect() as conn:
+        click.echo(f"Updated name_search for {backfill_name_search(conn, batch_size, commit=True)} fighters")
+
+
+@cli.command("scan-duplicate-fighters")
+@click.option("--threshold", default=None, type=float, help="Minimum score (default DUPLICATE_SCORE_THRESHOLD)")
+@click.option("--batch-size", default=5000, help="Rows fetched and candidate pairs written per batch")
+def scan_duplicate_fighters_command(threshold, batch_size):
+    """Rescan all fighters for likely duplicate profiles and refresh the merge candidates"""
+    from app.services.fighter_duplicates import scan_duplicates
+
+    click.echo(f"{scan_duplicates(threshold=threshold, batch_size=batch_size)} duplicate candidate pairs")
+
+
+@cli.command("serve")
+@click.option("--bind", default=lambda: f"0.0.0.0:{os.getenv('PORT', '8000')}", show_default="0.0.0.0:$PORT or 8000")
+@click.option("--max-requests", default=10000, help="Recycle a worker after this many requests (0 disables)")
+@click.option("--max-requests-jitter", default=1000, help="Up to this many extra requests per worker, so workers don't restart together")
+@click.option("--timeout", default=60, help="Seconds before a silent worker is killed and restarted")
+@click.option("--graceful-timeout", default=30)
+@click.option("--keep-alive", default=5)
+def serve(bind, max_requests, max_requests_jitter, timeout, graceful_timeout, keep_alive):
+    """Run the API under gunicorn: preloaded app, WEB_CONCURRENCY uvicorn workers, warmed DB pools"""
+    from app.server import CammaServer
+
+    CammaServer("app.main:create_app()", {
+        "bind": bind,
+        "workers": settings.WEB_CONCURRENCY,
+        "worker_class": "app.server.CammaUvicornWorker",
+        "preload_app": True,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests_jitter,
+        "timeout": timeout,
+        "graceful_timeout": graceful_timeout,
+        "keepalive": keep_alive,
+        "loglevel": settings.LOG_LEVEL.lower(),
+        "accesslog": "-",
+    }).run()
+
+
+
+@cli.command("benchmark-compression")
+@click.option("--sizes", default="20,100,500", help="Comma-separated fighter list page sizes")
+@click.option("--repeat", default=20, help="Timed runs per payload and setting")
+@click.option("--from-db", is_flag=True, help="Serialize real fighters instead of synthetic ones")
+def benchmark_compression(sizes, repeat, from_db):
+    """CPU time vs. bytes for each encoding and level on fighter list payloads (* = configured level)"""
+    import json
+    import random
+    import time
+    from datetime import date, datetime, timedelta
+    from app.core import compression
+    from app.core.compression import AVAILABLE_ENCODINGS, CompressedVariantCache, compress
+
+    sizes = [int(size) for size in sizes.split(",")]
+    if from_db:
+        from sqlalchemy.orm import Session
+        from app.core.database import engine
+        from app.models.fighter import Fighter
+        from app.schemas.fighter import FighterResponse
+
+        with Session(engine) as db:
+            rows = db.query(Fighter).order_by(Fighter.id).limit(max(sizes)).all()
+            fighters = [FighterResponse.model_validate(row, from_attributes=True).model_dump(mode="json") for row in rows]
+        if len(fighters) < max(sizes):
+            raise click.ClickException(f"Only {len(fighters)} fighters in the database")
+    else:
+        rng = random.Random(0)
+        first_names = ["Khabib", "Islam", "Zabit", "Petr", "Alexander", "Magomed", "Shamil", "Timur", "Arman", "Movsar"]
+        last_names = ["Nurmagomedov", "Makhachev", "Magomedsharipov", "Yan", "Volkov", "Ankalaev", "Gaziev", "Tsarukyan"]
+        fighters = [
+            {
+                "first_name": rng.choice(first_names), "last_name": rng.choice(last_names), "middle_name": None,
+                "birth_date": str(date(1985, 1, 1) + timedelta(days=rng.randrange(6000))),
+                "birth_place": rng.choice(["Makhachkala", "Almaty", "Grozny", "Moscow"]),
+                "nationality": rng.choice(["RU", "KZ", "UZ", "KG"]), "gender": "male",
+                "height": rng.randrange(160, 200), "weight_class": rng.choice(["56", "61", "66", "70", "77", "84"]),
+                "wins": rng.randrange(30), "losses": rng.randrange(10), "draws": rng.randrange(3),
+                "id": n + 1, "fighter_id": f"CAMMA-{n + 1:06d}", "photo_url": f"/static/fighters/{n + 1}.jpg",
+                "last_fight_date": None, "verification_status": "verified", "participation_status": "active",
+                "is_verified": True, "is_available": True, "is_injured": False, "injury_date": None,
+                "created_at": (datetime(2024, 1, 1) + timedelta(minutes=rng.randrange(500000))).isoformat(),
+            }
+            for n in range(max(sizes))
+        ]
+
+    configured = {"gzip": compression.GZIP_LEVEL, "br": compression.BROTLI_QUALITY, "zstd": compression.ZSTD_LEVEL}
+    levels = {"gzip": [1, 6, 9], "br": [1, 4, 6, 11], "zstd": [1, 3, 9, 19]}
+    cache = CompressedVariantCache(64 * 1024 * 1024)
+    for size in sizes:
+        payload = json.dumps(fighters[:size], separators=(",", ":")).encode()
+        click.echo(f"\n{size} fighters, {len(payload)} bytes uncompressed")
+        for encoding in AVAILABLE_ENCODINGS:
+            for level in sorted(set(levels[encoding]) | {configured[encoding]}):
+                cpu = time.process_time()
+                for _ in range(repeat):
+                    body = compress(encoding, payload, level)
+                cpu = (time.process_time() - cpu) / repeat
+                marker = "*" if level == configured[encoding] else " "
+                click.echo(
+                    f"  {encoding:5}{level:3}{marker} {len(body):9} bytes  {len(body) / len(payload):6.1%}"
+                    f"  {cpu * 1e3:8.3f} ms CPU  {len(payload) / cpu / 1e6 if cpu else 0:8.1f} MB/s"
+                )
+        # A repeated hit on a cacheable response is a cache lookup, not a recompression
+        key = ("etag", "/api/v1/fighters/", AVAILABLE_ENCODINGS[0])
+        cache.put(key, compress(AVAILABLE_ENCODINGS[0], payload))
+        cpu = time.process_time()
+        for _ in range(repeat * 100):
+            cache.get(key)
+        click.echo(f"  cached variant hit       {(time.process_time() - cpu) / (repeat * 100) * 1e6:8.3f} us CPU")
+
+
+@cli.command("benchmark-pk-lookups")
+@click.option("--repeat", default=5000, help="Lookups per variant")
+def benchmark_pk_lookups(repeat):
+    """Compare per-lookup CPU of Query.filter().first() with the repository helpers on the users table"""
+    import time
+    from sqlalchemy.orm import Session
+    from app.core.database import engine
+    from app.core.repository import exists, get_by_id
+    from app.models.user import User
+
+    with Session(engine) as db:
+        ids = [user_id for (user_id,) in db.query(User.id).limit(100)]
+        if not ids:
+            raise click.ClickException("Needs at least one user")
+
+        def cold_get(user_id):
+            # A fresh identity map every time: what a new request session sees
+            user = get_by_id(db, User, user_id)
+            db.expunge(user)
+
+        held = {}
+
+        def warm_get(user_id):
+            # The identity map references objects weakly; keep them alive as a request would
+            held[user_id] = get_by_id(db, User, user_id)
+
+        variants = [
+            ("query(User).filter().first()", lambda user_id: db.query(User).filter(User.id == user_id).first()),
+            ("get_by_id, not in session", cold_get),
+            ("get_by_id, already in session", warm_get),
+            ("query(User.id).filter().first()", lambda user_id: db.query(User.id).filter(User.id == user_id).first()),
+            ("exists (prebuilt statement)", lambda user_id: exists(db, User, user_id)),
+        ]
+        for label, lookup in variants:
+            for user_id in ids:  # warm statement caches
+                lookup(user_id)
+            cpu, wall = time.process_time(), time.perf_counter()
+            for n in range(repeat):
+                lookup(ids[n % len(ids)])
+            cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+            click.echo(f"{label:34} {cpu / repeat * 1e6:8.1f} us CPU  {wall / repeat * 1e6:8.1f} us wall per lookup")
+
+
+# Cold start as a worker sees it: import app.main, then build the app (create_app()
+# imports every router, model and schema and runs the warmup)
+STARTUP_SCRIPT = (
+    "import time; started = time.perf_counter(); import app.main; app.main.app; "
+    "print(f'startup_ms={(time.perf_counter() - started) * 1000:.1f}')"
+)
+
+
+def measure_startup(runs: int = 3):
+    """(ms to import app.main and build the app, [(self import time in us, module)]), best of ``runs`` fresh interpreters"""
+    return min((_measure_startup_once() for _ in range(runs)), key=lambda measurement: measurement[0])
+
+
+def _measure_startup_once():
+    import subprocess
+    import sys
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    # "import time: self [us] | cumulative | module", one line per imported module
+    imports = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if line.startswith("import time:") and parts[0].split(":")[1].strip().isdigit():
+            imports.append((int(parts[0].split(":")[1]), parts[2].strip()))
+    total_ms = next(
+        float(line.split("=", 1)[1]) for line in reversed(result.stdout.splitlines()) if line.startswith("startup_ms=")
+    )
+    return total_ms, imports
+
+
+@cli.command("startup-budget")
+@click.option("--budget-ms", default=settings.STARTUP_IMPORT_BUDGET_MS, show_default=True)
+@click.option("--top", default=10, help="Show the N imports with the largest own import time")
+@click.option("--runs", default=3, show_default=True, help="Best of this many fresh interpreters")
+def startup_budget(budget_ms, top, runs):
+    """Fail when a fresh `import app.main` plus create_app() takes longer than the budget (run in CI)"""
+    try:
+        total_ms, imports = measure_startup(runs)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    for us, module in sorted(imports, reverse=True)[:top]:
+        click.echo(f"{us / 1000:8.1f} ms  {module}")
+    click.echo(f"import app.main + create_app(): {total_ms:.0f} ms (budget {budget_ms} ms)")
+    if total_ms > budget_ms:
+        raise click.ClickException("startup time over budget")
+
+
+if __name__ == "__main__":
+    cli()
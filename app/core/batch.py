@@ -0,0 +1,21 @@
+from typing import Any
+from sqlalchemy.orm import Session
+
+# ASGI scope key that marks a sub-request dispatched by /api/v1/batch
+BATCH_SCOPE_KEY = "camma.batch"
+# Marks a read-only sub-request that follows a write in its batch: it reads from the primary
+READ_PRIMARY_SCOPE_KEY = "camma.batch.read_primary"
+
+
+class BatchContext:
+    """State shared by all sub-requests of one batch call.
+
+    Writing sub-requests reuse the batch's authenticated user and DB
+    session. A Session is not thread-safe, so the batch endpoint runs them
+    one after another (see ``run_batch``); nothing else may touch the session
+    while one is in flight. Read-only sub-requests run without a context.
+    """
+
+    def __init__(self, db: Session, user: Any):
+        self.db = db
+        self.user = user
@@ -0,0 +1,136 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+from .config import settings
+
+
+class Subscription:
+    """Bounded per-connection queue: a slow client loses its oldest messages, never grows memory"""
+
+    def __init__(self, maxsize: int):
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def put(self, message: str) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: float) -> Optional[str]:
+        """Next message, or None if nothing arrived within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker(ABC):
+    """Channel fan-out to the subscriptions of this process.
+
+    Messages are pre-encoded strings, so one publish is shared by reference
+    across every subscriber instead of being serialized per connection.
+    """
+
+    def __init__(self, queue_size: int = settings.LIVE_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._channels: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        subscription = Subscription(self.queue_size)
+        self._channels[channel].add(subscription)
+        try:
+            await self._on_subscribe()
+            yield subscription
+        finally:
+            subscribers = self._channels.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._channels.get(channel, ()))
+
+    def _fan_out(self, channel: str, message: str) -> None:
+        for subscription in list(self._channels.get(channel, ())):
+            subscription.put(message)
+
+    async def _on_subscribe(self) -> None:
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class InProcessBroker(Broker):
+    """Delivers only to clients connected to this worker"""
+
+    async def publish(self, channel: str, message: str) -> None:
+        self._fan_out(channel, message)
+
+
+class RedisBroker(Broker):
+    """Redis pub/sub: every worker holds one pattern subscription and fans out locally"""
+
+    def __init__(self, url: str = settings.REDIS_URL, prefix: str = "camma:live:", **kwargs):
+        super().__init__(**kwargs)
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self._redis = redis.from_url(url, decode_responses=True)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._redis.publish(self.prefix + channel, message)
+
+    async def _on_subscribe(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.psubscribe(self.prefix + "*")
+                async for item in pubsub.listen():
+                    if item["type"] == "pmessage":
+                        self._fan_out(item["channel"][len(self.prefix):], item["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Live broker connection lost: {e}")
+                await asyncio.sleep(1)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._redis.aclose()
+
+
+_broker: Optional[Broker] = None
+
+
+def get_broker() -> Broker:
+    global _broker
+    if _broker is None:
+        if settings.LIVE_BROKER != "redis" and settings.WEB_CONCURRENCY > 1:
+            # Each worker would only reach its own clients
+            raise RuntimeError(
+                f"LIVE_BROKER={settings.LIVE_BROKER!r} cannot fan out across "
+                f"{settings.WEB_CONCURRENCY} workers; use LIVE_BROKER=redis or WEB_CONCURRENCY=1"
+            )
+        _broker = RedisBroker() if settings.LIVE_BROKER == "redis" else InProcessBroker()
+    return _broker
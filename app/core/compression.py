@@ -0,0 +1,236 @@
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoder
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional encoder
+    zstandard = None
+
+# Server preference when the client weighs several encodings equally
+PREFERRED_ENCODINGS = ("zstd", "br", "gzip")
+
+COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain", "text/csv", "application/javascript")
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+
+AVAILABLE_ENCODINGS = tuple(
+    encoding for encoding, module in (("zstd", zstandard), ("br", brotli), ("gzip", gzip))
+    if module is not None
+)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best encoding we support from an Accept-Encoding header"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best, best_q = None, 0.0
+    for encoding in PREFERRED_ENCODINGS:
+        if encoding not in AVAILABLE_ENCODINGS:
+            continue
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(encoding: str, data: bytes, level: Optional[int] = None) -> bytes:
+    """One-shot compression at the configured level (or ``level``, for benchmarks)"""
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY if level is None else level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL if level is None else level).compress(data)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+        elif encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "gzip":
+            return self._obj.compress(chunk) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._obj.process(chunk) + self._obj.flush()
+        return self._obj.compress(chunk) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+class CompressedVariantCache:
+    """LRU of compressed bodies keyed by (path, ETag, encoding).
+
+    An unchanged ETag means an unchanged body, so repeated hits on a
+    cacheable response reuse the compressed bytes instead of recompressing.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._size = 0
+        self._items: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple[str, str, str], value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._items[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """Content-negotiated zstd/br/gzip compression.
+
+    Whole bodies above ``minimum_size`` are compressed in one go (and cached
+    by ETag when the response has one); streamed bodies are compressed
+    chunk by chunk so nothing is buffered. Server-Sent Events and media
+    types that are already compressed are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, cache: Optional[CompressedVariantCache] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send: Send):
+        self.middleware = middleware
+        self.path = scope.get("path", "")
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    def _should_compress(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        if self.passthrough:
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            chunk = self.compressor.compress(body)
+            if not more_body:
+                chunk += self.compressor.finish()
+            await self.downstream({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        if not self._should_compress(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+            self.passthrough = True
+            await self.downstream(self.start_message)
+            await self.downstream(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body:
+            # Streaming response: compress incrementally, length is unknown
+            del headers["Content-Length"]
+            self.compressor = StreamCompressor(self.encoding)
+            await self.downstream(self.start_message)
+            await self.downstream({
+                "type": "http.response.body",
+                "body": self.compressor.compress(body),
+                "more_body": True,
+            })
+            return
+
+        compressed = None
+        cache = self.middleware.cache
+        etag = headers.get("etag")
+        cache_key = (self.path, etag, self.encoding) if etag and cache is not None else None
+        if cache_key is not None:
+            compressed = cache.get(cache_key)
+        if compressed is None:
+            compressed = compress(self.encoding, body)
+            if cache_key is not None:
+                cache.put(cache_key, compressed)
+
+        headers["Content-Length"] = str(len(compressed))
+        await self.downstream(self.start_message)
+        await self.downstream({"type": "http.response.body", "body": compressed, "more_body": False})
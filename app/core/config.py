@@ -1,5 +1,5 @@
 import os
-from typing import Any, Optional
+from typing import Any, List, Optional
 from pydantic import PostgresDsn, field_validator, ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -21,6 +21,28 @@ class Settings(BaseSettings):
 
     # Database (Render sets DATABASE_URL automatically)
     DATABASE_URL: Optional[PostgresDsn] = None
+    # Append distinct SELECT shapes to this JSON-lines file for `python -m app.cli index-advisor`
+    QUERY_CAPTURE_PATH: Optional[str] = None
+
+    # Connection pools: each worker process gets an equal share of DB_MAX_CONNECTIONS
+    # (minus DB_RESERVED_CONNECTIONS for migrations, celery and admin sessions)
+    WEB_CONCURRENCY: int = 4  # Server worker processes
+    DB_MAX_CONNECTIONS: int = 100  # Server max_connections, or the pooler's client limit with DB_POOLER
+    DB_RESERVED_CONNECTIONS: int = 10
+    DB_POOL_SIZE: Optional[int] = None  # Overrides the derived values when set
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: float = 10.0  # Seconds a request waits for a connection before failing
+    DB_POOL_RECYCLE: int = 300
+    # "pgbouncer": connect through PgBouncer in transaction pooling mode (no server-side prepared statements)
+    DB_POOLER: Optional[str] = None
+    # Cold start: ceiling for `python -m app.cli startup-budget` (import app.main + create_app())
+    STARTUP_IMPORT_BUDGET_MS: int = 2000
+
+    # Read replicas, as a JSON list of URLs; read-only endpoints use them via get_read_db
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Replicas further behind are skipped until they catch up
+    REPLICA_CHECK_SECONDS: float = 10.0  # How often each process re-checks replica health and lag
+    REPLICA_CONNECT_TIMEOUT: int = 2  # Seconds before an unreachable replica counts as down
 
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
@@ -40,13 +62,65 @@ class Settings(BaseSettings):
     # Redis (optional)
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
 
+    # SMS provider (unset = print to stdout in development)
+    SMS_API_KEY: Optional[str] = None
+    SMS_API_URL: Optional[str] = None
+
+    # Deadline reminders: "asyncio" (in-process, one worker elected by advisory lock), "celery" (worker + beat) or "off"
+    REMINDER_BACKEND: str = "asyncio"
+    REMINDER_TICK_SECONDS: int = 60
+    REMINDER_HORIZON_MINUTES: int = 60  # How far ahead each scan loads deadlines
+    REMINDER_BATCH_SIZE: int = 100
+    REMINDER_CLAIM_LEASE_SECONDS: int = 600  # An undelivered claim this old is retried by the next scan
+    TASK_REMINDER_LEAD_MINUTES: int = 24 * 60
+    CONTRACT_REMINDER_LEAD_DAYS: int = 30
+
     # File storage
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
 
+    # Resumable video uploads: partial files live outside UPLOAD_DIR so they are never served
+    UPLOAD_TMP_DIR: str = "uploads_tmp"
+    MAX_VIDEO_UPLOAD_SIZE: int = 20 * 1024 * 1024 * 1024  # 20GB
+    UPLOAD_STATE_BACKEND: str = "redis"  # "redis" (all workers) or "memory" (only with WEB_CONCURRENCY=1)
+    UPLOAD_SESSION_TTL_SECONDS: int = 24 * 60 * 60  # Idle uploads expire this long after the last chunk
+    UPLOAD_LOCK_SECONDS: int = 15 * 60  # Longest a single PATCH may hold an upload
+
+    # Clubs/promotions/trainers/managers snapshot, memory-mapped by every worker on the host
+    REFERENCE_DATA_PATH: str = "cache/reference_data.bin"
+    REFERENCE_DATA_CHECK_SECONDS: float = 30.0  # How often each process compares the snapshot with the database version
+
     # Security
     CORS_ORIGINS: list = ["*"]
 
+    # Response compression
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # 32MB of compressed variants
+
+    # Request coalescing: how long a finished single-flight result is reused (0 disables)
+    SINGLEFLIGHT_CACHE_SECONDS: float = 0.0
+
+    # Event calendar: per-bucket counts are cached this long (writes in this process invalidate sooner)
+    CALENDAR_CACHE_SECONDS: float = 60.0
+
+    # Fighter name search: minimum pg_trgm word similarity (0..1) for a match
+    FIGHTER_SEARCH_THRESHOLD: float = 0.4
+
+    # Duplicate fighter detection: pairs scoring at least this (0..1) are reported
+    DUPLICATE_SCORE_THRESHOLD: float = 0.8
+
+    # Batch endpoint
+    BATCH_MAX_REQUESTS: int = 20
+    BATCH_READ_CONCURRENCY: int = 4  # GET sub-requests run at once, each with its own sessions
+
+    # Live event updates (SSE/WebSocket): "redis" (all workers) or "memory" (only with WEB_CONCURRENCY=1)
+    LIVE_BROKER: str = "redis"
+    LIVE_QUEUE_SIZE: int = 64  # Messages buffered per connection; oldest dropped beyond this
+    LIVE_HEARTBEAT_SECONDS: int = 15
+
+    # Prometheus scrapes /metrics with "Authorization: Bearer <METRICS_TOKEN>"; unset disables the endpoint
+    METRICS_TOKEN: Optional[str] = None
+
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
@@ -1,22 +1,226 @@
-from sqlalchemy import create_engine
+import itertools
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from fastapi import Request
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import Connection, Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from .batch import BATCH_SCOPE_KEY, READ_PRIMARY_SCOPE_KEY
 from .config import settings
+from .metrics import DB_POOL_CHECKED_OUT, DB_POOL_TIMEOUTS, DB_POOL_WAIT_SECONDS
 
-engine = create_engine(
-    str(settings.DATABASE_URL),
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=10,
-    max_overflow=20,
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait time and timeouts to Prometheus"""
+    
+    label = "db"
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.label).inc()
+            raise
+        finally:
+            DB_POOL_WAIT_SECONDS.labels(self.label).observe(time.perf_counter() - started)
+
+def pool_sizes(workers: Optional[int] = None) -> Tuple[int, int]:
+    """(pool_size, max_overflow) per process so that every worker at full overflow
+    stays within DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS"""
+    workers = max(1, workers or settings.WEB_CONCURRENCY)
+    budget = max(1, (settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS) // workers)
+    pool_size = settings.DB_POOL_SIZE if settings.DB_POOL_SIZE is not None else max(1, budget * 2 // 3)
+    max_overflow = settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW is not None else max(0, budget - pool_size)
+    return pool_size, max_overflow
+
+def _pooler_connect_args(url: str) -> dict:
+    # PgBouncer transaction pooling hands each transaction a different server
+    # connection, so server-side prepared statements must be off. psycopg2
+    # never prepares; psycopg 3 does unless told not to.
+    if settings.DB_POOLER != "pgbouncer":
+        return {}
+    if make_url(url).get_driver_name() == "psycopg":
+        return {"prepare_threshold": None}
+    return {}
+
+def make_engine(url: str, label: str, connect_timeout: Optional[int] = None) -> Engine:
+    pool_size, max_overflow = pool_sizes()
+    connect_args = _pooler_connect_args(url)
+    if connect_timeout is not None and make_url(url).get_backend_name() == "postgresql":
+        connect_args["connect_timeout"] = connect_timeout
+    new_engine = create_engine(
+        url,
+        poolclass=type(f"{label.title()}Pool", (TimedQueuePool,), {"label": label}),
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        connect_args=connect_args,
+    )
+    event.listen(new_engine, "checkout", lambda *args: DB_POOL_CHECKED_OUT.labels(label).inc())
+    event.listen(new_engine, "checkin", lambda *args: DB_POOL_CHECKED_OUT.labels(label).dec())
+    return new_engine
+
+engine = make_engine(str(settings.DATABASE_URL), "primary")
+
+def capture_query_shapes(engine, path: str) -> None:
+    """Record each distinct SELECT (with one sample of its parameters) to a JSON-lines file"""
+    seen = set()
+    lock = threading.Lock()
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith("SELECT"):
+            return
+        with lock:
+            if statement in seen:
+                return
+            seen.add(statement)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"statement": statement, "parameters": parameters}, default=str) + "\n")
+
+if settings.QUERY_CAPTURE_PATH:
+    capture_query_shapes(engine, settings.QUERY_CAPTURE_PATH)
+
+REPLICATION_LAG = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+def replication_lag(conn: Connection) -> float:
+    """Seconds the replica is behind; an idle but caught-up replica reports 0"""
+    if conn.dialect.name != "postgresql":
+        conn.execute(text("SELECT 1"))
+        return 0.0
+    return float(conn.execute(REPLICATION_LAG).scalar())
+
+class ReplicaRouter:
+    """Picks a healthy replica whose lag is within REPLICA_MAX_LAG_SECONDS, round-robin.
+    
+    Health and lag are re-checked at most every REPLICA_CHECK_SECONDS in a
+    background thread, started by whichever request notices the result is
+    stale; requests never wait for it and keep using the last result (none
+    yet: the primary). A disconnect error on a replica takes it out of
+    rotation immediately.
+    """
+    
+    def __init__(self, engines: List[Engine], max_lag: float, check_interval: float):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lag: Dict[Engine, Optional[float]] = {}  # None = unreachable
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()  # Held while a check runs
+        self._turn = itertools.count()
+        for replica in engines:
+            event.listen(replica, "handle_error", self._on_error)
+    
+    def _on_error(self, context) -> None:
+        if context.is_disconnect and context.engine is not None:
+            self._lag[context.engine] = None
+    
+    def check(self) -> None:
+        for replica in self.engines:
+            try:
+                with replica.connect() as conn:
+                    self._lag[replica] = replication_lag(conn)
+            except Exception as e:
+                print(f"Replica {replica.url.render_as_string(hide_password=True)} unavailable: {e}")
+                self._lag[replica] = None
+        self._checked_at = time.monotonic()
+    
+    def refresh(self) -> Optional[threading.Thread]:
+        """Start a background check if the last one is stale and none is running"""
+        if time.monotonic() - self._checked_at <= self.check_interval or not self._lock.acquire(blocking=False):
+            return None
+        
+        def run():
+            try:
+                self.check()
+            finally:
+                self._lock.release()
+        
+        thread = threading.Thread(target=run, name="replica-check", daemon=True)
+        thread.start()
+        return thread
+    
+    def choose(self) -> Optional[Engine]:
+        """A usable replica, or None to fall back to the primary"""
+        if not self.engines:
+            return None
+        self.refresh()
+        usable = [
+            replica for replica in self.engines
+            if self._lag.get(replica) is not None and self._lag[replica] <= self.max_lag
+        ]
+        if not usable:
+            return None
+        return usable[next(self._turn) % len(usable)]
+
+replica_router = ReplicaRouter(
+    [
+        make_engine(url, f"replica{i}", connect_timeout=settings.REPLICA_CONNECT_TIMEOUT)
+        for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+    ],
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_CHECK_SECONDS,
 )
 
+class RoutingSession(Session):
+    """Reads go to one replica until the session writes; from then on everything uses the primary.
+    
+    The replica is chosen once per session so all its reads see one
+    snapshot. Pinning after the first flush or non-SELECT statement means a
+    request that writes and then reads sees its own write.
+    """
+    
+    router = replica_router
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or (clause is not None and not clause.is_select):
+            self.info["pinned"] = True
+        elif clause is not None and not self.info.get("pinned"):
+            if "replica" not in self.info:
+                self.info["replica"] = self.router.choose()
+            if self.info["replica"] is not None:
+                return self.info["replica"]
+        return super().get_bind(mapper, clause=clause, **kw)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-def get_db():
+def get_db(request: Request):
+    # Sub-requests of a batch call share the batch's session (they run one at a time)
+    batch = request.scope.get(BATCH_SCOPE_KEY)
+    if batch is not None:
+        yield batch.db
+        return
+    
     db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db(request: Request):
+    """Like get_db, but reads may be served by a replica (see RoutingSession)"""
+    batch = request.scope.get(BATCH_SCOPE_KEY)
+    if batch is not None:
+        yield batch.db
+        return
+    
+    # Pinned up front when an earlier sub-request of the batch wrote, so a lagging replica can't hide it
+    db = ReadSessionLocal(info={"pinned": True}) if request.scope.get(READ_PRIMARY_SCOPE_KEY) else ReadSessionLocal()
     try:
         yield db
     finally:
@@ -1,17 +1,32 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+from typing import Generator, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from .database import get_db
+from .batch import BATCH_SCOPE_KEY
+from .database import SessionLocal, get_db
+from .repository import get_by_id
 from .security import verify_token
 from ..models.user import User
 
 security = HTTPBearer()
 
+def _user_pk(subject: str) -> int:
+    # Tokens carry the id as a string; the identity map is keyed by the int
+    try:
+        return int(subject)
+    except ValueError:
+        return 0
+
 def get_current_user(
+    request: Request,
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
+    # Batch sub-requests run in the batch's already authenticated context
+    batch = request.scope.get(BATCH_SCOPE_KEY)
+    if batch is not None:
+        return batch.user
+    
     token = credentials.credentials
     user_id = verify_token(token)
     if user_id is None:
@@ -21,7 +36,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_by_id(db, User, _user_pk(user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -34,4 +49,13 @@ def get_current_active_user(
 ) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
\ No newline at end of file
+    return current_user
+
+def authenticate_token(token: Optional[str]) -> Optional[User]:
+    """Resolve a bearer token outside a request (WebSocket routes); None if invalid or inactive"""
+    user_id = verify_token(token) if token else None
+    if user_id is None:
+        return None
+    with SessionLocal() as db:
+        user = get_by_id(db, User, _user_pk(user_id))
+        return user if user is not None and user.is_active else None
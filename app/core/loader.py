@@ -0,0 +1,91 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+from fastapi import Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from .database import get_read_db
+
+# include name -> (foreign key attribute, related model, summary schema)
+Relations = Dict[str, Tuple[str, Any, Type[BaseModel]]]
+
+
+class RelationLoader:
+    """DataLoader-style batch loader scoped to one request.
+
+    Primary-key lookups are collected per model and resolved with a single
+    ``IN`` query; loaded rows are memoized, so asking for the same ids again
+    (or for an overlapping set) costs no further queries.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._cache: Dict[Any, Dict[int, Any]] = defaultdict(dict)
+
+    def load_many(self, model: Any, ids: Iterable[Optional[int]]) -> Dict[int, Any]:
+        cache = self._cache[model]
+        missing = {i for i in ids if i is not None and i not in cache}
+        if missing:
+            for obj in self.db.query(model).filter(model.id.in_(missing)):
+                cache[obj.id] = obj
+            for i in missing:
+                cache.setdefault(i, None)
+        return cache
+
+
+def get_loader(db: Session = Depends(get_read_db)) -> RelationLoader:
+    # FastAPI caches dependencies per request, so every user of the loader in one request shares it
+    return RelationLoader(db)
+
+
+def parse_include(include: Optional[str], relations: Relations) -> List[str]:
+    """Validate a comma-separated ``include`` parameter against the allowed relations"""
+    if not include:
+        return []
+    names = []
+    for name in include.split(","):
+        name = name.strip()
+        if not name or name in names:
+            continue
+        if name not in relations:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown include '{name}'. Allowed: {', '.join(sorted(relations))}"
+            )
+        names.append(name)
+    return names
+
+
+def expand(
+    loader: RelationLoader, rows: Sequence[Any], include: List[str], relations: Relations
+) -> List[Dict[str, Any]]:
+    """Resolve included relations for a page of rows; one query per related model"""
+    ids_by_model: Dict[Any, set] = defaultdict(set)
+    for name in include:
+        fk, model, _ = relations[name]
+        ids_by_model[model].update(getattr(row, fk) for row in rows)
+
+    loaded = {model: loader.load_many(model, ids) for model, ids in ids_by_model.items()}
+
+    expansions = []
+    for row in rows:
+        extra = {}
+        for name in include:
+            fk, model, schema = relations[name]
+            obj = loaded[model].get(getattr(row, fk))
+            extra[name] = schema.model_validate(obj, from_attributes=True) if obj is not None else None
+        expansions.append(extra)
+    return expansions
+
+
+def build_expanded(
+    base_schema: Type[BaseModel],
+    expanded_schema: Type[BaseModel],
+    rows: Sequence[Any],
+    expansions: List[Dict[str, Any]],
+) -> List[BaseModel]:
+    # Validate through the base schema: reading relation names off the ORM
+    # rows directly would trigger one lazy load per row
+    return [
+        expanded_schema(**base_schema.model_validate(row, from_attributes=True).model_dump(), **extra)
+        for row, extra in zip(rows, expansions)
+    ]
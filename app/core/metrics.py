@@ -0,0 +1,48 @@
+import os
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess, CONTENT_TYPE_LATEST
+)
+
+SINGLEFLIGHT_REQUESTS = Counter(
+    "camma_singleflight_requests_total",
+    "Requests that went through a single-flight group",
+    ["route"],
+)
+SINGLEFLIGHT_EXECUTIONS = Counter(
+    "camma_singleflight_executions_total",
+    "Computations actually executed by a single-flight group (requests / executions = collapse ratio)",
+    ["route"],
+)
+SINGLEFLIGHT_CACHE_HITS = Counter(
+    "camma_singleflight_cache_hits_total",
+    "Requests served from the single-flight micro-cache",
+    ["route"],
+)
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    "camma_db_pool_wait_seconds",
+    "Time to get a connection from the SQLAlchemy pool (includes opening overflow connections)",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "camma_db_pool_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT",
+    ["pool"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "camma_db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+
+def render_metrics() -> bytes:
+    # Under gunicorn every worker writes to PROMETHEUS_MULTIPROC_DIR; aggregate them
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
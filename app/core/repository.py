@@ -0,0 +1,41 @@
+from typing import Any, Dict, Optional, Type, TypeVar
+from fastapi import HTTPException
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.orm import Session
+
+ModelT = TypeVar("ModelT")
+
+# One prebuilt statement per model: executing it only computes the cache key
+# and binds the id, instead of building a Query and its select every time
+_exists_statements: Dict[Any, Select] = {}
+
+
+def get_by_id(db: Session, model: Type[ModelT], id: Any) -> Optional[ModelT]:
+    """Primary-key lookup through the session's identity map.
+
+    An object already loaded in this session is returned without any SQL;
+    otherwise Session.get runs its internally cached load statement, which
+    skips the Query construction and compilation of
+    ``db.query(model).filter(model.id == id).first()``.
+    """
+    return db.get(model, id)
+
+
+def get_or_404(db: Session, model: Type[ModelT], id: Any, detail: Optional[str] = None) -> ModelT:
+    obj = db.get(model, id)
+    if obj is None:
+        raise HTTPException(status_code=404, detail=detail or f"{model.__name__} not found")
+    return obj
+
+
+def exists(db: Session, model: Any, id: Any) -> bool:
+    """Whether a row with this primary key exists, without loading the object"""
+    stmt = _exists_statements.get(model)
+    if stmt is None:
+        stmt = _exists_statements[model] = select(model.id).where(model.id == bindparam("pk")).limit(1)
+    return db.execute(stmt, {"pk": id}).first() is not None
+
+
+def exists_or_404(db: Session, model: Any, id: Any, detail: Optional[str] = None) -> None:
+    if not exists(db, model, id):
+        raise HTTPException(status_code=404, detail=detail or f"{model.__name__} not found")
@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+from .metrics import SINGLEFLIGHT_REQUESTS, SINGLEFLIGHT_EXECUTIONS, SINGLEFLIGHT_CACHE_HITS
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent identical computations into one.
+
+    The first caller for a key runs ``fn``; callers arriving while it is in
+    flight wait and receive the same result (or exception). With
+    ``cache_seconds`` > 0 the result is also reused for that long after it
+    completes. Results are shared between requests, so ``fn`` must return
+    plain data (e.g. response schemas), not session-bound ORM objects.
+    """
+
+    def __init__(self, name: str, cache_seconds: float = 0.0, max_entries: int = 1024):
+        self.name = name
+        self.cache_seconds = cache_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        SINGLEFLIGHT_REQUESTS.labels(self.name).inc()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                SINGLEFLIGHT_CACHE_HITS.labels(self.name).inc()
+                return cached[1]
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        SINGLEFLIGHT_EXECUTIONS.labels(self.name).inc()
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and self.cache_seconds > 0:
+                    self._remember(key, call.result)
+            call.done.set()
+        return call.result
+
+    def _remember(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        if len(self._cache) >= self.max_entries:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            if len(self._cache) >= self.max_entries:
+                self._cache.clear()
+        self._cache[key] = (now + self.cache_seconds, value)
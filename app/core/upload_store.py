@@ -0,0 +1,131 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+from .config import settings
+
+
+class UploadBusy(Exception):
+    """Another request is writing to the same upload"""
+
+
+class UploadStore(ABC):
+    """Resumable upload state (offset, length, owner, ...) keyed by upload id.
+
+    States are plain JSON-able dicts. Every save pushes the expiry out by
+    UPLOAD_SESSION_TTL_SECONDS, so only idle uploads expire.
+    """
+
+    def __init__(self, ttl: int = settings.UPLOAD_SESSION_TTL_SECONDS, lock_seconds: int = settings.UPLOAD_LOCK_SECONDS):
+        self.ttl = ttl
+        self.lock_seconds = lock_seconds
+
+    @abstractmethod
+    async def get(self, upload_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def save(self, state: dict) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, upload_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def lock(self, upload_id: str):
+        """Exclusive, non-blocking hold on one upload; raises UploadBusy if already held"""
+
+    async def close(self) -> None:
+        pass
+
+
+class InProcessUploadStore(UploadStore):
+    """Keeps state in this worker; clients must reach the same process to resume"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._states: Dict[str, dict] = {}
+        self._locked: Set[str] = set()
+
+    async def get(self, upload_id: str) -> Optional[dict]:
+        state = self._states.get(upload_id)
+        if state is not None and state["expires_at"] <= time.time():
+            del self._states[upload_id]
+            return None
+        return dict(state) if state is not None else None
+
+    async def save(self, state: dict) -> None:
+        now = time.time()
+        for upload_id in [k for k, v in self._states.items() if v["expires_at"] <= now]:
+            del self._states[upload_id]
+        self._states[state["id"]] = dict(state, expires_at=now + self.ttl)
+
+    async def delete(self, upload_id: str) -> None:
+        self._states.pop(upload_id, None)
+
+    @asynccontextmanager
+    async def lock(self, upload_id: str) -> AsyncIterator[None]:
+        if upload_id in self._locked:
+            raise UploadBusy(upload_id)
+        self._locked.add(upload_id)
+        try:
+            yield
+        finally:
+            self._locked.discard(upload_id)
+
+
+class RedisUploadStore(UploadStore):
+    """State in Redis with a key TTL, so any worker sharing UPLOAD_TMP_DIR can resume an upload"""
+
+    def __init__(self, url: str = settings.REDIS_URL, prefix: str = "camma:upload:", **kwargs):
+        super().__init__(**kwargs)
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self._redis = redis.from_url(url, decode_responses=True)
+
+    async def get(self, upload_id: str) -> Optional[dict]:
+        raw = await self._redis.get(self.prefix + upload_id)
+        return json.loads(raw) if raw is not None else None
+
+    async def save(self, state: dict) -> None:
+        state = dict(state, expires_at=time.time() + self.ttl)
+        await self._redis.set(self.prefix + state["id"], json.dumps(state), ex=self.ttl)
+
+    async def delete(self, upload_id: str) -> None:
+        await self._redis.delete(self.prefix + upload_id)
+
+    @asynccontextmanager
+    async def lock(self, upload_id: str) -> AsyncIterator[None]:
+        # The lock expires on its own so a crashed worker cannot wedge an upload
+        lock = self._redis.lock(self.prefix + upload_id + ":lock", timeout=self.lock_seconds)
+        if not await lock.acquire(blocking=False):
+            raise UploadBusy(upload_id)
+        try:
+            yield
+        finally:
+            try:
+                await lock.release()
+            except Exception as e:
+                print(f"Upload lock for {upload_id} expired before release: {e}")
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+_store: Optional[UploadStore] = None
+
+
+def get_upload_store() -> UploadStore:
+    global _store
+    if _store is None:
+        if settings.UPLOAD_STATE_BACKEND != "redis" and settings.WEB_CONCURRENCY > 1:
+            # A resumed PATCH or HEAD reaching another worker would not find the upload
+            raise RuntimeError(
+                f"UPLOAD_STATE_BACKEND={settings.UPLOAD_STATE_BACKEND!r} cannot share uploads across "
+                f"{settings.WEB_CONCURRENCY} workers; use UPLOAD_STATE_BACKEND=redis or WEB_CONCURRENCY=1"
+            )
+        _store = RedisUploadStore() if settings.UPLOAD_STATE_BACKEND == "redis" else InProcessUploadStore()
+    return _store
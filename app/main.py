@@ -1,97 +1,186 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-import uvicorn
 import os
+import secrets
 
-from app.api.v1.api import api_router
 from app.core.config import settings
-from app.core.database import engine
-from app.models import user, fighter, enums  # Import to register tables
+
+# Routers, models and services are imported inside create_app()/lifespan so
+# that `import app.main` stays cheap for tooling (CLI, alembic); the
+# module-level `app` is built on first access (see __getattr__ below).
+# create_app() imports every router up front, so a worker's cold start is
+# both steps together, which is what `app.cli startup-budget` measures.
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from app.core.broker import get_broker
+    from app.core.database import pool_sizes
+    from app.core.upload_store import get_upload_store
+    from app.services.reference_data import reference_data
+    from app.services.reminders import get_reminder_scheduler
+    from app.services.video_uploads import purge_stale_uploads
+
     # Startup
     print("🚀 Starting CAMMA API...")
+    pool_size, max_overflow = pool_sizes()
+    print(f"DB pool per worker: {pool_size} + {max_overflow} overflow ({settings.WEB_CONCURRENCY} workers, pooler: {settings.DB_POOLER or 'none'})")
+    # Fail fast on live updates or upload state that cannot reach every worker
+    get_broker()
+    get_upload_store()
     
     # Create upload directories
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
     os.makedirs(f"{settings.UPLOAD_DIR}/fighters", exist_ok=True)
     os.makedirs(f"{settings.UPLOAD_DIR}/contracts", exist_ok=True)
     os.makedirs(f"{settings.UPLOAD_DIR}/events", exist_ok=True)
+    os.makedirs(settings.UPLOAD_TMP_DIR, exist_ok=True)
+    purge_stale_uploads()
+    reference_data.load()
+    
+    # Deadline reminders (no-op when REMINDER_BACKEND is "celery" or "off")
+    reminder_scheduler = get_reminder_scheduler()
+    await reminder_scheduler.start()
     
     yield
     
     # Shutdown
+    await reminder_scheduler.stop()
+    await get_broker().close()
+    await get_upload_store().close()
     print("🛑 Shutting down CAMMA API...")
 
-app = FastAPI(
-    title=settings.APP_NAME,
-    version=settings.APP_VERSION,
-    description="Combat Arts Management and Marketing Application",
-    openapi_url="/api/v1/openapi.json" if settings.DEBUG else None,
-    docs_url="/docs" if settings.DEBUG else None,
-    redoc_url="/redoc" if settings.DEBUG else None,
-    lifespan=lifespan
-)
-
-# Security middleware
-app.add_middleware(
-    TrustedHostMiddleware,
-    allowed_hosts=["*"] if settings.DEBUG else ["yourdomain.com", "api.yourdomain.com"]
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Static files
-app.mount("/static", StaticFiles(directory=settings.UPLOAD_DIR), name="static")
-
-# API routes
-app.include_router(api_router, prefix="/api/v1")
-
-@app.get("/")
-async def root():
-    return {
-        "message": f"Welcome to {settings.APP_NAME}",
-        "version": settings.APP_VERSION,
-        "status": "active"
-    }
-
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy", "timestamp": "2025-01-02T00:00:00Z"}
-
-@app.exception_handler(404)
-async def not_found_handler(request: Request, exc):
-    return JSONResponse(
-        status_code=404,
-        content={"detail": "Resource not found"}
+
+def warmup(app: FastAPI) -> None:
+    """Do the work that would otherwise land on the first requests.
+
+    Configures all SQLAlchemy mappers (relationships are resolved lazily on
+    first query otherwise), completes any schema whose forward references
+    were left unresolved at import, and builds the OpenAPI document.
+    """
+    from pydantic import BaseModel
+    from sqlalchemy.orm import configure_mappers
+
+    configure_mappers()
+    pending = list(BaseModel.__subclasses__())
+    while pending:
+        model = pending.pop()
+        pending.extend(model.__subclasses__())
+        if model.__module__.startswith("app.") and not model.__pydantic_complete__:
+            model.model_rebuild()
+    if app.openapi_url:
+        app.openapi()
+
+
+def create_app() -> FastAPI:
+    from app.api.v1.api import api_router
+    from app.core.compression import CompressionMiddleware, CompressedVariantCache
+    from app.core.metrics import CONTENT_TYPE_LATEST, render_metrics
+    from app.models import user, fighter, enums  # Import to register tables
+
+    app = FastAPI(
+        title=settings.APP_NAME,
+        version=settings.APP_VERSION,
+        description="Combat Arts Management and Marketing Application",
+        openapi_url="/api/v1/openapi.json" if settings.DEBUG else None,
+        docs_url="/docs" if settings.DEBUG else None,
+        redoc_url="/redoc" if settings.DEBUG else None,
+        lifespan=lifespan
+    )
+
+    # Security middleware
+    app.add_middleware(
+        TrustedHostMiddleware,
+        allowed_hosts=["*"] if settings.DEBUG else ["yourdomain.com", "api.yourdomain.com"]
+    )
+
+    # Compression middleware (zstd/br/gzip, compressed variants cached by ETag)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        cache=CompressedVariantCache(settings.COMPRESSION_CACHE_MAX_BYTES)
     )
 
-@app.exception_handler(500)
-async def internal_error_handler(request: Request, exc):
-    return JSONResponse(
-        status_code=500,
-        content={"detail": "Internal server error"}
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["Location", "Upload-Offset", "Upload-Length"],
     )
 
+    # Static files (the directory is created in lifespan, not here)
+    app.mount("/static", StaticFiles(directory=settings.UPLOAD_DIR, check_dir=False), name="static")
+
+    # API routes
+    app.include_router(api_router, prefix="/api/v1")
+
+    @app.get("/")
+    async def root():
+        return {
+            "message": f"Welcome to {settings.APP_NAME}",
+            "version": settings.APP_VERSION,
+            "status": "active"
+        }
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy", "timestamp": "2025-01-02T00:00:00Z"}
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics(request: Request):
+        if not settings.METRICS_TOKEN:
+            return JSONResponse(status_code=404, content={"detail": "Resource not found"})
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+            return JSONResponse(
+                status_code=401,
+                content={"detail": "Not authenticated"},
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+    @app.exception_handler(404)
+    async def not_found_handler(request: Request, exc):
+        return JSONResponse(
+            status_code=404,
+            content={"detail": "Resource not found"}
+        )
+
+    @app.exception_handler(500)
+    async def internal_error_handler(request: Request, exc):
+        return JSONResponse(
+            status_code=500,
+            content={"detail": "Internal server error"}
+        )
+
+    warmup(app)
+    return app
+
+
+def __getattr__(name: str):
+    # "app.main:app" keeps working for uvicorn, gunicorn and tests
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
-        "main:app",
+        "app.main:create_app",
+        factory=True,
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
-        workers=1 if settings.DEBUG else 4,
+        workers=1 if settings.DEBUG else settings.WEB_CONCURRENCY,
         log_level=settings.LOG_LEVEL.lower()
     )
\ No newline at end of file
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, ForeignKey, Text, Float
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Date, Boolean, ForeignKey, Text, Float, JSON, UniqueConstraint, Index, text, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy import Enum as SQLEnum
 from ..core.database import Base
@@ -8,9 +9,23 @@ from .enums import (
     FightResultEnum, FightMethodEnum, TaskStatusEnum
 )
 from datetime import datetime
+from ..utils.names import name_search_key
 
 class Fighter(Base):
     __tablename__ = "fighters"
+    __table_args__ = (
+        # Partial indexes keep the dashboard's verified/available counts index-only
+        Index("ix_fighters_verified", "id", postgresql_where=text("is_verified")),
+        Index("ix_fighters_available", "id", postgresql_where=text("is_available")),
+        # pg_trgm index for fuzzy name search (see services.fighter_search)
+        Index(
+            "ix_fighters_name_search_trgm", "name_search",
+            postgresql_using="gin", postgresql_ops={"name_search": "gin_trgm_ops"}
+        ),
+        # Blocking keys for duplicate detection (see services.fighter_duplicates)
+        Index("ix_fighters_birth_date", "birth_date"),
+        Index("ix_fighters_passport_number", "passport_number"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True)
@@ -20,6 +35,7 @@ class Fighter(Base):
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     middle_name = Column(String(100))
+    name_search = Column(String(320))  # Normalized, transliterated names; maintained on insert/update
     birth_date = Column(Date, nullable=False)
     birth_place = Column(String(200))
     nationality = Column(String(100))
@@ -70,6 +86,11 @@ class Fighter(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+@event.listens_for(Fighter, "before_insert")
+@event.listens_for(Fighter, "before_update")
+def _set_name_search(mapper, connection, target):
+    target.name_search = name_search_key(target.first_name, target.last_name, target.middle_name)
+
 class Club(Base):
     __tablename__ = "clubs"
     
@@ -121,8 +142,22 @@ class Promotion(Base):
     contact_email = Column(String(100))
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class ReferenceDataVersion(Base):
+    """Single row counting changes to clubs, promotions, trainers and managers.
+    
+    Bumped by statement triggers on PostgreSQL (migration 0010); the
+    reference-data snapshot is rebuilt when it moves (see services.reference_data).
+    """
+    __tablename__ = "reference_data_version"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
 class Contract(Base):
     __tablename__ = "contracts"
+    __table_args__ = (
+        Index("ix_contracts_fighter_id_end_date", "fighter_id", "end_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     contract_number = Column(String(100), unique=True, nullable=False)
@@ -130,7 +165,7 @@ class Contract(Base):
     promotion_id = Column(Integer, ForeignKey("promotions.id"), nullable=False)
     
     start_date = Column(Date, nullable=False)
-    end_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False, index=True)
     total_fights = Column(Integer, nullable=False)
     remaining_fights = Column(Integer, nullable=False)
     
@@ -153,6 +188,14 @@ class Contract(Base):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Calendar range queries, alone or combined with one equality filter
+        Index("ix_events_event_date", "event_date"),
+        Index("ix_events_city_event_date", "city", "event_date"),
+        Index("ix_events_country_event_date", "country", "event_date"),
+        Index("ix_events_event_type_event_date", "event_type", "event_date"),
+        Index("ix_events_organizer_id_event_date", "organizer_id", "event_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
@@ -179,6 +222,10 @@ class Event(Base):
 
 class EventApplication(Base):
     __tablename__ = "event_applications"
+    __table_args__ = (
+        Index("ix_event_applications_event_id_status", "event_id", "status"),
+        Index("ix_event_applications_fighter_id", "fighter_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
@@ -205,6 +252,11 @@ class EventApplication(Base):
 
 class Fight(Base):
     __tablename__ = "fights"
+    __table_args__ = (
+        Index("ix_fights_event_id_fight_number", "event_id", "fight_number"),
+        Index("ix_fights_fighter1_id", "fighter1_id"),
+        Index("ix_fights_fighter2_id", "fighter2_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
@@ -236,6 +288,70 @@ class Fight(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class FighterFight(Base):
+    """Fight participation, one row per fighter per fight (see services.fight_history)"""
+    __tablename__ = "fighter_fights"
+    __table_args__ = (
+        UniqueConstraint("fighter_id", "fight_id", name="uq_fighter_fights_fighter_fight"),
+        # Timeline order: newest event first, fight id as tie-breaker for the cursor
+        Index("ix_fighter_fights_timeline", "fighter_id", "event_date", "fight_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    fighter_id = Column(Integer, ForeignKey("fighters.id"), nullable=False)
+    fight_id = Column(Integer, ForeignKey("fights.id", ondelete="CASCADE"), nullable=False)
+    opponent_id = Column(Integer, ForeignKey("fighters.id"), nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    event_date = Column(DateTime, nullable=False)
+    
+    # Result from this fighter's point of view; empty until the result is recorded
+    outcome = Column(SQLEnum(FightResultEnum))
+    method = Column(SQLEnum(FightMethodEnum))
+    
+    fight = relationship("Fight", foreign_keys=[fight_id])
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class FighterCard(Base):
+    """Matchmaking card per fighter, a read model kept current by services.fighter_cards"""
+    __tablename__ = "fighter_cards"
+    __table_args__ = (
+        Index("ix_fighter_cards_matchmaking", "weight_class", "is_available", "birth_date"),
+    )
+    
+    fighter_id = Column(Integer, ForeignKey("fighters.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String(300), nullable=False)
+    weight_class = Column(String(50))
+    birth_date = Column(Date, nullable=False)
+    height = Column(Integer)
+    total_fights = Column(Integer, default=0)
+    recent_results = Column(JSON().with_variant(JSONB(), "postgresql"))
+    club = Column(String(200))
+    trainer = Column(String(200))
+    city = Column(String(100))
+    country = Column(String(100))
+    contract_expiry = Column(Date)
+    remaining_fights = Column(Integer, default=0)
+    application_status = Column(SQLEnum(ApplicationStatusEnum))
+    is_available = Column(Boolean, default=False)  # Available and not injured
+    
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+class FighterDuplicateCandidate(Base):
+    """Possible duplicate profile pair, stored once with fighter_id < duplicate_id (see services.fighter_duplicates)"""
+    __tablename__ = "fighter_duplicate_candidates"
+    __table_args__ = (
+        Index("ix_fighter_duplicate_candidates_duplicate_id", "duplicate_id"),
+        Index("ix_fighter_duplicate_candidates_score", "score"),
+    )
+    
+    fighter_id = Column(Integer, ForeignKey("fighters.id", ondelete="CASCADE"), primary_key=True)
+    duplicate_id = Column(Integer, ForeignKey("fighters.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False)
+    reasons = Column(JSON().with_variant(JSONB(), "postgresql"))  # e.g. ["name 0.92", "birth_date", "passport"]
+    
+    detected_at = Column(DateTime, default=datetime.utcnow)
+
 class Achievement(Base):
     __tablename__ = "achievements"
     
@@ -253,6 +369,10 @@ class Achievement(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # "assigned to me" lists, paged in id order
+        Index("ix_tasks_assigned_to_id_id", "assigned_to_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
@@ -263,14 +383,14 @@ class Task(Base):
     assigned_to_id = Column(Integer, ForeignKey("users.id"))
     created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
-    due_date = Column(DateTime)
+    due_date = Column(DateTime, index=True)
     completed_date = Column(DateTime)
     
     # Event relation for event-specific tasks
     event_id = Column(Integer, ForeignKey("events.id"))
     
-    # Checklist items (JSON)
-    checklist_items = Column(Text)  # JSON string of checklist items
+    # Checklist items: [{"text": ..., "done": ...}], decoded by the driver on load
+    checklist_items = Column(JSON().with_variant(JSONB(), "postgresql"))
     
     # Relationships
     assigned_to = relationship("User", foreign_keys=[assigned_to_id])
@@ -282,13 +402,15 @@ class Task(Base):
 
 class MediaContent(Base):
     __tablename__ = "media_content"
+    __table_args__ = (
+        Index("ix_media_content_event_id_id", "event_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     title = Column(String(200), nullable=False)
     file_url = Column(String(500), nullable=False)
     file_type = Column(String(50))  # image, video, document
-    tags = Column(Text)  # JSON array of tags
     description = Column(Text)
     
     uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -296,5 +418,40 @@ class MediaContent(Base):
     # Relationships
     event = relationship("Event", foreign_keys=[event_id])
     uploaded_by = relationship("User", foreign_keys=[uploaded_by_id])
+    tag_rows = relationship(
+        "MediaTag", cascade="all, delete-orphan", passive_deletes=True, lazy="selectin", order_by="MediaTag.tag"
+    )
     
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    @property
+    def tags(self):
+        return [row.tag for row in self.tag_rows]
+
+class MediaTag(Base):
+    """Inverted tag index: one row per (tag, media item), keyed tag-first for lookups"""
+    __tablename__ = "media_tags"
+    __table_args__ = (
+        Index("ix_media_tags_media_id", "media_id"),
+    )
+    
+    tag = Column(String(50), primary_key=True)
+    media_id = Column(Integer, ForeignKey("media_content.id", ondelete="CASCADE"), primary_key=True)
+
+class ReminderDelivery(Base):
+    """One row per reminder sent; the unique key makes delivery idempotent"""
+    __tablename__ = "reminder_deliveries"
+    __table_args__ = (
+        UniqueConstraint("kind", "entity_id", "deadline", name="uq_reminder_deliveries_kind_entity_deadline"),
+        # Claims awaiting delivery, for the abandoned-claim sweep
+        Index("ix_reminder_deliveries_undelivered", "created_at", postgresql_where=text("delivered_at IS NULL")),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(30), nullable=False)  # task_due, contract_expiry
+    entity_id = Column(Integer, nullable=False)
+    deadline = Column(DateTime, nullable=False)
+    recipient_user_id = Column(Integer, ForeignKey("users.id"))
+    delivered_at = Column(DateTime)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,21 @@
+from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field
+
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = Field(None, max_length=100)  # Echoed back to match responses
+    method: str = Field("GET", pattern=r'^(GET|POST|PUT|PATCH|DELETE)$')
+    path: str = Field(..., min_length=1, max_length=2000)  # Relative to /api/v1, e.g. "/users/me"
+    query: Optional[Dict[str, Any]] = None
+    body: Optional[Any] = None
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
@@ -1,7 +1,8 @@
 from datetime import datetime, date
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 from .enums import ContractStatusEnum
+from .fighter import FighterSummary, PromotionSummary
 
 class ContractBase(BaseModel):
     contract_number: str = Field(..., min_length=1, max_length=100)
@@ -31,6 +32,10 @@ class ContractResponse(ContractBase):
     class Config:
         orm_mode = True
 
+class ContractExpandedResponse(ContractResponse):
+    fighter: Optional[FighterSummary] = None
+    promotion: Optional[PromotionSummary] = None
+
 class ContractExtensionRequest(BaseModel):
     contract_id: int
     new_end_date: date
@@ -2,6 +2,7 @@ from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from .enums import EventTypeEnum, ApplicationStatusEnum, FightResultEnum, FightMethodEnum
+from .fighter import FighterSummary
 
 # Event models
 class EventBase(BaseModel):
@@ -30,6 +31,21 @@ class EventResponse(EventBase):
     class Config:
         orm_mode = True
 
+class EventSummary(BaseModel):
+    id: int
+    name: str
+    event_type: EventTypeEnum
+    event_date: datetime
+    city: Optional[str] = None
+    country: Optional[str] = None
+    
+    class Config:
+        orm_mode = True
+
+class CalendarBucket(BaseModel):
+    start: date  # First day of the bucket (Monday for weeks)
+    count: int
+
 # Event Application models
 class EventApplicationBase(BaseModel):
     desired_weight_class: Optional[str] = Field(None, max_length=50)
@@ -54,6 +70,24 @@ class EventApplicationResponse(EventApplicationBase):
     class Config:
         orm_mode = True
 
+class EventApplicationExpandedResponse(EventApplicationResponse):
+    event: Optional[EventSummary] = None
+    fighter: Optional[FighterSummary] = None
+
+class ApplicationTransitionRequest(BaseModel):
+    application_ids: List[int] = Field(..., min_items=1, max_items=5000)
+    status: ApplicationStatusEnum
+
+class ApplicationTransitionOutcome(BaseModel):
+    id: int
+    outcome: str  # updated, unchanged, not_found, invalid_transition
+    previous_status: Optional[ApplicationStatusEnum] = None
+    status: Optional[ApplicationStatusEnum] = None
+
+class ApplicationTransitionResponse(BaseModel):
+    updated: int
+    results: List[ApplicationTransitionOutcome]
+
 # Fight models
 class FightBase(BaseModel):
     fight_number: Optional[int] = Field(None, ge=1)
@@ -71,7 +105,7 @@ class FightResult(BaseModel):
     result: Optional[FightResultEnum] = None
     method: Optional[FightMethodEnum] = None
     round_ended: Optional[int] = Field(None, ge=1)
-    time_ended: Optional[str] = Field(None, regex=r'^\d{1,2}:\d{2}$')
+    time_ended: Optional[str] = Field(None, pattern=r'^\d{1,2}:\d{2}$')
     video_url: Optional[str] = None
     highlight_url: Optional[str] = None
 
@@ -85,6 +119,12 @@ class FightResponse(FightBase, FightResult):
     class Config:
         orm_mode = True
 
+class FightExpandedResponse(FightResponse):
+    event: Optional[EventSummary] = None
+    fighter1: Optional[FighterSummary] = None
+    fighter2: Optional[FighterSummary] = None
+    winner: Optional[FighterSummary] = None
+
 class CreateFightPair(BaseModel):
     fighter1_id: int
     fighter2_id: int
@@ -93,6 +133,9 @@ class CreateFightPair(BaseModel):
     round_duration: int = 5
     fight_number: Optional[int] = None
 
+class FightCardCreate(BaseModel):
+    fights: List[CreateFightPair] = Field(..., min_items=1, max_items=50)
+
 class EventParticipationInvite(BaseModel):
     fighter_id: int
     event_id: int
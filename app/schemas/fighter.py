@@ -3,7 +3,7 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, validator
 from .enums import (
     GenderEnum, VerificationStatusEnum, ParticipationStatusEnum,
-    ApplicationStatusEnum, UserRoleEnum
+    ApplicationStatusEnum, UserRoleEnum, FightResultEnum, FightMethodEnum
 )
 
 # Fighter models
@@ -30,7 +30,7 @@ class FighterCreate(FighterBase):
     promotion_id: Optional[int] = None
 
 class FighterRegistrationByThirdParty(BaseModel):
-    phone_number: str = Field(..., regex=r'^\+?[1-9]\d{1,14}$')
+    phone_number: str = Field(..., pattern=r'^\+?[1-9]\d{1,14}$')
     first_name: str = Field(..., min_length=1, max_length=100)
     last_name: str = Field(..., min_length=1, max_length=100)
     middle_name: Optional[str] = Field(None, max_length=100)
@@ -70,6 +70,60 @@ class FighterResponse(FighterBase):
     class Config:
         orm_mode = True
 
+# Related-object summaries returned through ?include=
+class ClubSummary(BaseModel):
+    id: int
+    name: str
+    city: Optional[str] = None
+    country: Optional[str] = None
+    
+    class Config:
+        orm_mode = True
+
+class TrainerSummary(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    club_id: Optional[int] = None
+    
+    class Config:
+        orm_mode = True
+
+class ManagerSummary(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    
+    class Config:
+        orm_mode = True
+
+class PromotionSummary(BaseModel):
+    id: int
+    name: str
+    website: Optional[str] = None
+    
+    class Config:
+        orm_mode = True
+
+class FighterSummary(BaseModel):
+    id: int
+    fighter_id: str
+    first_name: str
+    last_name: str
+    weight_class: Optional[str] = None
+    wins: Optional[int] = None
+    losses: Optional[int] = None
+    draws: Optional[int] = None
+    
+    class Config:
+        orm_mode = True
+
+class FighterExpandedResponse(FighterResponse):
+    club: Optional[ClubSummary] = None
+    trainer: Optional[TrainerSummary] = None
+    manager: Optional[ManagerSummary] = None
+    promotion: Optional[PromotionSummary] = None
+
 class FighterProfile(FighterResponse):
     """Extended fighter profile with related data"""
     club: Optional[Dict[str, Any]] = None
@@ -80,11 +134,49 @@ class FighterProfile(FighterResponse):
     recent_fights: List[Dict[str, Any]] = []
     achievements: List[Dict[str, Any]] = []
 
+# Fight history models
+class FighterFightResponse(BaseModel):
+    fight_id: int
+    event_id: int
+    event_date: datetime
+    opponent_id: int
+    outcome: Optional[FightResultEnum] = None
+    method: Optional[FightMethodEnum] = None
+
+    class Config:
+        orm_mode = True
+
+class FighterFightPage(BaseModel):
+    items: List[FighterFightResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
+
+# Name search models
+class FighterSearchResult(BaseModel):
+    id: int
+    fighter_id: Optional[str] = None
+    first_name: str
+    last_name: str
+    middle_name: Optional[str] = None
+    birth_date: date
+    weight_class: Optional[str] = None
+    score: float  # 0..1 trigram similarity to the query
+
+# Duplicate detection models
+class FighterDuplicateCandidateResponse(BaseModel):
+    fighter_id: int
+    duplicate_id: int
+    score: float
+    reasons: List[str] = []
+    detected_at: datetime
+
+    class Config:
+        orm_mode = True
+
 # Matchmaking models
 class FighterCardForMatchmaking(BaseModel):
     id: int
     name: str
-    weight_class: str
+    weight_class: Optional[str] = None
     age: int
     height: Optional[int] = None
     reach: Optional[int] = None
@@ -96,7 +188,7 @@ class FighterCardForMatchmaking(BaseModel):
     country: Optional[str] = None
     contract_expiry: Optional[date] = None
     remaining_fights: int
-    application_status: ApplicationStatusEnum
+    application_status: Optional[ApplicationStatusEnum] = None  # Latest application, if any
 
 class MatchSuggestion(BaseModel):
     opponent_id: int
@@ -109,4 +201,5 @@ class RegistrationResponse(BaseModel):
     success: bool
     message: str
     fighter_id: Optional[int] = None
-    verification_required: bool = False
\ No newline at end of file
+    verification_required: bool = False
+    possible_duplicate_ids: List[int] = []  # Existing profiles that look like the same person
\ No newline at end of file
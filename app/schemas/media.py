@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Optional, List
+from pydantic import BaseModel, Field, validator
+
+MAX_TAG_LENGTH = 50
+
+def normalize_tags(tags) -> List[str]:
+    """Lower-cased, stripped, de-duplicated tags in a stable order"""
+    # Truncate before de-duplicating: tags that differ only past the limit are the same tag
+    normalized = (" ".join(str(tag).split()).lower()[:MAX_TAG_LENGTH].rstrip() for tag in tags or [])
+    return list(dict.fromkeys(tag for tag in normalized if tag))
+
+# Media models
+class MediaContentCreate(BaseModel):
+    event_id: int
+    title: str = Field(..., min_length=1, max_length=200)
+    file_url: str = Field(..., min_length=1, max_length=500)
+    file_type: Optional[str] = Field(None, max_length=50)
+    tags: List[str] = Field(default_factory=list, max_items=50)
+    description: Optional[str] = None
+
+    @validator('tags')
+    def normalize_tag_list(cls, v):
+        return normalize_tags(v)
+
+class MediaContentResponse(BaseModel):
+    id: int
+    event_id: int
+    title: str
+    file_url: str
+    file_type: Optional[str] = None
+    tags: List[str] = []
+    description: Optional[str] = None
+    uploaded_by_id: int
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class MediaPage(BaseModel):
+    items: List[MediaContentResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
@@ -1,27 +1,51 @@
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 from .enums import TaskStatusEnum
 
+class ChecklistItem(BaseModel):
+    text: str = Field(..., min_length=1, max_length=500)
+    done: bool = False
+
+def normalize_checklist(items):
+    # Plain strings are still accepted for backwards compatibility
+    if not isinstance(items, list):
+        return items
+    return [{"text": item} if isinstance(item, str) else item for item in items]
+
 class TaskBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = None
-    priority: Optional[str] = Field("medium", regex=r'^(low|medium|high)$')
+    priority: Optional[str] = Field("medium", pattern=r'^(low|medium|high)$')
     due_date: Optional[datetime] = None
 
 class TaskCreate(TaskBase):
     assigned_to_id: Optional[int] = None
     event_id: Optional[int] = None
-    checklist_items: Optional[List[str]] = None
+    checklist_items: Optional[List[ChecklistItem]] = None
+
+    @validator('checklist_items', pre=True)
+    def normalize_checklist_items(cls, v):
+        return normalize_checklist(v)
 
 class TaskUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = None
     status: Optional[TaskStatusEnum] = None
-    priority: Optional[str] = Field(None, regex=r'^(low|medium|high)$')
+    priority: Optional[str] = Field(None, pattern=r'^(low|medium|high)$')
     assigned_to_id: Optional[int] = None
     due_date: Optional[datetime] = None
-    checklist_items: Optional[List[str]] = None
+    checklist_items: Optional[List[ChecklistItem]] = None
+
+    @validator('checklist_items', pre=True)
+    def normalize_checklist_items(cls, v):
+        return normalize_checklist(v)
+
+class ChecklistItemPatch(BaseModel):
+    op: str = Field(..., pattern=r'^(add|toggle|set)$')
+    index: Optional[int] = Field(None, ge=0)  # Required for toggle/set
+    text: Optional[str] = Field(None, min_length=1, max_length=500)  # Required for add
+    done: Optional[bool] = None  # Required for set
 
 class TaskResponse(TaskBase):
     id: int
@@ -30,7 +54,7 @@ class TaskResponse(TaskBase):
     created_by_id: int
     event_id: Optional[int] = None
     completed_date: Optional[datetime] = None
-    checklist_items: Optional[List[str]] = None
+    checklist_items: Optional[List[ChecklistItem]] = None
     created_at: datetime
     
     class Config:
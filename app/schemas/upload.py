@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+# Resumable video upload models
+class VideoUploadCreate(BaseModel):
+    fight_id: int
+    filename: str = Field(..., min_length=1, max_length=255)
+    length: int = Field(..., gt=0)  # Total size in bytes
+    checksum: Optional[str] = Field(None, pattern=r'^[0-9a-fA-F]{64}$')  # sha256 of the whole file, hex
+
+class VideoUploadResponse(BaseModel):
+    id: str
+    fight_id: int
+    filename: str
+    length: int
+    offset: int
+    expires_at: datetime
+
+class VideoUploadComplete(BaseModel):
+    fight_id: int
+    video_url: str
@@ -20,11 +20,7 @@ class UserResponse(UserBase):
     is_active: bool
     created_at: Optional[str] = None
     
-    # This is the problem - you have both Config class AND model_config
     model_config = ConfigDict(from_attributes=True)
-    
-    class Config:  # ← This needs to be removed completely
-        orm_mode = True
 
 class Token(BaseModel):
     access_token: str
@@ -0,0 +1,81 @@
+import gc
+import importlib.util
+import os
+from typing import Any, Dict
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+HTTP = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+class CammaUvicornWorker(UvicornWorker):
+    """Uvicorn worker with an explicit event loop and HTTP parser instead of "auto" """
+
+    CONFIG_KWARGS = {"loop": LOOP, "http": HTTP, "lifespan": "on"}
+
+
+def _engines():
+    from .core.database import engine, replica_router
+
+    return [engine] + list(replica_router.engines)
+
+
+def when_ready(server) -> None:
+    # The app is preloaded in the master; move everything it allocated into the
+    # permanent GC generation so collections in the workers don't touch (and
+    # so copy) the shared pages
+    gc.freeze()
+    server.log.info(f"Preloaded app, event loop {LOOP}, HTTP parser {HTTP}")
+
+
+def post_fork(server, worker) -> None:
+    # Connections opened in the master must not be shared with the children;
+    # close=False leaves the master's sockets alone and just forgets them here
+    for engine in _engines():
+        engine.dispose(close=False)
+
+
+def post_worker_init(worker) -> None:
+    """Open pool_size connections per engine before the worker accepts requests"""
+    for engine in _engines():
+        connections = []
+        try:
+            for _ in range(engine.pool.size()):
+                connections.append(engine.connect())
+        except Exception as e:
+            worker.log.warning(f"Pool warmup for {engine.url.render_as_string(hide_password=True)} stopped: {e}")
+        finally:
+            for connection in connections:
+                connection.close()
+
+
+def child_exit(server, worker) -> None:
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+class CammaServer(BaseApplication):
+    """Gunicorn application with its configuration passed in code rather than a config file"""
+
+    def __init__(self, app_uri: str, options: Dict[str, Any]):
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        hooks = {
+            "when_ready": when_ready,
+            "post_fork": post_fork,
+            "post_worker_init": post_worker_init,
+            "child_exit": child_exit,
+        }
+        for key, value in {**hooks, **self.options}.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from gunicorn.util import import_app
+
+        return import_app(self.app_uri)
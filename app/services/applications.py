@@ -0,0 +1,109 @@
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import Integer, any_, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from ..models.enums import ApplicationStatusEnum as Status
+from ..models.fighter import EventApplication, FighterFight
+from .event_counters import adjust_counters, application_deltas, lock_event_counters
+from .fighter_cards import refresh_fighter_cards
+
+# Review workflow: status -> statuses it may move to; every status is listed, terminal ones with no edges
+TRANSITIONS = {
+    Status.DRAFT: {Status.SUBMITTED, Status.WITHDRAWN, Status.OVERDUE, Status.BLOCKED},
+    Status.SUBMITTED: {
+        Status.UNDER_MATCHMAKER_REVIEW, Status.NEEDS_CORRECTION, Status.REJECTED, Status.WITHDRAWN, Status.BLOCKED,
+    },
+    Status.UNDER_MATCHMAKER_REVIEW: {
+        Status.APPROVED, Status.WAITING_LIST, Status.NEEDS_CORRECTION, Status.REJECTED, Status.WITHDRAWN,
+        Status.BLOCKED,
+    },
+    Status.NEEDS_CORRECTION: {Status.SUBMITTED, Status.WITHDRAWN, Status.OVERDUE, Status.BLOCKED},
+    Status.WAITING_LIST: {Status.APPROVED, Status.REJECTED, Status.WITHDRAWN, Status.BLOCKED},
+    Status.APPROVED: {Status.CONFIRMED, Status.WAITING_LIST, Status.REJECTED, Status.WITHDRAWN, Status.BLOCKED},
+    Status.CONFIRMED: {Status.COMPLETED, Status.WITHDRAWN, Status.BLOCKED},
+    Status.COMPLETED: set(),
+    Status.REJECTED: set(),
+    Status.WITHDRAWN: set(),
+    Status.OVERDUE: set(),
+    Status.BLOCKED: set(),
+}
+
+# Per-id outcomes of a bulk transition
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+NOT_FOUND = "not_found"
+INVALID_TRANSITION = "invalid_transition"
+
+
+def _id_in(db: Session, column, ids: List[int]):
+    # One array parameter on PostgreSQL instead of thousands of IN placeholders
+    if db.get_bind().dialect.name == "postgresql":
+        return column == any_(literal(ids, ARRAY(Integer)))
+    return column.in_(ids)
+
+
+def bulk_transition(db: Session, event_id: int, application_ids: List[int], target: Status) -> List[Dict]:
+    """Move many applications of one event to ``target`` with a single UPDATE.
+
+    Rows are locked FOR UPDATE while the transitions are validated, so the
+    statuses read are still current when the UPDATE runs. Counter deltas and
+    fighter cards are applied in the same transaction; the caller commits.
+    """
+    application_ids = list(dict.fromkeys(application_ids))
+    # Event row first, then applications: the same order as fight creation
+    lock_event_counters(db, event_id)
+    current = {
+        row.id: row
+        for row in db.query(EventApplication.id, EventApplication.fighter_id, EventApplication.status).filter(
+            EventApplication.event_id == event_id,
+            _id_in(db, EventApplication.id, application_ids),
+        ).order_by(EventApplication.id).with_for_update()
+    }
+
+    outcomes = {}
+    valid = []
+    for application_id in application_ids:
+        row = current.get(application_id)
+        if row is None:
+            outcomes[application_id] = (NOT_FOUND, None)
+        elif row.status == target:
+            outcomes[application_id] = (UNCHANGED, row.status)
+        elif target not in TRANSITIONS[row.status]:
+            outcomes[application_id] = (INVALID_TRANSITION, row.status)
+        else:
+            valid.append(application_id)
+
+    updated = set(valid)
+    if updated:
+        db.execute(
+            update(EventApplication).where(_id_in(db, EventApplication.id, valid))
+            .values(status=target, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        fighter_ids = {current[application_id].fighter_id for application_id in updated}
+        paired = set()
+        if target == Status.APPROVED or any(current[i].status == Status.APPROVED for i in updated):
+            paired = {
+                row.fighter_id for row in db.query(FighterFight.fighter_id).filter(
+                    FighterFight.event_id == event_id, FighterFight.fighter_id.in_(fighter_ids)
+                )
+            }
+        totals = {"pending_applications": 0, "approved_without_pair": 0}
+        for application_id in updated:
+            row = current[application_id]
+            for name, delta in application_deltas(row.status, target, row.fighter_id in paired).items():
+                totals[name] += delta
+        adjust_counters(db, event_id, **totals)
+        refresh_fighter_cards(db, fighter_ids)
+
+    results = []
+    for application_id in application_ids:
+        outcome, status = outcomes.get(application_id, (UPDATED, target))
+        results.append({
+            "id": application_id,
+            "outcome": outcome,
+            "previous_status": current[application_id].status if application_id in current else None,
+            "status": status,
+        })
+    return results
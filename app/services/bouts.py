@@ -0,0 +1,82 @@
+from typing import Dict, List, Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from ..models.fighter import Event, Fight, Fighter, FighterFight
+from .event_counters import fight_created
+
+
+def validate_bouts(db: Session, bouts: Sequence) -> List[Optional[str]]:
+    """Validate a set of bouts with one query for all fighters.
+
+    ``bouts`` are objects with fighter1_id, fighter2_id and weight_class. A
+    fighter may appear once per request. Returns the weight class of each
+    bout (taken from the fighters when the bout leaves it empty); raises 404
+    for unknown fighters, 400 listing every conflict, and 422 for bouts
+    without a weight class whose fighters declare different ones.
+    """
+    fighter_ids = {bout.fighter1_id for bout in bouts} | {bout.fighter2_id for bout in bouts}
+    fighters = {
+        row.id: row
+        for row in db.query(Fighter.id, Fighter.weight_class).filter(Fighter.id.in_(fighter_ids))
+    }
+    missing = sorted(fighter_ids - fighters.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Fighters not found: {missing}")
+
+    errors, unresolved = [], []
+    seen: Dict[int, int] = {}
+    weight_classes = []
+    for index, bout in enumerate(bouts):
+        pair = (bout.fighter1_id, bout.fighter2_id)
+        if pair[0] == pair[1]:
+            errors.append({"index": index, "error": "Fighter cannot fight themselves"})
+        for fighter_id in set(pair):
+            if fighter_id in seen:
+                errors.append({"index": index, "error": f"Fighter {fighter_id} is also in bout {seen[fighter_id]}"})
+            else:
+                seen[fighter_id] = index
+
+        declared = {fighters[fighter_id].weight_class for fighter_id in pair} - {None}
+        weight_class = bout.weight_class or (declared.pop() if len(declared) == 1 else None)
+        if weight_class is None and declared:
+            unresolved.append({
+                "index": index,
+                "error": f"Fighters have different weight classes {sorted(declared)}; set the bout's weight_class"
+            })
+        elif weight_class is not None and declared - {weight_class}:
+            errors.append({
+                "index": index,
+                "error": f"Weight class mismatch: bout {weight_class}, fighters {sorted(declared)}"
+            })
+        weight_classes.append(weight_class)
+
+    if errors:
+        raise HTTPException(status_code=400, detail=errors + unresolved)
+    if unresolved:
+        raise HTTPException(status_code=422, detail=unresolved)
+    return weight_classes
+
+
+def create_bouts(db: Session, event: Event, rows: List[dict]) -> List[Fight]:
+    """Insert validated fights, their participation rows and counter increments in bulk"""
+    fighter_ids = {row["fighter1_id"] for row in rows} | {row["fighter2_id"] for row in rows}
+    fight_created(db, event.id, fighter_ids, pairs=len(rows))
+    # One multi-row INSERT; a fighter is in at most one bout here, so pairs identify rows
+    inserted = db.scalars(
+        insert(Fight).values([dict(row, event_id=event.id) for row in rows]).returning(Fight)
+    ).all()
+    by_pair = {(fight.fighter1_id, fight.fighter2_id): fight for fight in inserted}
+    fights = [by_pair[(row["fighter1_id"], row["fighter2_id"])] for row in rows]
+    db.execute(insert(FighterFight), [
+        {
+            "fighter_id": fighter_id,
+            "opponent_id": opponent_id,
+            "fight_id": fight.id,
+            "event_id": event.id,
+            "event_date": event.event_date,
+        }
+        for fight in fights
+        for fighter_id, opponent_id in ((fight.fighter1_id, fight.fighter2_id), (fight.fighter2_id, fight.fighter1_id))
+    ])
+    return fights
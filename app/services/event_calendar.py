@@ -0,0 +1,126 @@
+import threading
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Dict, Hashable, List, Optional, Tuple
+from sqlalchemy import Date, cast, func
+from sqlalchemy.orm import Query, Session
+from ..core.config import settings
+from ..models.enums import EventTypeEnum
+from ..models.fighter import Event
+
+BUCKETS = ("day", "week")
+MAX_BUCKETS = 400
+MAX_CACHED_BUCKETS = 20000
+
+
+def apply_event_filters(
+    query: Query,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    event_type: Optional[EventTypeEnum] = None,
+    organizer_id: Optional[int] = None,
+) -> Query:
+    """Shared event filters; each equality filter has an (x, event_date) index for the range part"""
+    if date_from is not None:
+        query = query.filter(Event.event_date >= date_from)
+    if date_to is not None:
+        query = query.filter(Event.event_date < date_to)
+    if city is not None:
+        query = query.filter(Event.city == city)
+    if country is not None:
+        query = query.filter(Event.country == country)
+    if event_type is not None:
+        query = query.filter(Event.event_type == event_type)
+    if organizer_id is not None:
+        query = query.filter(Event.organizer_id == organizer_id)
+    return query
+
+
+def bucket_start(value: date, bucket: str) -> date:
+    """Day itself, or the Monday of its week"""
+    return value if bucket == "day" else value - timedelta(days=value.weekday())
+
+
+def _bucket_expression(dialect: str, bucket: str):
+    if dialect == "postgresql":
+        return cast(func.date_trunc(bucket, Event.event_date), Date)
+    # SQLite: Monday on or before the date
+    if bucket == "week":
+        return func.date(Event.event_date, "-6 days", "weekday 1")
+    return func.date(Event.event_date)
+
+
+class EventCalendar:
+    """Per-bucket event counts with an in-process cache.
+
+    Counts are cached per (bucket size, bucket start, filters). A request
+    only queries the span between its first and last uncached bucket, with
+    one grouped query. Creating an event drops the buckets containing its
+    date; other workers see the change once CALENDAR_CACHE_SECONDS expires.
+    """
+
+    def __init__(self, ttl: float = settings.CALENDAR_CACHE_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, date], Dict[Hashable, Tuple[float, int]]] = {}
+
+    def counts(
+        self, db: Session, bucket: str, first: date, last: date, filters: Dict[str, object]
+    ) -> List[Tuple[date, int]]:
+        """Counts for every bucket from the one containing ``first`` to the one containing ``last``"""
+        starts = []
+        current = bucket_start(first, bucket)
+        step = timedelta(days=1 if bucket == "day" else 7)
+        while current <= last:
+            starts.append(current)
+            current += step
+
+        filters_key = tuple(sorted(filters.items()))
+        now = time.monotonic()
+        found: Dict[date, int] = {}
+        with self._lock:
+            for start in starts:
+                entry = self._cache.get((bucket, start), {}).get(filters_key)
+                if entry is not None and entry[0] > now:
+                    found[start] = entry[1]
+
+        missing = [start for start in starts if start not in found]
+        if missing:
+            bucket_column = _bucket_expression(db.get_bind().dialect.name, bucket).label("bucket")
+            query = apply_event_filters(
+                db.query(bucket_column, func.count(Event.id)),
+                date_from=datetime.combine(missing[0], dt_time.min),
+                date_to=datetime.combine(missing[-1] + step, dt_time.min),
+                **filters,
+            ).group_by(bucket_column)
+            fetched = {start: 0 for start in starts if missing[0] <= start <= missing[-1]}
+            for value, count in query:
+                if isinstance(value, str):
+                    value = date.fromisoformat(value)
+                fetched[value] = count
+            with self._lock:
+                if len(self._cache) > MAX_CACHED_BUCKETS:
+                    self._prune(now)
+                for start, count in fetched.items():
+                    self._cache.setdefault((bucket, start), {})[filters_key] = (now + self.ttl, count)
+            found.update(fetched)
+
+        return [(start, found[start]) for start in starts]
+
+    def _prune(self, now: float) -> None:
+        for key in list(self._cache):
+            live = {f: entry for f, entry in self._cache[key].items() if entry[0] > now}
+            if live:
+                self._cache[key] = live
+            else:
+                del self._cache[key]
+
+    def invalidate(self, event_date: datetime) -> None:
+        with self._lock:
+            for bucket in BUCKETS:
+                self._cache.pop((bucket, bucket_start(event_date.date(), bucket)), None)
+
+
+event_calendar = EventCalendar()
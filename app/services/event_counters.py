@@ -0,0 +1,138 @@
+from typing import Callable, Dict, Iterable, List, Optional
+from sqlalchemy import and_, exists, func, or_, select, update
+from sqlalchemy.orm import Session
+from ..core.database import SessionLocal
+from ..models.enums import ApplicationStatusEnum
+from ..models.fighter import Event, EventApplication, Fight, FighterFight
+
+# Applications still waiting for a matchmaker decision
+PENDING_STATUSES = (ApplicationStatusEnum.SUBMITTED, ApplicationStatusEnum.UNDER_MATCHMAKER_REVIEW)
+
+COUNTERS = ("confirmed_pairs", "pending_applications", "approved_without_pair")
+
+
+def adjust_counters(db: Session, event_id: int, **deltas: int) -> None:
+    """Apply counter deltas as ``col = col + n`` in SQL, so concurrent writers never lose updates"""
+    values = {
+        getattr(Event, name): func.coalesce(getattr(Event, name), 0) + delta
+        for name, delta in deltas.items() if delta
+    }
+    if values:
+        db.execute(
+            update(Event).where(Event.id == event_id).values(values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def lock_event_counters(db: Session, event_id: int) -> None:
+    """Lock the event row until commit, before reading anything a counter delta depends on.
+
+    Every counter change ends in an UPDATE of this row anyway; taking its
+    lock first serializes the whole read-then-adjust step per event, so a
+    writer that waited sees the previous one's participation rows and
+    statuses (each READ COMMITTED statement takes a fresh snapshot). FOR NO
+    KEY UPDATE, the lock the UPDATE takes anyway, still lets inserts that
+    reference the event through a foreign key proceed.
+    """
+    db.query(Event.id).filter(Event.id == event_id).with_for_update(key_share=True).first()
+
+
+def _is_paired(event_id, fighter_id):
+    return exists().where(FighterFight.event_id == event_id, FighterFight.fighter_id == fighter_id)
+
+
+def application_deltas(
+    old_status: Optional[ApplicationStatusEnum], new_status: Optional[ApplicationStatusEnum], paired: bool
+) -> Dict[str, int]:
+    """Counter changes for one application moving from old_status to new_status"""
+    deltas = {"pending_applications": 0, "approved_without_pair": 0}
+    deltas["pending_applications"] += (new_status in PENDING_STATUSES) - (old_status in PENDING_STATUSES)
+    if not paired:
+        deltas["approved_without_pair"] += (
+            (new_status == ApplicationStatusEnum.APPROVED) - (old_status == ApplicationStatusEnum.APPROVED)
+        )
+    return deltas
+
+
+def application_changed(
+    db: Session, event_id: int, fighter_id: int,
+    old_status: Optional[ApplicationStatusEnum], new_status: Optional[ApplicationStatusEnum]
+) -> None:
+    """Keep counters in step with one application's status change (None = not existing)"""
+    paired = False
+    if old_status != new_status and ApplicationStatusEnum.APPROVED in (old_status, new_status):
+        lock_event_counters(db, event_id)
+        paired = db.query(_is_paired(event_id, fighter_id)).scalar()
+    adjust_counters(db, event_id, **application_deltas(old_status, new_status, paired))
+
+
+def fight_created(db: Session, event_id: int, fighter_ids: Iterable[int], pairs: int = 1) -> None:
+    """Count new pairs; call before the fights' participation rows are written.
+
+    Approved applications of fighters who had no fight in the event yet stop
+    counting as approved-without-pair.
+    """
+    lock_event_counters(db, event_id)
+    newly_paired = db.query(func.count(EventApplication.id)).filter(
+        EventApplication.event_id == event_id,
+        EventApplication.fighter_id.in_(list(fighter_ids)),
+        EventApplication.status == ApplicationStatusEnum.APPROVED,
+        ~_is_paired(event_id, EventApplication.fighter_id),
+    ).scalar()
+    adjust_counters(db, event_id, confirmed_pairs=pairs, approved_without_pair=-newly_paired)
+
+
+def reconcile_event_counters(db: Session, event_ids: List[int]) -> None:
+    """Recompute all counters for a batch of events in a single UPDATE ... FROM.
+
+    Only events whose stored counters are off are written, so correct rows
+    keep their updated_at (and the ETags derived from it).
+    """
+    if not event_ids:
+        return
+    fights = select(
+        Fight.event_id, func.count(Fight.id).label("confirmed_pairs")
+    ).where(Fight.event_id.in_(event_ids)).group_by(Fight.event_id).subquery()
+
+    applications = select(
+        EventApplication.event_id,
+        func.count(EventApplication.id).filter(
+            EventApplication.status.in_(PENDING_STATUSES)
+        ).label("pending_applications"),
+        func.count(EventApplication.id).filter(and_(
+            EventApplication.status == ApplicationStatusEnum.APPROVED,
+            ~_is_paired(EventApplication.event_id, EventApplication.fighter_id),
+        )).label("approved_without_pair"),
+    ).where(EventApplication.event_id.in_(event_ids)).group_by(EventApplication.event_id).subquery()
+
+    counts = select(
+        Event.id.label("event_id"),
+        func.coalesce(fights.c.confirmed_pairs, 0).label("confirmed_pairs"),
+        func.coalesce(applications.c.pending_applications, 0).label("pending_applications"),
+        func.coalesce(applications.c.approved_without_pair, 0).label("approved_without_pair"),
+    ).outerjoin(fights, fights.c.event_id == Event.id).outerjoin(
+        applications, applications.c.event_id == Event.id
+    ).where(Event.id.in_(event_ids)).subquery()
+
+    db.execute(
+        update(Event).where(
+            Event.id == counts.c.event_id,
+            or_(*(getattr(Event, name).is_distinct_from(getattr(counts.c, name)) for name in COUNTERS)),
+        ).values(
+            {getattr(Event, name): getattr(counts.c, name) for name in COUNTERS}
+        ).execution_options(synchronize_session=False)
+    )
+
+
+def reconcile_all(session_factory: Callable[[], Session] = SessionLocal, batch_size: int = 500) -> int:
+    """Reconcile every event in id batches, one transaction per batch"""
+    total, last_id = 0, 0
+    while True:
+        with session_factory() as db:
+            ids = [row.id for row in db.query(Event.id).filter(Event.id > last_id).order_by(Event.id).limit(batch_size)]
+            if not ids:
+                return total
+            reconcile_event_counters(db, ids)
+            db.commit()
+        total += len(ids)
+        last_id = ids[-1]
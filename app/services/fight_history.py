@@ -0,0 +1,78 @@
+import base64
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from ..models.enums import FightResultEnum
+from ..models.fighter import Fight, FighterFight
+
+# Results that apply to both fighters when there is no winner
+SHARED_RESULTS = (FightResultEnum.DRAW, FightResultEnum.NO_CONTEST)
+
+
+def _outcome_for(fight: Fight, fighter_id: int) -> Optional[FightResultEnum]:
+    if fight.winner_id is not None:
+        return FightResultEnum.WIN if fight.winner_id == fighter_id else FightResultEnum.LOSS
+    if fight.result in SHARED_RESULTS:
+        return fight.result
+    return None
+
+
+def record_result(db: Session, fight: Fight) -> None:
+    """Copy the fight's result onto both participation rows"""
+    rows = db.query(FighterFight).filter(FighterFight.fight_id == fight.id).all()
+    for row in rows:
+        row.outcome = _outcome_for(fight, row.fighter_id)
+        row.method = fight.method
+
+
+def recent_results(db: Session, fighter_ids: Iterable[int], limit: int = 3) -> Dict[int, List[str]]:
+    """Last ``limit`` decided results per fighter, newest first, in one query"""
+    fighter_ids = list(fighter_ids)
+    if not fighter_ids:
+        return {}
+    position = func.row_number().over(
+        partition_by=FighterFight.fighter_id,
+        order_by=(FighterFight.event_date.desc(), FighterFight.fight_id.desc()),
+    ).label("position")
+    ranked = db.query(FighterFight.fighter_id, FighterFight.outcome, position).filter(
+        FighterFight.fighter_id.in_(fighter_ids),
+        FighterFight.outcome.isnot(None),
+    ).subquery()
+
+    results: Dict[int, List[str]] = {fighter_id: [] for fighter_id in fighter_ids}
+    for fighter_id, outcome, _ in db.query(ranked).filter(ranked.c.position <= limit).order_by(
+        ranked.c.fighter_id, ranked.c.position
+    ):
+        results[fighter_id].append(outcome.value)
+    return results
+
+
+def encode_cursor(row: FighterFight) -> str:
+    raw = f"{row.event_date.isoformat()}|{row.fight_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        event_date, fight_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(event_date), int(fight_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def fight_timeline(
+    db: Session, fighter_id: int, cursor: Optional[str] = None, limit: int = 20
+) -> Tuple[List[FighterFight], Optional[str]]:
+    """One page of a fighter's fights, newest first, keyset-paginated on (event_date, fight_id)"""
+    query = db.query(FighterFight).filter(FighterFight.fighter_id == fighter_id)
+    if cursor:
+        event_date, fight_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            FighterFight.event_date < event_date,
+            and_(FighterFight.event_date == event_date, FighterFight.fight_id < fight_id),
+        ))
+    rows = query.order_by(FighterFight.event_date.desc(), FighterFight.fight_id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
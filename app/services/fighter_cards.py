@@ -0,0 +1,172 @@
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ..core.database import SessionLocal
+from ..models.enums import ContractStatusEnum
+from ..models.fighter import Club, Contract, EventApplication, Fighter, FighterCard, Trainer
+from ..schemas.fighter import FighterCardForMatchmaking
+from .fight_history import recent_results
+
+
+def _age(birth_date: date, today: date) -> int:
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+
+
+def build_cards(db: Session, fighter_ids: List[int], today: date) -> List[Dict[str, Any]]:
+    """Compute card rows for the given fighters with one query per source table"""
+    fighters = db.query(
+        Fighter.id, Fighter.first_name, Fighter.last_name, Fighter.weight_class, Fighter.birth_date,
+        Fighter.height, Fighter.wins, Fighter.losses, Fighter.draws, Fighter.is_available, Fighter.is_injured,
+        Club.name, Club.city, Club.country, Trainer.first_name, Trainer.last_name,
+    ).outerjoin(Club, Club.id == Fighter.club_id).outerjoin(
+        Trainer, Trainer.id == Fighter.trainer_id
+    ).filter(Fighter.id.in_(fighter_ids)).all()
+
+    # Current contract: the verified one that runs longest
+    contracts = {}
+    for fighter_id, end_date, remaining in db.query(
+        Contract.fighter_id, Contract.end_date, Contract.remaining_fights
+    ).filter(
+        Contract.fighter_id.in_(fighter_ids),
+        Contract.status == ContractStatusEnum.VERIFIED,
+        Contract.end_date >= today,
+    ).order_by(Contract.fighter_id, Contract.end_date.desc()):
+        contracts.setdefault(fighter_id, (end_date, remaining))
+
+    latest = func.row_number().over(
+        partition_by=EventApplication.fighter_id,
+        order_by=(EventApplication.created_at.desc(), EventApplication.id.desc()),
+    ).label("position")
+    ranked = db.query(EventApplication.fighter_id, EventApplication.status, latest).filter(
+        EventApplication.fighter_id.in_(fighter_ids)
+    ).subquery()
+    statuses = {
+        fighter_id: status
+        for fighter_id, status, _ in db.query(ranked).filter(ranked.c.position == 1)
+    }
+
+    results = recent_results(db, fighter_ids)
+
+    cards = []
+    for (fighter_id, first_name, last_name, weight_class, birth_date, height, wins, losses, draws,
+         is_available, is_injured, club, city, country, trainer_first, trainer_last) in fighters:
+        contract_expiry, remaining_fights = contracts.get(fighter_id, (None, 0))
+        cards.append({
+            "fighter_id": fighter_id,
+            "name": f"{first_name} {last_name}",
+            "weight_class": weight_class,
+            "birth_date": birth_date,
+            "height": height,
+            "total_fights": (wins or 0) + (losses or 0) + (draws or 0),
+            "recent_results": results.get(fighter_id, []),
+            "club": club,
+            "trainer": f"{trainer_first} {trainer_last}" if trainer_first else None,
+            "city": city,
+            "country": country,
+            "contract_expiry": contract_expiry,
+            "remaining_fights": remaining_fights,
+            "application_status": statuses.get(fighter_id),
+            "is_available": bool(is_available) and not is_injured,
+            "refreshed_at": datetime.utcnow(),
+        })
+    return cards
+
+
+def refresh_fighter_cards(db: Session, fighter_ids: Iterable[int], today: Optional[date] = None) -> None:
+    """Upsert the cards of the given fighters in the caller's transaction.
+
+    Call from any write path that changes a fighter, their contracts,
+    applications or fight results, before committing.
+    """
+    fighter_ids = sorted({fighter_id for fighter_id in fighter_ids if fighter_id is not None})
+    if not fighter_ids:
+        return
+    db.flush()
+    cards = build_cards(db, fighter_ids, today or date.today())
+
+    missing = set(fighter_ids) - {card["fighter_id"] for card in cards}
+    if missing:
+        db.query(FighterCard).filter(FighterCard.fighter_id.in_(missing)).delete(synchronize_session=False)
+    if not cards:
+        return
+
+    stmt = insert(FighterCard).values(cards)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[FighterCard.fighter_id],
+        set_={column: stmt.excluded[column] for column in cards[0] if column != "fighter_id"},
+    ))
+
+
+def rebuild_fighter_cards(session_factory: Callable[[], Session] = SessionLocal, batch_size: int = 500) -> int:
+    """Refresh every card in fighter id batches, one transaction per batch.
+
+    Also run nightly so contract expiry follows the calendar.
+    """
+    total, last_id = 0, 0
+    while True:
+        with session_factory() as db:
+            ids = [row.id for row in db.query(Fighter.id).filter(Fighter.id > last_id).order_by(Fighter.id).limit(batch_size)]
+            if not ids:
+                db.query(FighterCard).filter(FighterCard.fighter_id > last_id).delete(synchronize_session=False)
+                db.commit()
+                return total
+            db.query(FighterCard).filter(
+                FighterCard.fighter_id > last_id, FighterCard.fighter_id <= ids[-1], FighterCard.fighter_id.notin_(ids)
+            ).delete(synchronize_session=False)
+            refresh_fighter_cards(db, ids)
+            db.commit()
+        total += len(ids)
+        last_id = ids[-1]
+
+
+def _years_ago(today: date, years: int) -> date:
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:  # 29 February
+        return today.replace(year=today.year - years, day=28)
+
+
+def query_matchmaking_cards(
+    db: Session,
+    weight_class: Optional[str] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    available: Optional[bool] = True,
+    skip: int = 0,
+    limit: int = 100,
+    today: Optional[date] = None,
+) -> List[FighterCardForMatchmaking]:
+    """Filter cards on (weight_class, is_available, birth_date); the age band becomes a birth_date range"""
+    today = today or date.today()
+    query = db.query(FighterCard)
+    if weight_class is not None:
+        query = query.filter(FighterCard.weight_class == weight_class)
+    if available is not None:
+        query = query.filter(FighterCard.is_available == available)
+    if min_age is not None:
+        query = query.filter(FighterCard.birth_date <= _years_ago(today, min_age))
+    if max_age is not None:
+        query = query.filter(FighterCard.birth_date > _years_ago(today, max_age + 1))
+    cards = query.order_by(FighterCard.birth_date, FighterCard.fighter_id).offset(skip).limit(limit).all()
+    return [to_matchmaking_card(card, today) for card in cards]
+
+
+def to_matchmaking_card(card: FighterCard, today: date) -> FighterCardForMatchmaking:
+    return FighterCardForMatchmaking(
+        id=card.fighter_id,
+        name=card.name,
+        weight_class=card.weight_class,
+        age=_age(card.birth_date, today),
+        height=card.height,
+        total_fights=card.total_fights or 0,
+        recent_results=card.recent_results or [],
+        club=card.club,
+        trainer=card.trainer,
+        city=card.city,
+        country=card.country,
+        contract_expiry=card.contract_expiry,
+        remaining_fights=card.remaining_fights or 0,
+        application_status=card.application_status,
+    )
@@ -0,0 +1,177 @@
+import re
+from datetime import datetime
+from itertools import combinations
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.fighter import Fighter, FighterDuplicateCandidate
+from ..utils.names import trigrams
+
+# Columns needed to score a profile; Fighter instances have the same attributes
+PROFILE_COLUMNS = (
+    Fighter.id, Fighter.name_search, Fighter.birth_date, Fighter.gender,
+    Fighter.passport_series, Fighter.passport_number,
+)
+
+NAME_WEIGHT = 0.6
+BIRTH_DATE_WEIGHT = 0.3
+GENDER_WEIGHT = 0.1
+PASSPORT_MATCH = 0.95
+NAME_PREFIX = 3
+
+Pair = Tuple[int, int, float, List[str]]
+
+
+def passport_key(series: Optional[str], number: Optional[str]) -> Optional[str]:
+    number = re.sub(r"[^0-9A-Za-z]", "", number or "").upper()
+    if not number:
+        return None
+    return re.sub(r"[^0-9A-Za-z]", "", series or "").upper() + number
+
+
+def blocking_keys(profile) -> Set[tuple]:
+    """Only profiles sharing a key are compared: same birth date and the same start of any
+    name part (catches swapped first/last names), or the same passport"""
+    keys = {("birth", profile.birth_date, token[:NAME_PREFIX]) for token in (profile.name_search or "").split()}
+    passport = passport_key(profile.passport_series, profile.passport_number)
+    if passport:
+        keys.add(("passport", passport))
+    return keys
+
+
+def score_pair(a, b) -> Tuple[float, List[str]]:
+    """0..1 likelihood that two profiles are the same person, with the evidence"""
+    a_grams, b_grams = trigrams(a.name_search or ""), trigrams(b.name_search or "")
+    union = a_grams | b_grams
+    name = len(a_grams & b_grams) / len(union) if union else 0.0
+    score = NAME_WEIGHT * name
+    reasons = [f"name {name:.2f}"]
+    if a.birth_date == b.birth_date:
+        score += BIRTH_DATE_WEIGHT
+        reasons.append("birth_date")
+    if a.gender == b.gender:
+        score += GENDER_WEIGHT
+    passport = passport_key(a.passport_series, a.passport_number)
+    if passport and passport == passport_key(b.passport_series, b.passport_number):
+        score = max(score, PASSPORT_MATCH + (1 - PASSPORT_MATCH) * name)
+        reasons.append("passport")
+    return round(score, 4), reasons
+
+
+def _pair(a, b, threshold: float) -> Optional[Pair]:
+    score, reasons = score_pair(a, b)
+    if score < threshold:
+        return None
+    low, high = sorted((a.id, b.id))
+    return low, high, score, reasons
+
+
+def find_duplicates(db: Session, fighter: Fighter, threshold: Optional[float] = None, limit: int = 5) -> List[Pair]:
+    """Likely duplicates of one (flushed) fighter, best first.
+
+    One indexed query on birth_date / passport_number, then blocking and
+    scoring in Python over a few dozen rows at most.
+    """
+    threshold = settings.DUPLICATE_SCORE_THRESHOLD if threshold is None else threshold
+    conditions = [Fighter.birth_date == fighter.birth_date]
+    if fighter.passport_number:
+        conditions.append(Fighter.passport_number == fighter.passport_number)
+    keys = blocking_keys(fighter)
+    pairs = []
+    for candidate in db.query(*PROFILE_COLUMNS).filter(or_(*conditions), Fighter.id != fighter.id):
+        if keys & blocking_keys(candidate):
+            pair = _pair(fighter, candidate, threshold)
+            if pair:
+                pairs.append(pair)
+    pairs.sort(key=lambda pair: -pair[2])
+    return pairs[:limit]
+
+
+def record_candidates(db: Session, pairs: Iterable[Pair], detected_at: Optional[datetime] = None) -> int:
+    """Upsert candidate pairs in the caller's transaction"""
+    rows = [
+        {"fighter_id": low, "duplicate_id": high, "score": score, "reasons": reasons,
+         "detected_at": detected_at or datetime.utcnow()}
+        for low, high, score, reasons in pairs
+    ]
+    if not rows:
+        return 0
+    stmt = insert(FighterDuplicateCandidate).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[FighterDuplicateCandidate.fighter_id, FighterDuplicateCandidate.duplicate_id],
+        set_={column: stmt.excluded[column] for column in ("score", "reasons", "detected_at")},
+    ))
+    return len(rows)
+
+
+def _pairs_in_block(profiles: List, threshold: float) -> Dict[Tuple[int, int], Pair]:
+    buckets: Dict[tuple, List] = {}
+    for profile in profiles:
+        for key in blocking_keys(profile):
+            buckets.setdefault(key, []).append(profile)
+    pairs = {}
+    for bucket in buckets.values():
+        for a, b in combinations(bucket, 2):
+            ids = tuple(sorted((a.id, b.id)))
+            if ids not in pairs:
+                pairs[ids] = _pair(a, b, threshold)
+    return {ids: pair for ids, pair in pairs.items() if pair}
+
+
+def scan_duplicates(
+    session_factory: Callable[[], Session] = SessionLocal,
+    threshold: Optional[float] = None,
+    batch_size: int = 5000,
+) -> int:
+    """Rescan the whole fighters table and refresh fighter_duplicate_candidates.
+
+    Fighters are streamed in birth_date order, so only one birth date's
+    profiles are held at a time; passport blocks come from a GROUP BY on
+    passport_number. Pairs are written in batches from a second session, and
+    pairs not confirmed by this scan are dropped at the end. Returns the
+    number of candidate pairs.
+    """
+    threshold = settings.DUPLICATE_SCORE_THRESHOLD if threshold is None else threshold
+    started = datetime.utcnow()
+    pending: Dict[Tuple[int, int], Pair] = {}
+
+    with session_factory() as reader, session_factory() as writer:
+        def flush(force: bool = False) -> None:
+            nonlocal pending
+            if pending and (force or len(pending) >= batch_size):
+                record_candidates(writer, pending.values(), started)
+                writer.commit()
+                pending = {}
+
+        block, block_date = [], None
+        for row in reader.query(*PROFILE_COLUMNS).order_by(Fighter.birth_date, Fighter.id).yield_per(batch_size):
+            if row.birth_date != block_date:
+                pending.update(_pairs_in_block(block, threshold))
+                flush()
+                block, block_date = [], row.birth_date
+            block.append(row)
+        pending.update(_pairs_in_block(block, threshold))
+
+        shared = reader.query(Fighter.passport_number).filter(
+            Fighter.passport_number.isnot(None)
+        ).group_by(Fighter.passport_number).having(func.count() > 1).subquery()
+        block, block_number = [], None
+        for row in reader.query(*PROFILE_COLUMNS).filter(
+            Fighter.passport_number.in_(shared.select())
+        ).order_by(Fighter.passport_number, Fighter.id).yield_per(batch_size):
+            if row.passport_number != block_number:
+                pending.update(_pairs_in_block(block, threshold))
+                flush()
+                block, block_number = [], row.passport_number
+            block.append(row)
+        pending.update(_pairs_in_block(block, threshold))
+        flush(force=True)
+
+        writer.query(FighterDuplicateCandidate).filter(
+            FighterDuplicateCandidate.detected_at < started
+        ).delete(synchronize_session=False)
+        writer.commit()
+        return writer.query(func.count()).select_from(FighterDuplicateCandidate).scalar()
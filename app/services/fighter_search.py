@@ -0,0 +1,111 @@
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import bindparam, func, literal, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models.fighter import Fighter
+from ..utils.names import name_search_key, normalize_name, trigrams
+
+
+def search_fighters(
+    db: Session, query: str, limit: int = 20, threshold: Optional[float] = None
+) -> List[Tuple[Fighter, float]]:
+    """Fighters whose names resemble ``query``, best match first, with a 0..1 score.
+
+    Both sides go through the same normalization (transliteration, variant
+    folding), so "Хабиб", "Khabib" and "Xabib" find each other. On PostgreSQL
+    the match is pg_trgm word similarity over the GIN-indexed name_search
+    column; elsewhere an in-process trigram index stands in.
+    """
+    key = normalize_name(query)
+    if not key:
+        return []
+    threshold = settings.FIGHTER_SEARCH_THRESHOLD if threshold is None else threshold
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Threshold of the indexable <% operator, for this transaction only
+        db.execute(select(func.set_config("pg_trgm.word_similarity_threshold", str(threshold), True)))
+        score = func.word_similarity(key, Fighter.name_search).label("score")
+        return [
+            (fighter, float(value))
+            for fighter, value in db.query(Fighter, score)
+            .filter(literal(key).op("<%")(Fighter.name_search))
+            .order_by(score.desc(), Fighter.id)
+            .limit(limit)
+        ]
+
+    matches = ngram_index.search(db, key, threshold, limit)
+    fighters = {f.id: f for f in db.query(Fighter).filter(Fighter.id.in_([fid for fid, _ in matches]))}
+    return [(fighters[fid], score) for fid, score in matches if fid in fighters]
+
+
+class NGramIndex:
+    """Pure-Python trigram index over fighters.name_search for databases without pg_trgm.
+
+    Rebuilt whenever the fighters table changes (row count, last id or last
+    update differ), which is fine for SQLite test and development databases.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._postings: Dict[str, Set[int]] = {}
+
+    def _refresh(self, db: Session) -> None:
+        version = tuple(db.query(func.count(Fighter.id), func.max(Fighter.id), func.max(Fighter.updated_at)).one())
+        if version == self._version:
+            return
+        postings = defaultdict(set)
+        for fighter_id, name_search in db.query(Fighter.id, Fighter.name_search):
+            for gram in trigrams(name_search or ""):
+                postings[gram].add(fighter_id)
+        self._postings, self._version = dict(postings), version
+
+    def search(self, db: Session, key: str, threshold: float, limit: int) -> List[Tuple[int, float]]:
+        """(fighter id, share of the query's trigrams found in the name) pairs, best first"""
+        grams = trigrams(key)
+        with self._lock:
+            self._refresh(db)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._postings.get(gram, ()))
+        scored = [(fighter_id, count / len(grams)) for fighter_id, count in shared.items()]
+        scored = [match for match in scored if match[1] >= threshold]
+        scored.sort(key=lambda match: (-match[1], match[0]))
+        return scored[:limit]
+
+
+ngram_index = NGramIndex()
+
+
+def backfill_name_search(conn: Connection, batch_size: int = 2000, commit: bool = False) -> int:
+    """Recompute fighters.name_search for every row in id order; returns rows updated.
+
+    Run after changing the normalization rules. With ``commit`` every batch
+    is committed on its own.
+    """
+    fighters = Fighter.__table__
+    statement = update(fighters).where(fighters.c.id == bindparam("row_id")).values(
+        name_search=bindparam("key")
+    )
+    last_id = 0
+    total = 0
+    while True:
+        rows = conn.execute(
+            select(fighters.c.id, fighters.c.first_name, fighters.c.last_name, fighters.c.middle_name)
+            .where(fighters.c.id > last_id)
+            .order_by(fighters.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return total
+        conn.execute(statement, [
+            {"row_id": row.id, "key": name_search_key(row.first_name, row.last_name, row.middle_name)}
+            for row in rows
+        ])
+        if commit:
+            conn.commit()
+        last_id = rows[-1].id
+        total += len(rows)
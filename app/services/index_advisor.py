@@ -0,0 +1,96 @@
+import json
+from typing import Any, Dict, List
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+from ..core.database import Base
+
+
+def load_query_shapes(path: str, limit: int = 0) -> List[Dict[str, Any]]:
+    """Read captured {"statement", "parameters"} lines, one entry per distinct statement"""
+    shapes, seen = [], set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            shape = json.loads(line)
+            if shape["statement"] in seen:
+                continue
+            seen.add(shape["statement"])
+            shapes.append(shape)
+            if limit and len(shapes) >= limit:
+                break
+    return shapes
+
+
+def explain(conn: Connection, statement: str, parameters: Any) -> Dict[str, Any]:
+    result = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters or {})
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def summarize_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Total cost plus every scan node (type, relation, index) in the plan tree"""
+    scans = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Scan" in node["Node Type"]:
+            scans.append({
+                "node": node["Node Type"],
+                "relation": node.get("Relation Name"),
+                "index": node.get("Index Name"),
+            })
+        stack.extend(node.get("Plans", []))
+    return {"total_cost": plan["Total Cost"], "scans": scans}
+
+
+def missing_indexes(conn: Connection) -> List[Any]:
+    """Indexes declared on the models that the connected database does not have yet"""
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing.extend(index for index in table.indexes if index.name not in existing)
+    return missing
+
+
+def advise(engine: Engine, shapes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """EXPLAIN every captured query shape before and after the model indexes exist.
+
+    Missing indexes are created inside a transaction that is rolled back, so
+    the database is left unchanged. CREATE INDEX blocks writes to the table
+    while it runs; point this at a staging copy rather than the primary.
+    """
+    report = {"indexes": [], "queries": []}
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            before = []
+            for shape in shapes:
+                try:
+                    with conn.begin_nested():
+                        before.append(summarize_plan(explain(conn, shape["statement"], shape["parameters"])))
+                except Exception as e:
+                    before.append({"error": str(e).splitlines()[0]})
+
+            indexes = missing_indexes(conn)
+            for index in indexes:
+                index.create(conn)
+                report["indexes"].append(index.name)
+            conn.exec_driver_sql("ANALYZE")
+
+            for shape, plan_before in zip(shapes, before):
+                entry = {"statement": shape["statement"], "before": plan_before}
+                if "error" not in plan_before:
+                    with conn.begin_nested():
+                        entry["after"] = summarize_plan(explain(conn, shape["statement"], shape["parameters"]))
+                report["queries"].append(entry)
+        finally:
+            transaction.rollback()
+    return report
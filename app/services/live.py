@@ -0,0 +1,32 @@
+import json
+from typing import Any, Dict
+from fastapi import BackgroundTasks
+from sqlalchemy.orm import Session
+from ..core.broker import get_broker
+from ..models.fighter import Event
+from .event_counters import COUNTERS
+
+# Message types pushed to /events/{id}/live subscribers
+FIGHT_RESULT = "fight_result"
+CARD_CHANGED = "card_changed"
+COUNTERS_CHANGED = "counters"
+
+
+def event_channel(event_id: int) -> str:
+    return f"event:{event_id}"
+
+
+def publish_event_update(background_tasks: BackgroundTasks, event_id: int, kind: str, data: Any) -> None:
+    """Queue a live update; it is published after the response, i.e. after the commit"""
+    message = json.dumps({"type": kind, "event_id": event_id, "data": data}, default=str, ensure_ascii=False)
+    background_tasks.add_task(get_broker().publish, event_channel(event_id), message)
+
+
+def counters_snapshot(db: Session, event_id: int) -> Dict[str, int]:
+    row = db.query(*(getattr(Event, name) for name in COUNTERS)).filter(Event.id == event_id).first()
+    return dict(zip(COUNTERS, row)) if row is not None else {}
+
+
+def publish_counters(background_tasks: BackgroundTasks, db: Session, event_id: int) -> None:
+    """Publish the committed counter values of an event"""
+    publish_event_update(background_tasks, event_id, COUNTERS_CHANGED, counters_snapshot(db, event_id))
@@ -0,0 +1,63 @@
+import base64
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from ..models.fighter import MediaContent, MediaTag
+
+MATCH_ALL = "all"
+MATCH_ANY = "any"
+
+
+def set_tags(media: MediaContent, tags: List[str]) -> None:
+    """Replace the tag rows of a media item with already-normalized tags"""
+    media.tag_rows = [MediaTag(tag=tag) for tag in tags]
+
+
+def encode_cursor(media_id: int) -> str:
+    return base64.urlsafe_b64encode(str(media_id).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def search_media(
+    db: Session,
+    tags: List[str],
+    match: str = MATCH_ALL,
+    event_id: Optional[int] = None,
+    file_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> Tuple[List[MediaContent], Optional[str]]:
+    """One page of media, newest first, keyset-paginated on id.
+
+    Tags are resolved on media_tags, whose (tag, media_id) primary key makes
+    each tag a range scan already ordered by media_id. ``all`` keeps the ids
+    that carry every tag (GROUP BY ... HAVING count = n), ``any`` those that
+    carry at least one. The cursor bound is applied inside the tag subquery
+    so later pages never rescan earlier ids.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    query = db.query(MediaContent)
+    if tags:
+        matching = select(MediaTag.media_id).where(MediaTag.tag.in_(tags))
+        if after is not None:
+            matching = matching.where(MediaTag.media_id < after)
+        if match == MATCH_ALL and len(tags) > 1:
+            matching = matching.group_by(MediaTag.media_id).having(func.count() == len(tags))
+        query = query.filter(MediaContent.id.in_(matching))
+    if after is not None:
+        query = query.filter(MediaContent.id < after)
+    if event_id is not None:
+        query = query.filter(MediaContent.event_id == event_id)
+    if file_type is not None:
+        query = query.filter(MediaContent.file_type == file_type)
+
+    rows = query.order_by(MediaContent.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+    return rows[:limit], next_cursor
@@ -0,0 +1,248 @@
+import bisect
+import fcntl
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.fighter import Club, Manager, Promotion, ReferenceDataVersion, Trainer
+from ..schemas.fighter import ClubSummary, ManagerSummary, PromotionSummary, TrainerSummary
+from ..utils.names import normalize_name
+
+# kind -> (model, summary schema stored per record, name keys for prefix search)
+KINDS: Dict[str, Tuple[Any, Any, Callable[[Dict[str, Any]], List[str]]]] = {
+    "clubs": (Club, ClubSummary, lambda r: [r["name"]]),
+    "promotions": (Promotion, PromotionSummary, lambda r: [r["name"]]),
+    "trainers": (Trainer, TrainerSummary, lambda r: [f"{r['first_name']} {r['last_name']}", f"{r['last_name']} {r['first_name']}"]),
+    "managers": (Manager, ManagerSummary, lambda r: [f"{r['first_name']} {r['last_name']}", f"{r['last_name']} {r['first_name']}"]),
+}
+
+# File layout (native byte order, host-local): header, then one section per
+# kind in KINDS order. A section is its counts followed by u32 arrays and
+# byte blobs, each padded to 4 bytes:
+#   slots[max_id + 1]   record index + 1 by id (0 = no such id)
+#   record_offsets[n + 1], records blob   JSON summaries
+#   key_offsets[k + 1], keys blob         normalized names, sorted
+#   key_records[k]                        record index of each key
+MAGIC = b"CAMREF01"
+HEADER = struct.Struct("=8sQ")
+SECTION = struct.Struct("=IIIII")  # slots, records, record bytes, keys, key bytes
+
+
+def current_version(db: Session) -> int:
+    """Version the snapshot must match.
+
+    On PostgreSQL the trigger-maintained counter; elsewhere (SQLite in
+    development) a checksum of row counts and max ids, which misses in-place
+    edits.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return db.execute(select(ReferenceDataVersion.version)).scalar() or 0
+    fingerprint = [db.execute(select(func.count(), func.max(model.id))).one() for model, _, _ in KINDS.values()]
+    return zlib.crc32(repr(fingerprint).encode())
+
+
+def _pad(buf: bytearray) -> None:
+    buf.extend(b"\0" * (-len(buf) % 4))
+
+
+def _section(db: Session, model, schema, names) -> bytes:
+    columns = [getattr(model, field) for field in schema.model_fields]
+    rows = [dict(row._mapping) for row in db.execute(select(*columns).order_by(model.id))]
+    slots = array("I", bytes(4 * (rows[-1]["id"] + 1 if rows else 0)))
+    record_offsets, records = array("I", [0]), bytearray()
+    keys = []
+    for index, row in enumerate(rows):
+        slots[row["id"]] = index + 1
+        records.extend(json.dumps(row, separators=(",", ":")).encode())
+        record_offsets.append(len(records))
+        keys.extend({(normalize_name(name).encode(), index) for name in names(row)})
+    keys.sort()
+    key_offsets, key_blob = array("I", [0]), bytearray()
+    for key, _ in keys:
+        key_blob.extend(key)
+        key_offsets.append(len(key_blob))
+
+    out = bytearray(SECTION.pack(len(slots), len(rows), len(records), len(keys), len(key_blob)))
+    for part in (slots.tobytes(), record_offsets.tobytes(), records, key_offsets.tobytes(), key_blob,
+                 array("I", [index for _, index in keys]).tobytes()):
+        out.extend(part)
+        _pad(out)
+    return bytes(out)
+
+
+def build_snapshot(db: Session, path: str, version: int) -> None:
+    """Write a snapshot of the current rows and atomically replace ``path`` with it.
+
+    Readers that already mapped the previous file keep using it until they
+    reopen; the old inode goes away once the last mapping is dropped.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=".reference_data.", delete=False) as f:
+        try:
+            f.write(HEADER.pack(MAGIC, version))
+            for model, schema, names in KINDS.values():
+                f.write(_section(db, model, schema, names))
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            os.unlink(f.name)
+            raise
+    os.chmod(f.name, 0o644)
+    os.replace(f.name, path)
+
+
+class Section:
+    """Read-only view of one kind's records inside the mapped file"""
+
+    def __init__(self, buf: memoryview, offset: int):
+        n_slots, n_records, record_bytes, n_keys, key_bytes = SECTION.unpack_from(buf, offset)
+        offset += SECTION.size
+
+        def take(length: int, fmt: Optional[str] = None) -> memoryview:
+            nonlocal offset
+            view = buf[offset:offset + length]
+            offset += length + (-length % 4)
+            return view.cast(fmt) if fmt else view
+
+        self._slots = take(4 * n_slots, "I")
+        self._record_offsets = take(4 * (n_records + 1), "I")
+        self._records = take(record_bytes)
+        self._key_offsets = take(4 * (n_keys + 1), "I")
+        self._keys = take(key_bytes)
+        self._key_records = take(4 * n_keys, "I")
+        self.end = offset
+        self.count = n_records
+
+    def _record(self, index: int) -> Dict[str, Any]:
+        return json.loads(bytes(self._records[self._record_offsets[index]:self._record_offsets[index + 1]]))
+
+    def _key(self, position: int) -> bytes:
+        return bytes(self._keys[self._key_offsets[position]:self._key_offsets[position + 1]])
+
+    def get(self, id: int) -> Optional[Dict[str, Any]]:
+        """Record by primary key, or None (one array read)"""
+        slot = self._slots[id] if 0 <= id < len(self._slots) else 0
+        return self._record(slot - 1) if slot else None
+
+    def search(self, prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Records with a name (for people: either name order) starting with ``prefix``, in name order"""
+        key = normalize_name(prefix).encode()
+        keys = _KeyView(self)
+        position = bisect.bisect_left(keys, key)
+        seen, results = set(), []
+        while position < len(keys) and len(results) < limit and keys[position].startswith(key):
+            index = self._key_records[position]
+            if index not in seen:
+                seen.add(index)
+                results.append(self._record(index))
+            position += 1
+        return results
+
+
+class _KeyView:
+    """Sequence over a section's sorted keys, so bisect works without copying them out"""
+
+    def __init__(self, section: Section):
+        self._section = section
+
+    def __len__(self) -> int:
+        return len(self._section._key_records)
+
+    def __getitem__(self, position: int) -> bytes:
+        return self._section._key(position)
+
+
+class ReferenceSnapshot:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        magic, self.version = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a reference data snapshot")
+        self.sections: Dict[str, Section] = {}
+        offset = HEADER.size
+        for kind in KINDS:
+            self.sections[kind] = Section(buf, offset)
+            offset = self.sections[kind].end
+
+    def get(self, kind: str, id: int) -> Optional[Dict[str, Any]]:
+        return self.sections[kind].get(id)
+
+
+class ReferenceData:
+    """Per-process handle on the shared snapshot file.
+
+    Every worker maps the same file read-only, so the data sits once in the
+    page cache rather than once per process. At most every
+    REFERENCE_DATA_CHECK_SECONDS a request compares the mapped version with
+    the database; on a mismatch the process maps a newer file if another
+    worker already wrote one, or rebuilds it under a file lock. The version
+    is read and the snapshot built through ``session_factory`` (the
+    primary), never a replica, so a lagging replica cannot flip the
+    snapshot back to an older version.
+    """
+
+    def __init__(self, path: str, check_interval: float, session_factory: Callable[[], Session] = SessionLocal):
+        self.path = path
+        self.check_interval = check_interval
+        self.session_factory = session_factory
+        self._snapshot: Optional[ReferenceSnapshot] = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def _open(self) -> Optional[ReferenceSnapshot]:
+        try:
+            if self._snapshot is not None and os.stat(self.path).st_ino == self._snapshot.inode:
+                return self._snapshot
+            return ReferenceSnapshot(self.path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def refresh(self, db: Session) -> ReferenceSnapshot:
+        version = current_version(db)
+        snapshot = self._open()
+        if snapshot is None or snapshot.version != version:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(f"{self.path}.lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                # Another worker may have rebuilt it while we waited
+                snapshot = self._open()
+                if snapshot is None or snapshot.version != version:
+                    build_snapshot(db, self.path, version)
+                    snapshot = ReferenceSnapshot(self.path)
+        self._snapshot, self._checked_at = snapshot, time.monotonic()
+        return snapshot
+
+    def get(self) -> ReferenceSnapshot:
+        """The current snapshot, checking the version first if the last check is too old"""
+        if self._snapshot is None or time.monotonic() - self._checked_at >= self.check_interval:
+            with self._lock:
+                if self._snapshot is None or time.monotonic() - self._checked_at >= self.check_interval:
+                    with self.session_factory() as db:
+                        self.refresh(db)
+        return self._snapshot
+
+    def load(self) -> Optional[ReferenceSnapshot]:
+        """Map (building if needed) the snapshot at startup; a failure only delays it to the first request"""
+        try:
+            with self.session_factory() as db, self._lock:
+                return self.refresh(db)
+        except Exception as e:
+            print(f"Reference data not loaded: {e}")
+            return None
+
+
+reference_data = ReferenceData(settings.REFERENCE_DATA_PATH, settings.REFERENCE_DATA_CHECK_SECONDS)
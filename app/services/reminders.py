@@ -0,0 +1,344 @@
+import asyncio
+import heapq
+from datetime import datetime, timedelta, time
+from typing import Callable, List, NamedTuple, Optional, Set, Tuple
+from sqlalchemy import exc, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal, engine as primary_engine
+from ..models.enums import ContractStatusEnum, TaskStatusEnum
+from ..models.fighter import Contract, Fighter, ReminderDelivery, Task
+from ..models.user import User
+from .sms import send_sms
+
+TASK_DUE = "task_due"
+CONTRACT_EXPIRY = "contract_expiry"
+
+# pg_advisory_lock key held by the one process running reminders in-process
+RUNNER_LOCK_KEY = 0x52454D494E44
+
+
+class Reminder(NamedTuple):
+    fire_at: datetime
+    kind: str
+    entity_id: int
+    deadline: datetime
+    user_id: int
+    phone_number: str
+    message: str
+
+    @property
+    def key(self) -> Tuple[str, int, datetime]:
+        return self.kind, self.entity_id, self.deadline
+
+
+class ReminderEngine:
+    """Finds upcoming deadlines and sends reminders for them.
+
+    Each ``scan`` loads only deadlines whose reminder time falls in a window
+    that moves forward from the previous scan (an indexed range scan on
+    ``tasks.due_date`` / ``contracts.end_date``), so the tables are never
+    polled in full. Loaded reminders wait in a min-heap ordered by fire time
+    and are sent in batches once due. A unique row in ``reminder_deliveries``
+    is claimed before sending, so overlapping scans, several workers or a
+    restarted scheduler never send the same reminder twice. A claim that is
+    still undelivered after ``claim_lease`` (its sender died mid-batch) is
+    picked up again by the next scan and may be claimed anew.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        horizon: timedelta = timedelta(minutes=settings.REMINDER_HORIZON_MINUTES),
+        batch_size: int = settings.REMINDER_BATCH_SIZE,
+        task_lead: timedelta = timedelta(minutes=settings.TASK_REMINDER_LEAD_MINUTES),
+        contract_lead: timedelta = timedelta(days=settings.CONTRACT_REMINDER_LEAD_DAYS),
+        claim_lease: timedelta = timedelta(seconds=settings.REMINDER_CLAIM_LEASE_SECONDS),
+    ):
+        self.session_factory = session_factory
+        self.horizon = horizon
+        self.batch_size = batch_size
+        self.task_lead = task_lead
+        self.contract_lead = contract_lead
+        self.claim_lease = claim_lease
+        self._heap: List[Reminder] = []
+        self._queued: Set[Tuple[str, int, datetime]] = set()
+        self._scanned_until: Optional[datetime] = None
+
+    def scan(self, now: datetime) -> int:
+        """Load reminders firing in (last scan end, now + horizon], and abandoned claims, into the heap"""
+        # On the first scan look back one horizon to catch reminders missed while down
+        start = self._scanned_until or now - self.horizon
+        end = now + self.horizon
+        if end <= start:
+            return 0
+
+        with self.session_factory() as db:
+            found = self._task_reminders(
+                db, Task.due_date > start + self.task_lead, Task.due_date <= end + self.task_lead
+            ) + self._contract_reminders(
+                db,
+                Contract.end_date > (start + self.contract_lead).date(),
+                Contract.end_date <= (end + self.contract_lead).date(),
+            )
+            found += self._abandoned(db, now)
+
+        for reminder in found:
+            if reminder.key not in self._queued:
+                self._queued.add(reminder.key)
+                heapq.heappush(self._heap, reminder)
+        self._scanned_until = end
+        return len(found)
+
+    def _task_reminders(self, db: Session, *criteria) -> List[Reminder]:
+        rows = db.query(Task.id, Task.title, Task.due_date, User.id, User.phone_number).join(
+            User, User.id == Task.assigned_to_id
+        ).filter(*criteria, Task.status != TaskStatusEnum.DONE).all()
+        return [
+            Reminder(
+                due_date - self.task_lead, TASK_DUE, task_id, due_date, user_id, phone,
+                f"Напоминание: задача «{title}» должна быть выполнена до {due_date:%d.%m.%Y %H:%M}"
+            )
+            for task_id, title, due_date, user_id, phone in rows
+        ]
+
+    def _contract_reminders(self, db: Session, *criteria) -> List[Reminder]:
+        # end_date is a date: its reminder fires at midnight minus the lead time
+        rows = db.query(Contract.id, Contract.contract_number, Contract.end_date, User.id, User.phone_number).join(
+            Fighter, Fighter.id == Contract.fighter_id
+        ).join(
+            User, User.id == Fighter.user_id
+        ).filter(*criteria, Contract.status == ContractStatusEnum.VERIFIED).all()
+        reminders = []
+        for contract_id, number, end_date, user_id, phone in rows:
+            deadline = datetime.combine(end_date, time.min)
+            reminders.append(Reminder(
+                deadline - self.contract_lead, CONTRACT_EXPIRY, contract_id, deadline, user_id, phone,
+                f"Напоминание: контракт {number} истекает {end_date:%d.%m.%Y}"
+            ))
+        return reminders
+
+    def _abandoned(self, db: Session, now: datetime) -> List[Reminder]:
+        """Reminders whose claim outlived its lease without a delivery, deadline still ahead"""
+        stale = {
+            tuple(row) for row in db.query(
+                ReminderDelivery.kind, ReminderDelivery.entity_id, ReminderDelivery.deadline
+            ).filter(
+                ReminderDelivery.delivered_at.is_(None),
+                ReminderDelivery.created_at < now - self.claim_lease,
+                ReminderDelivery.deadline > now,
+            )
+        }
+        if not stale:
+            return []
+        task_ids = [entity_id for kind, entity_id, _ in stale if kind == TASK_DUE]
+        contract_ids = [entity_id for kind, entity_id, _ in stale if kind == CONTRACT_EXPIRY]
+        found = []
+        if task_ids:
+            found += self._task_reminders(db, Task.id.in_(task_ids))
+        if contract_ids:
+            found += self._contract_reminders(db, Contract.id.in_(contract_ids))
+        return [reminder for reminder in found if reminder.key in stale]
+
+    def _pop_due(self, now: datetime) -> List[Reminder]:
+        batch = []
+        while self._heap and self._heap[0].fire_at <= now and len(batch) < self.batch_size:
+            reminder = heapq.heappop(self._heap)
+            self._queued.discard(reminder.key)
+            batch.append(reminder)
+        return batch
+
+    def claim_due(self, now: datetime) -> List[Reminder]:
+        """Pop the next batch of due reminders that are still valid and not yet delivered"""
+        while True:
+            batch = self._pop_due(now)
+            if not batch:
+                return []
+            with self.session_factory() as db:
+                batch = self._still_valid(db, batch)
+                if not batch:
+                    continue
+                stmt = insert(ReminderDelivery).values([
+                    {
+                        "kind": r.kind,
+                        "entity_id": r.entity_id,
+                        "deadline": r.deadline,
+                        "recipient_user_id": r.user_id,
+                        "created_at": now,
+                    }
+                    for r in batch
+                ])
+                # Existing claims are only taken over once their lease ran out undelivered
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["kind", "entity_id", "deadline"],
+                    set_={"created_at": stmt.excluded.created_at, "recipient_user_id": stmt.excluded.recipient_user_id},
+                    where=ReminderDelivery.delivered_at.is_(None) & (ReminderDelivery.created_at < now - self.claim_lease),
+                ).returning(ReminderDelivery.kind, ReminderDelivery.entity_id, ReminderDelivery.deadline)
+                claimed = {tuple(row) for row in db.execute(stmt)}
+                db.commit()
+            batch = [r for r in batch if r.key in claimed]
+            if batch:
+                return batch
+
+    def _still_valid(self, db: Session, batch: List[Reminder]) -> List[Reminder]:
+        # Deadlines may have moved or tasks been completed since the scan
+        task_ids = [r.entity_id for r in batch if r.kind == TASK_DUE]
+        contract_ids = [r.entity_id for r in batch if r.kind == CONTRACT_EXPIRY]
+        current = {}
+        if task_ids:
+            for task_id, due_date, status in db.query(Task.id, Task.due_date, Task.status).filter(Task.id.in_(task_ids)):
+                if status != TaskStatusEnum.DONE:
+                    current[(TASK_DUE, task_id)] = due_date
+        if contract_ids:
+            for contract_id, end_date, status in db.query(Contract.id, Contract.end_date, Contract.status).filter(Contract.id.in_(contract_ids)):
+                if status == ContractStatusEnum.VERIFIED:
+                    current[(CONTRACT_EXPIRY, contract_id)] = datetime.combine(end_date, time.min)
+        return [r for r in batch if current.get((r.kind, r.entity_id)) == r.deadline]
+
+    def mark_delivered(self, delivered: List[Reminder], failed: List[Reminder], now: datetime) -> None:
+        key = tuple_(ReminderDelivery.kind, ReminderDelivery.entity_id, ReminderDelivery.deadline)
+        with self.session_factory() as db:
+            if delivered:
+                db.query(ReminderDelivery).filter(key.in_([r.key for r in delivered])).update(
+                    {ReminderDelivery.delivered_at: now}, synchronize_session=False
+                )
+            # Release failed claims so they are retried on a later tick
+            if failed:
+                db.query(ReminderDelivery).filter(key.in_([r.key for r in failed])).delete(
+                    synchronize_session=False
+                )
+            db.commit()
+        for reminder in failed:
+            if reminder.key not in self._queued:
+                self._queued.add(reminder.key)
+                heapq.heappush(self._heap, reminder._replace(fire_at=now + timedelta(minutes=1)))
+
+    async def tick(self, now: Optional[datetime] = None) -> int:
+        """Scan the next window and send everything due; returns the number sent"""
+        now = now or datetime.utcnow()
+        await asyncio.to_thread(self.scan, now)
+
+        sent = 0
+        while True:
+            batch = await asyncio.to_thread(self.claim_due, now)
+            if not batch:
+                return sent
+            results = await asyncio.gather(
+                *(send_sms(r.phone_number, r.message) for r in batch), return_exceptions=True
+            )
+            delivered = [r for r, ok in zip(batch, results) if ok is True]
+            failed = [r for r, ok in zip(batch, results) if ok is not True]
+            await asyncio.to_thread(self.mark_delivered, delivered, failed, now)
+            sent += len(delivered)
+
+
+class ReminderScheduler:
+    """Common interface for the reminder backends"""
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class RunnerLock:
+    """Session-level PostgreSQL advisory lock held on a dedicated connection.
+
+    Whichever process holds it is the only one running reminders; when that
+    process dies its connection closes, the lock is freed and another worker
+    takes over on its next tick. Other databases (SQLite in development)
+    run a single local process, which always holds it.
+    """
+
+    def __init__(self, bind: Engine = primary_engine, key: int = RUNNER_LOCK_KEY):
+        self.bind = bind
+        self.key = key
+        self._conn: Optional[Connection] = None
+
+    def acquire(self) -> bool:
+        """Take the lock, or confirm it is still held; never blocks"""
+        if self.bind.dialect.name != "postgresql":
+            return True
+        if self._conn is not None:
+            try:
+                self._conn.execute(text("SELECT 1"))
+                self._conn.commit()
+                return True
+            except exc.DBAPIError:
+                self.release()
+
+        conn = self.bind.connect()
+        try:
+            held = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if held:
+            self._conn = conn
+        else:
+            conn.close()
+        return bool(held)
+
+    def release(self) -> None:
+        if self._conn is not None:
+            # Drop the server connection rather than pooling it, so the lock goes with it
+            self._conn.invalidate()
+            self._conn.close()
+            self._conn = None
+
+
+class AsyncioReminderScheduler(ReminderScheduler):
+    """Runs the engine inside the API process, one tick every REMINDER_TICK_SECONDS.
+
+    Every worker starts one, but only the holder of the runner lock ticks.
+    """
+
+    def __init__(
+        self, engine: Optional[ReminderEngine] = None, interval: int = settings.REMINDER_TICK_SECONDS,
+        lock: Optional[RunnerLock] = None,
+    ):
+        self.engine = engine or ReminderEngine()
+        self.interval = interval
+        self.lock = lock or RunnerLock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.lock.release)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await asyncio.to_thread(self.lock.acquire):
+                    await self.engine.tick()
+            except Exception as e:
+                print(f"Reminder tick failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+class CeleryReminderScheduler(ReminderScheduler):
+    """Reminders are driven by celery beat (see app.worker); nothing runs in the API process"""
+
+
+def get_reminder_scheduler() -> ReminderScheduler:
+    if settings.REMINDER_BACKEND == "asyncio":
+        if settings.DB_POOLER == "pgbouncer":
+            # Transaction pooling can't keep a session-level advisory lock on one server connection
+            raise RuntimeError("REMINDER_BACKEND=asyncio needs a direct database connection; use celery with DB_POOLER")
+        return AsyncioReminderScheduler()
+    if settings.REMINDER_BACKEND == "celery":
+        return CeleryReminderScheduler()
+    return ReminderScheduler()
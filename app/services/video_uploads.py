@@ -0,0 +1,213 @@
+import base64
+import binascii
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from typing import Optional
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from ..core.config import settings
+from ..core.upload_store import UploadBusy, UploadStore
+from ..utils.file_upload import ALLOWED_EXTENSIONS, get_file_extension
+
+# tus checksum extension: "Upload-Checksum: <algorithm> <base64 digest>"
+CHUNK_CHECKSUM_ALGORITHMS = ("sha1", "sha256", "md5")
+CHECKSUM_MISMATCH = 460
+READ_BLOCK = 1024 * 1024
+
+
+def part_path(upload_id: str) -> str:
+    return os.path.join(settings.UPLOAD_TMP_DIR, f"{upload_id}.part")
+
+
+def new_upload(fight_id: int, user_id: int, filename: str, length: int, checksum: Optional[str]) -> dict:
+    """Validate a new upload, create its empty partial file and return its state"""
+    if get_file_extension(filename) not in ALLOWED_EXTENSIONS["video"]:
+        raise HTTPException(status_code=400, detail="Invalid file type")
+    if length > settings.MAX_VIDEO_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail="File too large")
+
+    upload_id = uuid.uuid4().hex
+    os.makedirs(settings.UPLOAD_TMP_DIR, exist_ok=True)
+    open(part_path(upload_id), "wb").close()
+    return {
+        "id": upload_id,
+        "fight_id": fight_id,
+        "user_id": user_id,
+        "filename": filename,
+        "length": length,
+        "offset": 0,
+        "checksum": checksum.lower() if checksum else None,
+        "created_at": time.time(),
+    }
+
+
+async def get_upload(store: UploadStore, upload_id: str, user_id: int) -> dict:
+    state = await store.get(upload_id)
+    if state is None or state["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return state
+
+
+async def _reload(store: UploadStore, upload_id: str) -> dict:
+    # Re-read under the lock: another request may have advanced or finished it
+    state = await store.get(upload_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return state
+
+
+def _parse_chunk_checksum(header: Optional[str]):
+    if not header:
+        return None
+    try:
+        algorithm, digest = header.split(" ", 1)
+        expected = base64.b64decode(digest.strip(), validate=True)
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Malformed Upload-Checksum")
+    if algorithm.lower() not in CHUNK_CHECKSUM_ALGORITHMS:
+        raise HTTPException(status_code=400, detail=f"Unsupported checksum algorithm: {algorithm}")
+    return hashlib.new(algorithm.lower()), expected
+
+
+def _sha256_file(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(READ_BLOCK), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _truncate(path: str, offset: int) -> None:
+    with open(path, "r+b") as f:
+        f.truncate(offset)
+
+
+async def append_chunk(
+    store: UploadStore, state: dict, request: Request, offset: int, checksum_header: Optional[str]
+) -> dict:
+    """Stream one PATCH body to the partial file at ``offset``.
+
+    The body is written block by block as it arrives, so memory stays constant
+    whatever the chunk size. With an Upload-Checksum header the chunk is
+    all-or-nothing: a mismatch or a dropped connection truncates back to the
+    previous offset. Without one, whatever arrived before a disconnect is kept
+    and the client resumes from the offset returned by HEAD.
+    """
+    chunk_check = _parse_chunk_checksum(checksum_header)
+    try:
+        async with store.lock(state["id"]):
+            state = await _reload(store, state["id"])
+            if offset != state["offset"]:
+                raise HTTPException(
+                    status_code=409, detail="Upload-Offset mismatch",
+                    headers={"Upload-Offset": str(state["offset"])}
+                )
+
+            path = part_path(state["id"])
+            remaining = state["length"] - offset
+            written = 0
+            disconnected = False
+            f = open(path, "r+b")
+            try:
+                # Drops bytes past the recorded offset left by an interrupted chunk
+                f.truncate(offset)
+                f.seek(offset)
+                try:
+                    async for block in request.stream():
+                        if not block:
+                            continue
+                        if written + len(block) > remaining:
+                            raise HTTPException(status_code=413, detail="Chunk exceeds Upload-Length")
+                        await run_in_threadpool(f.write, block)
+                        if chunk_check:
+                            chunk_check[0].update(block)
+                        written += len(block)
+                except ClientDisconnect:
+                    disconnected = True
+                f.flush()
+            except BaseException:
+                f.close()
+                _truncate(path, offset)
+                raise
+            f.close()
+
+            if chunk_check and (disconnected or chunk_check[0].digest() != chunk_check[1]):
+                _truncate(path, offset)
+                if disconnected:
+                    return state
+                raise HTTPException(status_code=CHECKSUM_MISMATCH, detail="Checksum mismatch")
+
+            state["offset"] = offset + written
+            await store.save(state)
+            return state
+    except UploadBusy:
+        raise HTTPException(status_code=409, detail="Upload is busy")
+
+
+def _move_into_place(state: dict) -> str:
+    directory = os.path.join(settings.UPLOAD_DIR, "fights")
+    os.makedirs(directory, exist_ok=True)
+    file_path = os.path.join(
+        directory, f"{state['fight_id']}_{uuid.uuid4().hex}{get_file_extension(state['filename'])}"
+    )
+    # A rename on the same filesystem; a chunked copy otherwise
+    shutil.move(part_path(state["id"]), file_path)
+    return file_path
+
+
+async def finalize_upload(store: UploadStore, state: dict) -> str:
+    """Check the completed file and move it under UPLOAD_DIR; returns its path"""
+    try:
+        async with store.lock(state["id"]):
+            state = await _reload(store, state["id"])
+            if state["offset"] != state["length"]:
+                raise HTTPException(
+                    status_code=409, detail="Upload is incomplete",
+                    headers={"Upload-Offset": str(state["offset"])}
+                )
+            # The whole-file checksum is optional and checked once, here: one
+            # sequential read, whichever worker received the chunks
+            if state["checksum"]:
+                digest = await run_in_threadpool(_sha256_file, part_path(state["id"]))
+                if digest != state["checksum"]:
+                    await _discard(store, state)
+                    raise HTTPException(status_code=CHECKSUM_MISMATCH, detail="Checksum mismatch")
+            file_path = await run_in_threadpool(_move_into_place, state)
+            await store.delete(state["id"])
+            return file_path
+    except UploadBusy:
+        raise HTTPException(status_code=409, detail="Upload is busy")
+
+
+async def discard_upload(store: UploadStore, state: dict) -> None:
+    """Terminate an upload and delete its partial file"""
+    try:
+        async with store.lock(state["id"]):
+            await _discard(store, state)
+    except UploadBusy:
+        raise HTTPException(status_code=409, detail="Upload is busy")
+
+
+async def _discard(store: UploadStore, state: dict) -> None:
+    await store.delete(state["id"])
+    try:
+        os.remove(part_path(state["id"]))
+    except FileNotFoundError:
+        pass
+
+
+def purge_stale_uploads(max_age: int = settings.UPLOAD_SESSION_TTL_SECONDS) -> int:
+    """Delete partial files untouched for longer than the session TTL (their state has expired too)"""
+    if not os.path.isdir(settings.UPLOAD_TMP_DIR):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(settings.UPLOAD_TMP_DIR):
+        if entry.name.endswith(".part") and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+            removed += 1
+    return removed
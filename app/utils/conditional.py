@@ -0,0 +1,88 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+from fastapi import Request, Response
+
+
+def compute_validators(
+    rows: Iterable[Tuple[int, Optional[datetime]]], seed: str = ""
+) -> Tuple[str, Optional[datetime]]:
+    """Build a weak ETag and Last-Modified from (id, updated_at) pairs.
+
+    The ETag covers the ids and the row count, so a row leaving the set
+    changes it; Last-Modified (the newest updated_at) does not see deletions.
+    """
+    digest = hashlib.sha1(seed.encode())
+    last_modified = None
+    count = 0
+    for row_id, updated_at in rows:
+        digest.update(f"{row_id}:{updated_at.isoformat() if updated_at else ''};".encode())
+        if updated_at and (last_modified is None or updated_at > last_modified):
+            last_modified = updated_at
+        count += 1
+    digest.update(f"#{count}".encode())
+    return f'W/"{digest.hexdigest()}"', last_modified
+
+
+def _http_date(value: datetime) -> str:
+    # updated_at columns hold naive UTC timestamps (datetime.utcnow)
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    rows: Iterable[Tuple[int, Optional[datetime]]],
+    seed: str = "",
+    collection: bool = False,
+) -> Optional[Response]:
+    """Set ETag/Last-Modified on response; return a 304 response if the client copy is fresh.
+
+    For collections (list pages) only the ETag is used: a deleted row would
+    leave max(updated_at) unchanged, so If-Modified-Since could answer 304
+    for a stale list.
+    """
+    etag, last_modified = compute_validators(rows, seed)
+    if collection:
+        last_modified = None
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
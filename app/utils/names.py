@@ -0,0 +1,58 @@
+import re
+import unicodedata
+from typing import Optional, Set
+
+# Cyrillic (Russian, Uzbek, Kazakh, Ukrainian letters) to Latin
+CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "ғ": "g", "ґ": "g", "д": "d", "е": "e", "ё": "yo",
+    "є": "ye", "ж": "zh", "з": "z", "и": "i", "і": "i", "ї": "yi", "й": "y", "к": "k", "қ": "q",
+    "л": "l", "м": "m", "н": "n", "ң": "ng", "о": "o", "ө": "o", "п": "p", "р": "r", "с": "s",
+    "т": "t", "у": "u", "ў": "o", "ү": "u", "ұ": "u", "ф": "f", "х": "kh", "ҳ": "h", "һ": "h",
+    "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "", "ы": "y", "ь": "", "э": "e", "ә": "a",
+    "ю": "yu", "я": "ya",
+}
+
+# Spelling variants folded to one form, applied in order after transliteration,
+# so "Юсупов", "Iusupov" and "Yusupov" or "Хабиб" and "Xabib" end up equal
+VARIANT_FOLDS = [
+    (re.compile(r"shch|sch"), "sh"),
+    (re.compile(r"dzh|dj|zh"), "j"),
+    (re.compile(r"kh|x"), "h"),
+    (re.compile(r"tz|ts"), "c"),
+    (re.compile(r"(?<![a-z])[ij](?=[aeou])"), "y"),  # Iakub, Jakub -> Yakub
+    (re.compile(r"(?<=[aeiou])j(?=[aeou])"), "y"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"(?<=[a-z])(iy|ii|yi|y)(?![a-z])"), "i"),  # Vasiliy, Vasilii, Vasily -> Vasili
+    (re.compile(r"([a-z])\1+"), r"\1"),  # Hassan -> Hasan
+]
+
+APOSTROPHES = "'`ʻʼ‘’"
+
+
+def normalize_name(value: Optional[str]) -> str:
+    """Lower-case Latin skeleton of a name: transliterated, accent-free, variant-folded"""
+    if not value:
+        return ""
+    value = "".join(CYRILLIC_TO_LATIN.get(char, char) for char in value.lower())
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(char for char in value if not unicodedata.combining(char) and char not in APOSTROPHES)
+    value = re.sub(r"[^a-z]+", " ", value).strip()
+    for pattern, replacement in VARIANT_FOLDS:
+        value = pattern.sub(replacement, value)
+    return value
+
+
+def name_search_key(*parts: Optional[str]) -> str:
+    """Value of Fighter.name_search: every name part normalized, space separated"""
+    return " ".join(filter(None, (normalize_name(part) for part in parts)))
+
+
+def trigrams(value: str) -> Set[str]:
+    """Trigrams the way pg_trgm builds them: per word, padded with two spaces in front and one behind"""
+    grams = set()
+    for word in value.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
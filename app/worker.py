@@ -0,0 +1,60 @@
+import asyncio
+from celery import Celery
+from celery.schedules import crontab
+from app.core.config import settings
+from app.models import user, fighter, enums  # Import to register tables
+from app.services.event_counters import reconcile_all
+from app.services.fighter_cards import rebuild_fighter_cards
+from app.services.fighter_duplicates import scan_duplicates
+from app.services.reminders import ReminderEngine
+
+celery_app = Celery("camma", broker=settings.REDIS_URL, backend=settings.REDIS_URL)
+
+celery_app.conf.beat_schedule = {
+    "dispatch-reminders": {
+        "task": "app.worker.dispatch_reminders",
+        "schedule": float(settings.REMINDER_TICK_SECONDS),
+    },
+    "rebuild-fighter-cards": {
+        "task": "app.worker.rebuild_fighter_cards",
+        "schedule": crontab(hour=0, minute=15),
+    },
+    "reconcile-event-counters": {
+        "task": "app.worker.reconcile_event_counters",
+        "schedule": crontab(minute=30),
+    },
+    "scan-duplicate-fighters": {
+        "task": "app.worker.scan_duplicate_fighters",
+        "schedule": crontab(hour=1, minute=0),
+    },
+}
+celery_app.conf.timezone = "UTC"
+
+
+@celery_app.task(name="app.worker.dispatch_reminders", ignore_result=True)
+def dispatch_reminders() -> int:
+    """Beat-driven reminder tick.
+
+    Runs are stateless: every run rescans one horizon back and ahead, and the
+    idempotent delivery table drops anything an earlier run already sent.
+    Start with: celery -A app.worker worker --beat
+    """
+    return asyncio.run(ReminderEngine().tick())
+
+
+@celery_app.task(name="app.worker.rebuild_fighter_cards", ignore_result=True)
+def rebuild_fighter_cards_task() -> int:
+    """Nightly full refresh; picks up contracts that expired with the date change"""
+    return rebuild_fighter_cards()
+
+
+@celery_app.task(name="app.worker.reconcile_event_counters", ignore_result=True)
+def reconcile_event_counters_task() -> int:
+    """Hourly safety net that recomputes event counters from the source rows"""
+    return reconcile_all()
+
+
+@celery_app.task(name="app.worker.scan_duplicate_fighters", ignore_result=True)
+def scan_duplicate_fighters_task() -> int:
+    """Nightly full-table duplicate scan; registrations are also checked inline"""
+    return scan_duplicates()
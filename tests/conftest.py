@@ -0,0 +1,94 @@
+import os
+
+# One test process, no Redis: live updates and upload state stay in memory
+os.environ.setdefault("LIVE_BROKER", "memory")
+os.environ.setdefault("UPLOAD_STATE_BACKEND", "memory")
+os.environ.setdefault("WEB_CONCURRENCY", "1")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.core import database
+from app.core.database import Base
+from app.core.security import create_access_token
+from app.main import create_app
+from app.models.enums import UserRoleEnum
+from app.models.user import User
+
+# PostgreSQL when TEST_DATABASE_URL is set (row locks, triggers); otherwise a SQLite file
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def make_test_engine(url: str):
+    if url.startswith("sqlite"):
+        return create_engine(url, connect_args={"check_same_thread": False})
+    return create_engine(url, pool_size=20, max_overflow=20)
+
+
+@pytest.fixture(scope="session")
+def engine(tmp_path_factory):
+    url = TEST_DATABASE_URL or f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
+    test_engine = make_test_engine(url)
+    if test_engine.dialect.name == "postgresql":
+        with test_engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.drop_all(test_engine)
+    Base.metadata.create_all(test_engine)
+
+    # Point the app's session factories at the test database
+    binds = database.SessionLocal.kw["bind"], database.ReadSessionLocal.kw["bind"]
+    database.SessionLocal.configure(bind=test_engine)
+    database.ReadSessionLocal.configure(bind=test_engine)
+    yield test_engine
+    database.SessionLocal.configure(bind=binds[0])
+    database.ReadSessionLocal.configure(bind=binds[1])
+    Base.metadata.drop_all(test_engine)
+    test_engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables(request):
+    yield
+    if "engine" in request.fixturenames:
+        test_engine = request.getfixturevalue("engine")
+        with test_engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+
+
+@pytest.fixture
+def db(engine):
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def app():
+    return create_app()
+
+
+@pytest.fixture
+def admin(db):
+    user = User(phone_number="+10000000000", role=UserRoleEnum.ADMIN)
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def client(app, admin):
+    return TestClient(
+        app, base_url="http://api.yourdomain.com",  # a host TrustedHostMiddleware accepts outside DEBUG
+        headers={"Authorization": f"Bearer {create_access_token(admin.id)}"},
+    )
+
+
+@pytest.fixture
+def pg_engine(engine):
+    """The test engine, for tests that need PostgreSQL behaviour (row locks, triggers)"""
+    if engine.dialect.name != "postgresql":
+        pytest.skip("needs PostgreSQL (set TEST_DATABASE_URL)")
+    return engine
@@ -0,0 +1,52 @@
+from datetime import date, datetime
+from app.models.enums import ApplicationStatusEnum as Status, EventTypeEnum, GenderEnum
+from app.models.fighter import Event, EventApplication, Fighter
+from app.services.applications import TRANSITIONS
+from app.services.event_counters import PENDING_STATUSES
+
+
+def test_every_status_has_its_transitions_listed():
+    assert set(TRANSITIONS) == set(Status)
+    terminal = {status for status, targets in TRANSITIONS.items() if not targets}
+    assert terminal == {Status.COMPLETED, Status.REJECTED, Status.WITHDRAWN, Status.OVERDUE, Status.BLOCKED}
+    # Every non-initial status is reachable
+    assert set().union(*TRANSITIONS.values()) == set(Status) - {Status.DRAFT}
+
+
+def _applications(db, admin, *statuses):
+    event = Event(name="Night", event_type=EventTypeEnum.FIGHT, event_date=datetime(2030, 1, 1),
+                  pending_applications=sum(status in PENDING_STATUSES for status in statuses))
+    fighters = [
+        Fighter(first_name=f"F{i}", last_name="Test", birth_date=date(1995, 1, 1), gender=GenderEnum.MALE)
+        for i in range(len(statuses))
+    ]
+    db.add_all([event, *fighters])
+    db.flush()
+    applications = [
+        EventApplication(event_id=event.id, fighter_id=fighter.id, applicant_user_id=admin.id, status=status)
+        for fighter, status in zip(fighters, statuses)
+    ]
+    db.add_all(applications)
+    db.commit()
+    return event.id, [application.id for application in applications]
+
+
+def test_bulk_transition_reports_an_outcome_per_id(client, db, admin):
+    event_id, ids = _applications(
+        db, admin, Status.SUBMITTED, Status.NEEDS_CORRECTION, Status.WITHDRAWN, Status.UNDER_MATCHMAKER_REVIEW,
+    )
+    response = client.post(f"/api/v1/events/{event_id}/applications/transitions",
+                           json={"application_ids": [*ids, 999_999], "status": Status.NEEDS_CORRECTION.value})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["updated"] == 2
+    assert [result["outcome"] for result in body["results"]] == [
+        "updated", "unchanged", "invalid_transition", "updated", "not_found",
+    ]
+
+    db.expire_all()
+    assert [db.get(EventApplication, i).status for i in ids] == [
+        Status.NEEDS_CORRECTION, Status.NEEDS_CORRECTION, Status.WITHDRAWN, Status.NEEDS_CORRECTION,
+    ]
+    # Sent back for correction: no longer awaiting review
+    assert db.get(Event, event_id).pending_applications == 0
@@ -0,0 +1,39 @@
+import threading
+from app.core import database
+from app.models.fighter import Fighter
+
+FIGHTER = {"first_name": "New", "last_name": "Test", "birth_date": "1995-01-01", "gender": "М"}
+
+
+def _batch(client, *requests):
+    response = client.post("/api/v1/batch/", json={"requests": list(requests)})
+    assert response.status_code == 200, response.text
+    return [(item["id"], item["status"]) for item in response.json()["responses"]]
+
+
+def test_consecutive_reads_run_concurrently(client, monkeypatch):
+    # Each read opens its own session; both must be open at once to pass the barrier
+    barrier = threading.Barrier(2, timeout=10)
+    read_session = database.ReadSessionLocal
+    opened = []
+
+    def session_factory(**kw):
+        barrier.wait()
+        opened.append(read_session(**kw))
+        return opened[-1]
+
+    monkeypatch.setattr(database, "ReadSessionLocal", session_factory)
+    assert _batch(client, {"id": "a", "path": "/fighters/"}, {"id": "b", "path": "/fighters/"}) == [
+        ("a", 200), ("b", 200),
+    ]
+    assert len(opened) == 2
+
+
+def test_writes_before_a_failure_stay_committed(client, db):
+    assert _batch(
+        client,
+        {"id": "created", "method": "POST", "path": "/fighters/", "body": FIGHTER},
+        {"id": "invalid", "method": "POST", "path": "/fighters/", "body": {"first_name": ""}},
+        {"id": "read", "path": "/fighters/"},
+    ) == [("created", 200), ("invalid", 422), ("read", 200)]
+    assert [fighter.first_name for fighter in db.query(Fighter)] == ["New"]
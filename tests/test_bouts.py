@@ -0,0 +1,54 @@
+from datetime import date, datetime
+from app.models.enums import EventTypeEnum, GenderEnum
+from app.models.fighter import Event, Fighter, Promotion
+
+
+def _card(db, *weight_classes):
+    promotion = Promotion(name="Promotion")
+    db.add(promotion)
+    db.flush()
+    event = Event(name="Night", event_type=EventTypeEnum.FIGHT, event_date=datetime(2030, 1, 1),
+                  organizer_id=promotion.id)
+    fighters = [
+        Fighter(first_name=f"F{i}", last_name="Test", birth_date=date(1995, 1, 1),
+                gender=GenderEnum.MALE, weight_class=weight_class)
+        for i, weight_class in enumerate(weight_classes)
+    ]
+    db.add_all([event, *fighters])
+    db.commit()
+    return event.id, [fighter.id for fighter in fighters]
+
+
+def test_weight_class_is_taken_from_the_fighters(client, db):
+    event_id, (a, b) = _card(db, "70", "70")
+    response = client.post(f"/api/v1/events/{event_id}/fights",
+                           json={"event_id": event_id, "fighter1_id": a, "fighter2_id": b})
+    assert response.status_code == 200, response.text
+    assert response.json()["weight_class"] == "70"
+
+
+def test_differing_weight_classes_need_the_bout_to_set_one(client, db):
+    event_id, (a, b) = _card(db, "70", "77")
+    response = client.post(f"/api/v1/events/{event_id}/fights",
+                           json={"event_id": event_id, "fighter1_id": a, "fighter2_id": b})
+    assert response.status_code == 422
+    assert "different weight classes" in response.json()["detail"][0]["error"]
+    assert client.get(f"/api/v1/events/{event_id}/fights").json() == []
+
+
+def test_fighter_already_on_the_card_can_be_paired_again(client, db):
+    event_id, (a, b, c) = _card(db, "70", "70", "70")
+    for opponent in (b, c):
+        response = client.post(f"/api/v1/events/{event_id}/create-pair",
+                               json={"fighter1_id": a, "fighter2_id": opponent, "weight_class": "70"})
+        assert response.status_code == 200, response.text
+    assert client.get(f"/api/v1/events/{event_id}").json()["confirmed_pairs"] == 2
+
+
+def test_fighter_repeated_within_one_request_is_rejected(client, db):
+    event_id, (a, b, c) = _card(db, "70", "70", "70")
+    response = client.post(f"/api/v1/events/{event_id}/fights/batch", json={"fights": [
+        {"fighter1_id": a, "fighter2_id": b, "weight_class": "70"},
+        {"fighter1_id": a, "fighter2_id": c, "weight_class": "70"},
+    ]})
+    assert response.status_code == 400
@@ -0,0 +1,58 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+import pytest
+from app.core.broker import Broker, InProcessBroker
+from app.core.upload_store import UploadStore
+
+SUBSCRIBERS = 10_000
+
+
+def test_publish_fans_out_to_10k_subscribers():
+    async def run():
+        broker = InProcessBroker(queue_size=2)
+        async with AsyncExitStack() as stack:
+            subscriptions = [
+                await stack.enter_async_context(broker.subscribe("event:1")) for _ in range(SUBSCRIBERS)
+            ]
+            other = await stack.enter_async_context(broker.subscribe("event:2"))
+            assert broker.subscriber_count("event:1") == SUBSCRIBERS
+
+            started = time.perf_counter()
+            for n in range(3):
+                await broker.publish("event:1", f"message {n}")
+            elapsed = time.perf_counter() - started
+
+            # Each subscriber holds the newest queue_size messages, sharing one string per publish
+            first = [await subscriptions[0].get(1), await subscriptions[0].get(1)]
+            assert first == ["message 1", "message 2"]
+            for subscription in subscriptions[1:]:
+                assert subscription.dropped == 1
+                received = [await subscription.get(1), await subscription.get(1)]
+                assert all(message is expected for message, expected in zip(received, first))
+                assert subscription.queue.empty()
+            assert other.queue.empty()
+        assert broker.subscriber_count("event:1") == 0
+        return elapsed
+
+    # Three publishes to 10k local queues: a plain loop, well under a second
+    assert asyncio.run(run()) < 1.0
+
+
+def test_base_classes_are_abstract():
+    with pytest.raises(TypeError):
+        Broker()
+    with pytest.raises(TypeError):
+        UploadStore()
+
+
+def test_memory_broker_refused_with_several_workers(monkeypatch):
+    from app.core import broker
+
+    monkeypatch.setattr(broker, "_broker", None)
+    monkeypatch.setattr(broker.settings, "LIVE_BROKER", "memory")
+    monkeypatch.setattr(broker.settings, "WEB_CONCURRENCY", 4)
+    with pytest.raises(RuntimeError):
+        broker.get_broker()
+    monkeypatch.setattr(broker.settings, "WEB_CONCURRENCY", 1)
+    assert isinstance(broker.get_broker(), InProcessBroker)
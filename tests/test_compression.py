@@ -0,0 +1,100 @@
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.core import compression
+from app.core.compression import CompressedVariantCache, CompressionMiddleware, negotiate_encoding
+
+BODY = b'{"fighters": [' + b'{"name": "Fighter"},' * 200 + b'{}]}'
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br, zstd", "zstd"),        # equal weights: server preference
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0.9, zstd;q=0.8, gzip", "gzip"),
+    ("zstd;q=0, br;q=0, *", "gzip"),            # q=0 refuses even when * allows the rest
+    ("*;q=0.1, br;q=0.2", "br"),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("gzip;q=bogus", None),
+    ("", None),
+])
+def test_negotiation_honours_q_values(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+@pytest.fixture
+def compressed_app(monkeypatch):
+    calls = []
+    real_compress = compression.compress
+    monkeypatch.setattr(compression, "compress", lambda encoding, data: calls.append(encoding) or real_compress(encoding, data))
+
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache=CompressedVariantCache(1024 * 1024))
+
+    @app.get("/tagged")
+    def tagged():
+        return Response(BODY, media_type="application/json", headers={"ETag": 'W/"v1"'})
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BODY, BODY]), media_type="text/plain")
+
+    @app.get("/image")
+    def image():
+        return Response(BODY, media_type="image/png")
+
+    return TestClient(app), calls
+
+
+def test_response_is_compressed_with_the_negotiated_encoding(compressed_app):
+    client, _ = compressed_app
+    response = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert response.content == BODY  # decoded by the client
+    assert int(response.headers["content-length"]) < len(BODY)
+
+    raw = client.get("/tagged", headers={"Accept-Encoding": "zstd"})
+    assert raw.headers["content-encoding"] == "zstd"
+
+
+def test_compressed_variants_are_cached_per_etag_and_encoding(compressed_app):
+    client, calls = compressed_app
+    for _ in range(3):
+        assert client.get("/tagged", headers={"Accept-Encoding": "gzip"}).content == BODY
+    client.get("/tagged", headers={"Accept-Encoding": "br"})
+    assert calls == ["gzip", "br"]
+
+
+def test_small_uncompressible_and_unrequested_bodies_pass_through(compressed_app):
+    client, calls = compressed_app
+    for path, accept_encoding in (("/small", "gzip"), ("/image", "gzip"), ("/tagged", "identity")):
+        response = client.get(path, headers={"Accept-Encoding": accept_encoding})
+        assert "content-encoding" not in response.headers
+    assert calls == []
+
+
+def test_streamed_bodies_are_compressed_chunk_by_chunk(compressed_app):
+    client, calls = compressed_app
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == BODY * 2
+    assert calls == []
+
+
+def test_variant_cache_evicts_least_recently_used():
+    cache = CompressedVariantCache(max_bytes=10)
+    cache.put(("/a", "1", "gzip"), b"aaaa")
+    cache.put(("/b", "1", "gzip"), b"bbbb")
+    assert cache.get(("/a", "1", "gzip")) == b"aaaa"
+    cache.put(("/c", "1", "gzip"), b"cccc")
+    assert cache.get(("/b", "1", "gzip")) is None
+    assert cache.get(("/a", "1", "gzip")) == b"aaaa"
+    cache.put(("/big", "1", "gzip"), b"x" * 11)
+    assert cache.get(("/big", "1", "gzip")) is None
@@ -0,0 +1,57 @@
+from datetime import date, datetime
+from app.models.enums import GenderEnum
+from app.models.fighter import Fighter
+
+
+def _fighter(db, name, updated_at=datetime(2030, 1, 1, 12, 0, 0)):
+    fighter = Fighter(fighter_id=name, first_name=name, last_name="Test", birth_date=date(1995, 1, 1),
+                      gender=GenderEnum.MALE, updated_at=updated_at)
+    db.add(fighter)
+    db.commit()
+    return fighter
+
+
+def test_item_etag_and_last_modified_round_trip(client, db):
+    fighter = _fighter(db, "A")
+    url = f"/api/v1/fighters/{fighter.id}"
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert response.headers["last-modified"] == "Tue, 01 Jan 2030 12:00:00 GMT"
+
+    # Weak comparison: the strong form and a list containing the tag both match
+    for if_none_match in (etag, etag[2:], f'"other", {etag}'):
+        response = client.get(url, headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    assert client.get(url, headers={"If-Modified-Since": "Tue, 01 Jan 2030 12:00:00 GMT"}).status_code == 304
+    # If-None-Match wins over a fresh If-Modified-Since
+    assert client.get(url, headers={
+        "If-None-Match": '"other"', "If-Modified-Since": "Tue, 01 Jan 2030 12:00:00 GMT",
+    }).status_code == 200
+
+    fighter.updated_at = datetime(2030, 1, 2)
+    db.commit()
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["first_name"] == "A"
+
+
+def test_list_etag_changes_when_a_row_leaves(client, db):
+    _fighter(db, "A")
+    _fighter(db, "B", updated_at=datetime(2030, 2, 1))
+    older = _fighter(db, "C")
+    response = client.get("/api/v1/fighters/")
+    etag = response.headers["etag"]
+    # Lists carry no Last-Modified: max(updated_at) would not notice the deletion below
+    assert "last-modified" not in response.headers
+    assert client.get("/api/v1/fighters/", headers={"If-None-Match": etag}).status_code == 304
+
+    db.delete(older)
+    db.commit()
+    response = client.get("/api/v1/fighters/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [fighter["first_name"] for fighter in response.json()] == ["A", "B"]
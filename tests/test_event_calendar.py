@@ -0,0 +1,87 @@
+from datetime import datetime
+import pytest
+from app.api.v1.endpoints import events
+from app.models.enums import EventTypeEnum
+from app.models.fighter import Event, Promotion
+from app.services.event_calendar import EventCalendar
+
+
+@pytest.fixture
+def calendar(monkeypatch):
+    fresh = EventCalendar(ttl=60)
+    monkeypatch.setattr(events, "event_calendar", fresh)
+    return fresh
+
+
+@pytest.fixture
+def promotion_id(db):
+    promotion = Promotion(name="Promotion")
+    db.add(promotion)
+    db.commit()
+    return promotion.id
+
+
+def _events(db, promotion_id, *dates, city="Moscow"):
+    db.add_all([
+        Event(name=f"Night {n}", event_type=EventTypeEnum.FIGHT, event_date=value, city=city,
+              organizer_id=promotion_id)
+        for n, value in enumerate(dates)
+    ])
+    db.commit()
+
+
+def _calendar(client, **params):
+    response = client.get("/api/v1/events/calendar", params=params)
+    assert response.status_code == 200, response.text
+    return [(bucket["start"], bucket["count"]) for bucket in response.json()]
+
+
+def test_counts_per_day_and_week(client, db, calendar, promotion_id):
+    _events(db, promotion_id, datetime(2030, 1, 7, 19), datetime(2030, 1, 7, 21), datetime(2030, 1, 13, 23, 30),
+            datetime(2030, 1, 14, 0, 30))
+    _events(db, promotion_id, datetime(2030, 1, 8, 19), city="Kazan")
+
+    assert _calendar(client, date_from="2030-01-07", date_to="2030-01-09", city="Moscow") == [
+        ("2030-01-07", 2), ("2030-01-08", 0), ("2030-01-09", 0),
+    ]
+    # Weeks start on Monday, whichever day date_from falls on
+    assert _calendar(client, date_from="2030-01-09", date_to="2030-01-14", bucket="week") == [
+        ("2030-01-07", 4), ("2030-01-14", 1),
+    ]
+
+
+def test_buckets_are_cached_until_an_event_is_created(client, db, calendar, promotion_id):
+    _events(db, promotion_id, datetime(2030, 1, 7, 19))
+    params = {"date_from": "2030-01-06", "date_to": "2030-01-08"}
+    assert _calendar(client, **params) == [("2030-01-06", 0), ("2030-01-07", 1), ("2030-01-08", 0)]
+
+    # Written behind the API's back: the cached buckets still answer
+    _events(db, promotion_id, datetime(2030, 1, 6, 19), datetime(2030, 1, 8, 19))
+    assert _calendar(client, **params) == [("2030-01-06", 0), ("2030-01-07", 1), ("2030-01-08", 0)]
+
+    # Creating through the API drops only the buckets holding the new event
+    response = client.post("/api/v1/events/", json={
+        "name": "Late night", "event_type": EventTypeEnum.FIGHT.value, "event_date": "2030-01-07T22:00:00",
+        "organizer_id": promotion_id,
+    })
+    assert response.status_code == 200, response.text
+    assert _calendar(client, **params) == [("2030-01-06", 0), ("2030-01-07", 2), ("2030-01-08", 0)]
+
+
+def test_calendar_rejects_bad_ranges(client, calendar):
+    assert client.get("/api/v1/events/calendar", params={
+        "date_from": "2030-01-08", "date_to": "2030-01-07",
+    }).status_code == 400
+    assert client.get("/api/v1/events/calendar", params={
+        "date_from": "2030-01-01", "date_to": "2032-01-01",
+    }).status_code == 400
+    assert client.get("/api/v1/events/calendar", params={
+        "date_from": "2030-01-01", "date_to": "2030-01-02", "bucket": "month",
+    }).status_code == 422
+
+
+def test_event_list_date_range_is_half_open_and_ordered(client, db, promotion_id):
+    _events(db, promotion_id, datetime(2030, 1, 9), datetime(2030, 1, 7), datetime(2030, 1, 8), datetime(2030, 1, 6))
+    response = client.get("/api/v1/events/", params={"date_from": "2030-01-07T00:00:00", "date_to": "2030-01-09T00:00:00"})
+    assert response.status_code == 200, response.text
+    assert [event["event_date"] for event in response.json()] == ["2030-01-07T00:00:00", "2030-01-08T00:00:00"]
@@ -0,0 +1,111 @@
+import threading
+from datetime import date, datetime
+from app.core.database import SessionLocal
+from app.models.enums import ApplicationStatusEnum, EventTypeEnum, GenderEnum
+from app.models.fighter import Event, EventApplication, Fighter
+from app.services.applications import bulk_transition
+from app.services.bouts import create_bouts
+from app.services.event_counters import COUNTERS, reconcile_event_counters
+
+FIGHTERS = 16
+
+
+def _counters(db, event_id):
+    db.expire_all()
+    event = db.get(Event, event_id)
+    return {name: getattr(event, name) for name in COUNTERS}
+
+
+def _run_concurrently(jobs):
+    barrier = threading.Barrier(len(jobs))
+    errors = []
+
+    def run(job):
+        barrier.wait()
+        try:
+            with SessionLocal() as db:
+                job(db)
+                db.commit()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(job,)) for job in jobs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+
+def test_concurrent_pairings_and_approvals_keep_counters_exact(pg_engine, db, admin):
+    # A tournament, so one fighter can be paired against everyone else at once
+    event = Event(name="Cup", event_type=EventTypeEnum.TOURNAMENT, event_date=datetime(2030, 1, 1))
+    fighters = [
+        Fighter(first_name=f"F{i}", last_name="Test", birth_date=date(1995, 1, 1), gender=GenderEnum.MALE)
+        for i in range(FIGHTERS)
+    ]
+    db.add_all([event, *fighters])
+    db.flush()
+    applications = [
+        EventApplication(
+            event_id=event.id, fighter_id=fighter.id, applicant_user_id=admin.id,
+            status=ApplicationStatusEnum.APPROVED if i % 2 else ApplicationStatusEnum.UNDER_MATCHMAKER_REVIEW,
+        )
+        for i, fighter in enumerate(fighters)
+    ]
+    db.add_all(applications)
+    db.flush()
+    reconcile_event_counters(db, [event.id])
+    db.commit()
+    event_id, hub = event.id, fighters[0].id
+    pending = [application.id for application in applications if application.status != ApplicationStatusEnum.APPROVED]
+
+    def pair(opponent_id):
+        def job(session):
+            create_bouts(session, session.get(Event, event_id), [
+                {"fighter1_id": hub, "fighter2_id": opponent_id, "weight_class": "70"}
+            ])
+        return job
+
+    def approve(application_id):
+        def job(session):
+            bulk_transition(session, event_id, [application_id], ApplicationStatusEnum.APPROVED)
+        return job
+
+    # Every bout shares the hub fighter, and every pending fighter is paired
+    # while its application is being approved
+    _run_concurrently(
+        [pair(fighter.id) for fighter in fighters[1:]] + [approve(application_id) for application_id in pending]
+    )
+
+    incremental = _counters(db, event_id)
+    reconcile_event_counters(db, [event_id])
+    db.commit()
+    assert incremental == _counters(db, event_id)
+    assert incremental == {"confirmed_pairs": FIGHTERS - 1, "pending_applications": 0, "approved_without_pair": 0}
+
+
+def test_reconcile_leaves_correct_events_untouched(db, admin):
+    fighter = Fighter(first_name="F", last_name="Test", birth_date=date(1995, 1, 1), gender=GenderEnum.MALE)
+    stamp = datetime(2020, 1, 1)
+    correct, drifted = [
+        Event(name=name, event_type=EventTypeEnum.FIGHT, event_date=stamp, updated_at=stamp,
+              pending_applications=pending)
+        for name, pending in (("Correct", 1), ("Drifted", 5))
+    ]
+    db.add_all([fighter, correct, drifted])
+    db.flush()
+    db.add_all([
+        EventApplication(event_id=event.id, fighter_id=fighter.id, applicant_user_id=admin.id,
+                         status=ApplicationStatusEnum.SUBMITTED)
+        for event in (correct, drifted)
+    ])
+    db.commit()
+
+    reconcile_event_counters(db, [correct.id, drifted.id])
+    db.commit()
+    assert _counters(db, correct.id) == _counters(db, drifted.id) == {
+        "confirmed_pairs": 0, "pending_applications": 1, "approved_without_pair": 0,
+    }
+    assert db.get(Event, correct.id).updated_at == stamp
+    assert db.get(Event, drifted.id).updated_at > stamp
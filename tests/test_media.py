@@ -0,0 +1,24 @@
+from datetime import datetime
+from app.models.enums import EventTypeEnum
+from app.models.fighter import Event
+from app.schemas.media import MAX_TAG_LENGTH, normalize_tags
+
+
+def test_normalize_tags_dedupes_after_truncating():
+    long_tag = "k" * MAX_TAG_LENGTH
+    assert normalize_tags([long_tag + "o", long_tag + "  O", " KO ", "ko", "", "a " * 30]) == [
+        long_tag, "ko", ("a " * 25).strip()
+    ]
+
+
+def test_create_media_with_tags_equal_after_truncation(client, db):
+    event = Event(name="Night", event_type=EventTypeEnum.FIGHT, event_date=datetime(2030, 1, 1))
+    db.add(event)
+    db.commit()
+    long_tag = "knockout" * 7
+    response = client.post("/api/v1/media/", json={
+        "event_id": event.id, "title": "Finish", "file_url": "/uploads/finish.mp4",
+        "tags": [long_tag + "a", long_tag + "b"],
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["tags"] == [long_tag[:MAX_TAG_LENGTH]]
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import create_engine
+from app.core.database import Base, ReplicaRouter, RoutingSession
+from app.models.fighter import Club, ReferenceDataVersion
+from app.services.reference_data import reference_data
+
+
+@pytest.fixture
+def snapshot_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(reference_data, "path", str(tmp_path / "reference_data.bin"))
+    monkeypatch.setattr(reference_data, "_snapshot", None)
+    monkeypatch.setattr(reference_data, "_checked_at", float("-inf"))
+
+
+@pytest.fixture
+def empty_replica(tmp_path, monkeypatch):
+    """A replica that has not received any reference rows yet"""
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(replica)
+    monkeypatch.setattr(RoutingSession, "router", ReplicaRouter([replica], max_lag=5.0, check_interval=60.0))
+    yield replica
+    replica.dispose()
+
+
+def test_snapshot_follows_the_primary_not_a_replica(client, db, snapshot_file, empty_replica):
+    db.add(Club(name="Tiger Gym", city="Tashkent"))
+    db.commit()
+    response = client.get("/api/v1/reference/clubs", params={"q": "tig"})
+    assert response.status_code == 200, response.text
+    assert [club["name"] for club in response.json()] == ["Tiger Gym"]
+
+    club = Club(name="Tigris MMA")
+    db.add(club)
+    # What migration 0010's trigger does on PostgreSQL (SQLite fingerprints the tables instead)
+    db.merge(ReferenceDataVersion(id=1, version=2))
+    db.commit()
+    reference_data._checked_at = float("-inf")
+    assert [c["name"] for c in client.get("/api/v1/reference/clubs", params={"q": "tig"}).json()] == [
+        "Tiger Gym", "Tigris MMA"
+    ]
+    assert client.get(f"/api/v1/reference/clubs/{club.id}").json()["name"] == "Tigris MMA"
+    assert client.get("/api/v1/reference/clubs/999999").status_code == 404
@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from app.models.fighter import ReminderDelivery, Task
+from app.services import reminders
+from app.services.reminders import TASK_DUE, ReminderEngine, RunnerLock
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    messages = []
+
+    async def send_sms(phone_number, message):
+        messages.append(phone_number)
+        return True
+
+    monkeypatch.setattr(reminders, "send_sms", send_sms)
+    return messages
+
+
+@pytest.fixture
+def due_task(db, admin):
+    """A task whose reminder fired a minute ago"""
+    now = datetime.utcnow().replace(microsecond=0)
+    task = Task(title="Weigh-in", created_by_id=admin.id, assigned_to_id=admin.id,
+                due_date=now + timedelta(days=1, minutes=-1))
+    db.add(task)
+    db.commit()
+    return now, task
+
+
+def _tick(now):
+    return asyncio.run(ReminderEngine(claim_lease=timedelta(minutes=10)).tick(now))
+
+
+def test_a_reminder_is_sent_once(pg_engine, db, due_task, sent):
+    now, task = due_task
+    assert _tick(now) == 1
+    assert _tick(now + timedelta(seconds=30)) == 0
+    assert sent == ["+10000000000"]
+    delivery = db.query(ReminderDelivery).one()
+    assert (delivery.kind, delivery.entity_id, delivery.delivered_at) == (TASK_DUE, task.id, now)
+
+
+@pytest.mark.parametrize("claimed_ago, resent", [(timedelta(minutes=20), True), (timedelta(minutes=1), False)])
+def test_abandoned_claims_are_retried_after_the_lease(pg_engine, db, due_task, sent, claimed_ago, resent):
+    now, task = due_task
+    # Claimed by a sender that died before recording the delivery
+    db.add(ReminderDelivery(kind=TASK_DUE, entity_id=task.id, deadline=task.due_date,
+                            recipient_user_id=task.assigned_to_id, created_at=now - claimed_ago))
+    db.commit()
+    assert _tick(now) == int(resent)
+    db.expire_all()
+    delivery = db.query(ReminderDelivery).one()
+    assert (delivery.delivered_at is not None) == resent
+
+
+def test_one_process_holds_the_runner_lock(pg_engine):
+    first, second = RunnerLock(pg_engine), RunnerLock(pg_engine)
+    try:
+        assert first.acquire()
+        assert not second.acquire()
+        assert first.acquire()
+        first.release()
+        assert second.acquire()
+    finally:
+        first.release()
+        second.release()
+
+
+def test_in_process_reminders_refused_behind_pgbouncer(monkeypatch):
+    monkeypatch.setattr(reminders.settings, "REMINDER_BACKEND", "asyncio")
+    monkeypatch.setattr(reminders.settings, "DB_POOLER", "pgbouncer")
+    with pytest.raises(RuntimeError):
+        reminders.get_reminder_scheduler()
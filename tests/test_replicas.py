@@ -0,0 +1,142 @@
+import threading
+import time
+from datetime import date
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.core import database
+from app.core.database import Base, ReplicaRouter, RoutingSession
+from app.models.enums import GenderEnum
+from app.models.fighter import Fighter
+
+
+def _fighter(first_name):
+    return Fighter(fighter_id=first_name, first_name=first_name, last_name="Test",
+                   birth_date=date(1995, 1, 1), gender=GenderEnum.MALE)
+
+
+def _sqlite_engine(path):
+    return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """A second local database standing in for a replica; holds one fighter the primary doesn't have"""
+    replica_engine = _sqlite_engine(tmp_path / "replica.db")
+    Base.metadata.create_all(replica_engine)
+    with Session(replica_engine) as session:
+        session.add(_fighter("Replica"))
+        session.commit()
+    yield replica_engine
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def route(monkeypatch):
+    """Route read sessions through a router over the given, already checked, engines"""
+    def install(*engines):
+        router = ReplicaRouter(list(engines), max_lag=5.0, check_interval=60.0)
+        router.check()
+        monkeypatch.setattr(RoutingSession, "router", router)
+        return router
+    return install
+
+
+def _names(client):
+    response = client.get("/api/v1/fighters/")
+    assert response.status_code == 200, response.text
+    return [fighter["first_name"] for fighter in response.json()]
+
+
+def test_reads_are_served_by_the_replica(client, db, replica, route):
+    db.add(_fighter("Primary"))
+    db.commit()
+    route(replica)
+    assert _names(client) == ["Replica"]
+
+
+def test_session_pins_to_the_primary_after_a_write(db, replica, route):
+    db.add(_fighter("Primary"))
+    db.commit()
+    route(replica)
+    with database.ReadSessionLocal() as session:
+        assert [f.first_name for f in session.query(Fighter)] == ["Replica"]
+        session.add(_fighter("Written"))
+        session.flush()
+        assert session.info["pinned"]
+        assert sorted(f.first_name for f in session.query(Fighter)) == ["Primary", "Written"]
+        session.rollback()
+
+
+def test_lagging_replica_falls_back_to_the_primary(client, db, replica, route, monkeypatch):
+    db.add(_fighter("Primary"))
+    db.commit()
+    monkeypatch.setattr(database, "replication_lag", lambda conn: 30.0)
+    router = route(replica)
+    assert _names(client) == ["Primary"]
+    assert router._lag[replica] == 30.0
+
+    # Caught up again at the next check
+    monkeypatch.undo()
+    monkeypatch.setattr(RoutingSession, "router", router)
+    router.check()
+    assert _names(client) == ["Replica"]
+
+
+def test_dead_replica_is_skipped(client, db, replica, route, tmp_path):
+    db.add(_fighter("Primary"))
+    db.commit()
+    dead = _sqlite_engine(tmp_path / "missing" / "replica.db")
+    router = route(dead, replica)
+    assert [_names(client) for _ in range(3)] == [["Replica"]] * 3
+    assert router._lag[dead] is None
+
+    route(dead)
+    assert _names(client) == ["Primary"]
+
+
+def test_health_is_checked_without_blocking_requests(replica, monkeypatch):
+    release = threading.Event()
+    real_lag = database.replication_lag
+    monkeypatch.setattr(database, "replication_lag", lambda conn: release.wait(10) and real_lag(conn))
+    router = ReplicaRouter([replica], max_lag=5.0, check_interval=60.0)
+
+    checker = router.refresh()
+    started = time.monotonic()
+    # Not checked yet: requests use the primary and start no second check
+    assert router.choose() is None
+    assert router.refresh() is None
+    assert time.monotonic() - started < 5
+    release.set()
+    checker.join(10)
+    assert router.choose() is replica
+
+
+def test_batch_mixing_read_and_write_sessions_completes(client):
+    # Reads open their own sessions while the batch holds its session for writes
+    responses = []
+    worker = threading.Thread(target=lambda: responses.append(client.post("/api/v1/batch/", json={
+        "requests": [{"id": "stats", "path": "/dashboard/stats"}, {"id": "fighters", "path": "/fighters/"}]
+    })), daemon=True)
+    worker.start()
+    worker.join(timeout=30)
+    assert not worker.is_alive(), "batch call deadlocked"
+    response, = responses
+    assert response.status_code == 200, response.text
+    assert [(item["id"], item["status"]) for item in response.json()["responses"]] == [("stats", 200), ("fighters", 200)]
+
+
+def test_batch_reads_after_a_write_use_the_primary(client, replica, route):
+    route(replica)
+    response = client.post("/api/v1/batch/", json={"requests": [
+        {"id": "before", "path": "/fighters/"},
+        {"id": "create", "method": "POST", "path": "/fighters/", "body": {
+            "first_name": "Written", "last_name": "Test", "birth_date": "1995-01-01", "gender": "М",
+        }},
+        {"id": "after", "path": "/fighters/"},
+    ]})
+    assert response.status_code == 200, response.text
+    before, created, after = response.json()["responses"]
+    assert created["status"] == 200
+    assert [fighter["first_name"] for fighter in before["body"]] == ["Replica"]
+    assert [fighter["first_name"] for fighter in after["body"]] == ["Written"]
@@ -0,0 +1,67 @@
+from contextlib import contextmanager
+from datetime import date
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from app.core.deps import _user_pk
+from app.core.repository import exists, exists_or_404, get_by_id, get_or_404
+from app.core.security import create_access_token, verify_token
+from app.models.enums import GenderEnum
+from app.models.fighter import Fighter
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def fighter_id(db):
+    fighter = Fighter(first_name="A", last_name="Test", birth_date=date(1995, 1, 1), gender=GenderEnum.MALE)
+    db.add(fighter)
+    db.commit()
+    fighter_id = fighter.id
+    db.expunge_all()
+    return fighter_id
+
+
+def test_get_by_id_reuses_the_identity_map(engine, db, fighter_id):
+    with count_statements(engine) as statements:
+        fighter = get_by_id(db, Fighter, fighter_id)
+        assert len(statements) == 1
+        assert get_by_id(db, Fighter, fighter_id) is fighter
+        assert get_or_404(db, Fighter, fighter_id) is fighter
+        assert len(statements) == 1
+
+
+def test_missing_rows(engine, db, fighter_id):
+    assert get_by_id(db, Fighter, fighter_id + 1) is None
+    with pytest.raises(HTTPException) as raised:
+        get_or_404(db, Fighter, fighter_id + 1)
+    assert (raised.value.status_code, raised.value.detail) == (404, "Fighter not found")
+
+
+def test_exists_does_not_load_the_object(db, fighter_id):
+    assert exists(db, Fighter, fighter_id)
+    assert not exists(db, Fighter, fighter_id + 1)
+    assert len(db.identity_map) == 0
+    exists_or_404(db, Fighter, fighter_id)
+    with pytest.raises(HTTPException):
+        exists_or_404(db, Fighter, fighter_id + 1, detail="No such fighter")
+
+
+def test_token_subject_matches_the_identity_map_key(db, admin):
+    assert _user_pk(verify_token(create_access_token(admin.id))) == admin.id
+    assert _user_pk("not-a-number") == 0
+    with count_statements(db.get_bind()) as statements:
+        assert get_by_id(db, type(admin), _user_pk(str(admin.id))) is admin
+    assert statements == []
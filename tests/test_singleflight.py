@@ -0,0 +1,97 @@
+import threading
+import time
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+
+FOLLOWERS = 8
+
+
+def _requests(name):
+    return REGISTRY.get_sample_value("camma_singleflight_requests_total", {"route": name}) or 0
+
+
+def _fly(flight, fn):
+    """Start a leader blocked inside fn, then FOLLOWERS callers for the same key; returns release()"""
+    started, release = threading.Event(), threading.Event()
+    outcomes = []
+
+    def leader_fn():
+        started.set()
+        assert release.wait(10)
+        return fn()
+
+    def call(body):
+        try:
+            outcomes.append(("ok", flight.do("key", body)))
+        except Exception as e:
+            outcomes.append(("error", e))
+
+    threads = [threading.Thread(target=call, args=(leader_fn,))]
+    threads[0].start()
+    assert started.wait(10)
+    before = _requests(flight.name)
+    threads += [threading.Thread(target=call, args=(fn,)) for _ in range(FOLLOWERS)]
+    for thread in threads[1:]:
+        thread.start()
+    # Every follower has entered do() while the leader is still running
+    deadline = time.monotonic() + 10
+    while _requests(flight.name) < before + FOLLOWERS and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    def finish():
+        release.set()
+        for thread in threads:
+            thread.join(10)
+        return outcomes
+    return finish
+
+
+def test_concurrent_calls_share_one_execution():
+    executions = []
+    flight = SingleFlight("test.share", cache_seconds=60)
+    finish = _fly(flight, lambda: executions.append(1) or {"value": len(executions)})
+    outcomes = finish()
+    assert len(outcomes) == FOLLOWERS + 1
+    assert len(executions) == 1
+    assert all(kind == "ok" and result is outcomes[0][1] for kind, result in outcomes)
+
+
+def test_error_reaches_every_waiting_caller_and_is_not_cached():
+    flight = SingleFlight("test.error", cache_seconds=60)
+
+    def fail():
+        raise ValueError("boom")
+
+    outcomes = _fly(flight, fail)()
+    assert len(outcomes) == FOLLOWERS + 1
+    assert all(kind == "error" and isinstance(error, ValueError) for kind, error in outcomes)
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+def test_results_are_reused_only_while_cached(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    flight = SingleFlight("test.cache", cache_seconds=1.0)
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 1
+    assert flight.do("other", lambda: 3) == 3
+    now[0] += 1.5
+    assert flight.do("key", lambda: 4) == 4
+
+    uncached = SingleFlight("test.uncached")
+    assert uncached.do("key", lambda: 1) == 1
+    assert uncached.do("key", lambda: 2) == 2
+
+
+def test_metrics_need_the_scrape_token(app, monkeypatch):
+    client = TestClient(app, base_url="http://api.yourdomain.com")
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert "camma_singleflight_requests_total" in response.text
@@ -0,0 +1,14 @@
+from app.cli import measure_startup
+from app.core.config import settings
+
+
+def test_cold_start_within_budget():
+    # A fresh interpreter imports app.main and builds the app, as a worker does on boot
+    total_ms, imports = measure_startup()
+    slowest = ", ".join(f"{module} {us / 1000:.0f} ms" for us, module in sorted(imports, reverse=True)[:5])
+    assert total_ms <= settings.STARTUP_IMPORT_BUDGET_MS, (
+        f"import app.main + create_app() took {total_ms:.0f} ms "
+        f"(budget {settings.STARTUP_IMPORT_BUDGET_MS} ms); slowest imports: {slowest}"
+    )
+    # create_app() really ran: the routers were imported
+    assert any(module.startswith("app.api.v1.endpoints.") for _, module in imports)
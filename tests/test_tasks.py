@@ -0,0 +1,48 @@
+from app.models.fighter import Task
+
+
+def _create_task(client, checklist_items):
+    response = client.post("/api/v1/tasks/", json={"title": "Weigh-in", "checklist_items": checklist_items})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_plain_string_items_are_stored_as_objects(client):
+    task = _create_task(client, ["Scales", {"text": "Doctor", "done": True}])
+    assert task["checklist_items"] == [{"text": "Scales", "done": False}, {"text": "Doctor", "done": True}]
+
+
+def test_checklist_items_are_patched_in_place(pg_engine, client, db):
+    task = _create_task(client, ["Scales", {"text": "Doctor", "done": True}])
+    url = f"/api/v1/tasks/{task['id']}/checklist"
+
+    def patch(**body):
+        response = client.patch(url, json=body)
+        assert response.status_code == 200, response.text
+        return [(item["text"], item["done"]) for item in response.json()["checklist_items"]]
+
+    assert patch(op="add", text="Gloves") == [("Scales", False), ("Doctor", True), ("Gloves", False)]
+    assert patch(op="toggle", index=0) == [("Scales", True), ("Doctor", True), ("Gloves", False)]
+    assert patch(op="toggle", index=0) == [("Scales", False), ("Doctor", True), ("Gloves", False)]
+    assert patch(op="set", index=1, done=False) == [("Scales", False), ("Doctor", False), ("Gloves", False)]
+    assert patch(op="set", index=2, done=True)[2] == ("Gloves", True)
+    assert db.get(Task, task["id"]).checklist_items[2] == {"text": "Gloves", "done": True}
+
+
+def test_empty_checklist_can_be_started_with_add(pg_engine, client):
+    task = _create_task(client, None)
+    response = client.patch(f"/api/v1/tasks/{task['id']}/checklist", json={"op": "add", "text": "Scales"})
+    assert response.status_code == 200, response.text
+    assert response.json()["checklist_items"] == [{"text": "Scales", "done": False}]
+
+
+def test_bad_checklist_patches_are_rejected(pg_engine, client):
+    task = _create_task(client, ["Scales"])
+    url = f"/api/v1/tasks/{task['id']}/checklist"
+    assert client.patch(url, json={"op": "toggle", "index": 1}).status_code == 404
+    assert client.patch(url, json={"op": "add"}).status_code == 400
+    assert client.patch(url, json={"op": "toggle"}).status_code == 400
+    assert client.patch(url, json={"op": "set", "index": 0}).status_code == 400
+    assert client.patch(url, json={"op": "remove", "index": 0}).status_code == 422
+    assert client.patch("/api/v1/tasks/999999/checklist", json={"op": "toggle", "index": 0}).status_code == 404
+    assert client.get(f"/api/v1/tasks/{task['id']}").json()["checklist_items"] == [{"text": "Scales", "done": False}]
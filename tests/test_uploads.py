@@ -0,0 +1,69 @@
+import hashlib
+import os
+from datetime import date, datetime
+import pytest
+from app.core import upload_store
+from app.core.config import settings
+from app.models.enums import EventTypeEnum, GenderEnum
+from app.models.fighter import Event, Fight, Fighter
+
+
+@pytest.fixture
+def fight_id(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "UPLOAD_TMP_DIR", str(tmp_path / "uploads_tmp"))
+    os.makedirs(settings.UPLOAD_TMP_DIR)
+    event = Event(name="Night", event_type=EventTypeEnum.FIGHT, event_date=datetime(2030, 1, 1))
+    fighters = [
+        Fighter(first_name=f"F{i}", last_name="Test", birth_date=date(1995, 1, 1), gender=GenderEnum.MALE)
+        for i in range(2)
+    ]
+    db.add_all([event, *fighters])
+    db.flush()
+    fight = Fight(event_id=event.id, fighter1_id=fighters[0].id, fighter2_id=fighters[1].id)
+    db.add(fight)
+    db.commit()
+    return fight.id
+
+
+def test_resumed_upload_is_checked_once_at_finalize(client, fight_id):
+    data = os.urandom(300_000)
+    response = client.post("/api/v1/uploads/videos", json={
+        "fight_id": fight_id, "filename": "bout.mp4", "length": len(data),
+        "checksum": hashlib.sha256(data).hexdigest(),
+    })
+    assert response.status_code == 201, response.text
+    location = response.headers["location"]
+
+    for start, end in ((0, 100_000), (100_000, len(data))):
+        response = client.patch(location, content=data[start:end], headers={
+            "Upload-Offset": str(start), "Content-Type": "application/offset+octet-stream",
+        })
+        assert response.status_code == 204, response.text
+        assert client.head(location).headers["upload-offset"] == str(end)
+
+    response = client.post(f"{location}/finalize")
+    assert response.status_code == 200, response.text
+    with open(response.json()["video_url"], "rb") as f:
+        assert f.read() == data
+
+
+def test_whole_file_checksum_mismatch_discards_the_upload(client, fight_id):
+    response = client.post("/api/v1/uploads/videos", json={
+        "fight_id": fight_id, "filename": "bout.mp4", "length": 4, "checksum": "0" * 64,
+    })
+    location = response.headers["location"]
+    client.patch(location, content=b"abcd", headers={"Upload-Offset": "0"})
+    assert client.post(f"{location}/finalize").status_code == 460
+    assert client.head(location).status_code == 404
+    assert os.listdir(settings.UPLOAD_TMP_DIR) == []
+
+
+def test_in_process_store_refused_with_several_workers(monkeypatch):
+    monkeypatch.setattr(upload_store, "_store", None)
+    monkeypatch.setattr(upload_store.settings, "UPLOAD_STATE_BACKEND", "memory")
+    monkeypatch.setattr(upload_store.settings, "WEB_CONCURRENCY", 4)
+    with pytest.raises(RuntimeError):
+        upload_store.get_upload_store()
+    monkeypatch.setattr(upload_store.settings, "WEB_CONCURRENCY", 1)
+    assert isinstance(upload_store.get_upload_store(), upload_store.InProcessUploadStore)